@@ -18,10 +18,15 @@ from .renderer import Renderer
 from .renderer import Renderer2D
 from .renderer import RenderCommand
 from .renderer import Statistics
+from .renderer import FlushReason
+from .renderer import Renderer2DSpecification
+from .renderer import GPUProfiler
+from .renderer import StaticBatch
 
 from .scene.scene import Scene
 from .scene import components
 from .scene.entity import Entity
+from .scene.spatial_hash import AABB
 from .scene.scriptable_entity import ScriptableEntity
 
 from .renderer import OrthographicCamera
@@ -34,6 +39,10 @@ from .renderer import ShaderDataType
 from .renderer import Shader
 from .renderer import ShaderLibrary
 from .renderer import Texture2D
+from .renderer import Texture2DArray
+from .renderer import SubTexture2D
+from .renderer import TextureAtlas
+from .renderer import TextureAtlasBuilder
 from .renderer import Framebuffer
 from .renderer import FramebufferSpecification
 
@@ -9,6 +9,13 @@ from .imgui_layer import ImGuiLayer
 from .layer import Layer
 from .timestep import Timestep
 from .renderer import Renderer
+from .renderer import Renderer2D
+from .renderer import RenderCommand
+from .renderer import CommandList
+from .renderer import RenderThread
+from .renderer import GPUProfiler
+from .renderer import TextureLoader
+from .renderer import Shader
 from pyhazel.debug.instrumentor import *
 import glfw
 
@@ -17,11 +24,14 @@ class Application:
     instance = None
 
     @HZ_PROFILE_FUNCTION
-    def __init__(self, name: str) -> None:
+    def __init__(self, name: str, threaded_rendering: bool = False) -> None:
         # Singleton (explore more pythonic options)
         assert Application.instance is None
         Application.instance = self
 
+        # Record graphics calls and execute them on a dedicated render thread
+        self.threaded_rendering = threaded_rendering
+
         self.window = Window.create(WindowProps(name))
         self.window.set_event_callback(self.on_event)
         self.layer_stack = LayerStack()
@@ -42,8 +52,22 @@ class Application:
 
     @HZ_PROFILE_FUNCTION
     def run(self):
+        try:
+            if self.threaded_rendering:
+                self.run_threaded()
+            else:
+                self.run_loop()
+        finally:
+            # Stops the texture loader and batch threads
+            Renderer.shutdown()
+
+    @HZ_PROFILE_FUNCTION
+    def run_loop(self):
         while self.running:
             with HZ_PROFILE_SCOPE("RunLoop"):
+                GPUProfiler.new_frame()
+                TextureLoader.new_frame()
+
                 time = glfw.get_time()
                 timestamp = Timestep(time - self.last_frame_time)
                 self.last_frame_time = time
@@ -61,6 +85,68 @@ class Application:
 
                 self.window.on_update()
 
+    @HZ_PROFILE_FUNCTION
+    def run_threaded(self):
+        """
+        Run loop in which the main thread updates the layers of frame N and
+        records their graphics calls while the render thread, owning the
+        context, executes the command list of frame N - 1 and presents it.
+
+        Layers must issue graphics calls through RenderCommand.submit (the
+        renderers already do) and create graphics resources before run,
+        the texture, shader, buffer, vertex array and framebuffer factories
+        assert this. Static batches create their buffers through submitted
+        commands.
+        Texture2D.create_from_path and TextureCache.load fall back to the
+        background loader. Shaders still compiling are resolved here,
+        before the context moves to the render thread.
+        """
+        assert not Renderer2D.specification.persistent_mapped, "Persistent mapped buffers are not supported with a render thread!"
+
+        render_thread = RenderThread(self.window.graphics_context)
+        command_lists = (CommandList(), CommandList())
+        frame = 0
+
+        Shader.resolve_pending()
+        render_thread.start()
+        try:
+            while self.running:
+                with HZ_PROFILE_SCOPE("RunLoop"):
+                    command_list = command_lists[frame % 2]
+                    command_list.clear()
+                    RenderCommand.command_list = command_list
+                    GPUProfiler.new_frame()
+                    TextureLoader.new_frame()
+
+                    self.window.poll_events()
+
+                    time = glfw.get_time()
+                    timestamp = Timestep(time - self.last_frame_time)
+                    self.last_frame_time = time
+
+                    if not self.minimized:
+                        with HZ_PROFILE_SCOPE("LayerStack OnUpdate"):
+                            for layer in self.layer_stack:
+                                layer.on_update(timestamp)
+
+                    # ImGui reuses its draw data, so the previous frame
+                    # has to be finished before starting a new ImGui frame
+                    render_thread.wait()
+
+                    self.imgui_layer.begin()
+                    with HZ_PROFILE_SCOPE("LayerStack OnImGuiRender"):
+                        for layer in self.layer_stack:
+                            layer.on_imgui_render()
+                    self.imgui_layer.end()
+
+                    RenderCommand.submit(self.window.swap_buffers)
+                    RenderCommand.command_list = None
+                    render_thread.submit(command_list)
+                    frame += 1
+        finally:
+            RenderCommand.command_list = None
+            render_thread.stop()
+
     @HZ_PROFILE_FUNCTION
     def on_event(self, event: Event) -> None:
         dispatcher = EventDispatcher(event)
@@ -10,5 +10,11 @@ class Platform(Enum):
 # Constants
 # =========
 INSTRUMENTATION_ENABLED = False
+GPU_PROFILING_ENABLED = False
+SHADER_CACHE_ENABLED = True
+SHADER_CACHE_DIRECTORY = "assets/cache/shader/opengl"
+TEXTURE_LOADER_THREADS = 2
+TEXTURE_UPLOAD_BUDGET_MS = 2.0
+TEXTURE_CACHE_BUDGET_BYTES = 256 * 1024 * 1024
 DEBUG = False
 PLATFORM = Platform.HZ_PLATFORM_WINDOWS
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from io import TextIOWrapper
 from functools import wraps
 from threading import Lock
+from threading import get_native_id
 import time
 import json
 
@@ -12,10 +13,13 @@ __all__ = [
     "HZ_PROFILE_BEGIN_SESSION",
     "HZ_PROFILE_END_SESSION",
     "HZ_PROFILE_SCOPE",
-    "HZ_PROFILE_FUNCTION"
+    "HZ_PROFILE_FUNCTION",
+    "HZ_PROFILE_GPU_EVENT"
 ]
 
 NANO_TO_MICRO_SECONDS_SCALE_FACTOR = 0.001
+# trace thread id of the track showing GPU events
+GPU_THREAD_ID = 0xFFFF
 
 
 @dataclass
@@ -80,7 +84,15 @@ class Instrumentor:
                 self.output["traceEvents"].append(event)
 
     def write_header(self):
-        self.output = {"otherData": {}, "traceEvents": []}
+        self.output = {"otherData": {}, "traceEvents": [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 0,
+                "tid": GPU_THREAD_ID,
+                "args": {"name": "GPU"}
+            }
+        ]}
 
     def write_footer(self):
         json.dump(self.output, self.fp)
@@ -110,7 +122,7 @@ class InstrumentationTimer:
                 name=self.name,
                 start=self.start_time,
                 end=time.perf_counter_ns() * NANO_TO_MICRO_SECONDS_SCALE_FACTOR,
-                thread_id=0
+                thread_id=get_native_id()
             )
         )
         return True
@@ -151,6 +163,21 @@ def HZ_PROFILE_SCOPE(name: str):
         return NullInstrumentationTimer()
 
 
+def HZ_PROFILE_GPU_EVENT(name: str, start: float, end: float):
+    """Record a GPU pass, with start and end in Instrumentor microseconds."""
+    if not INSTRUMENTATION_ENABLED:
+        return
+
+    Instrumentor.get().write_profile(
+        ProfileResult(
+            name=name,
+            start=start,
+            end=end,
+            thread_id=GPU_THREAD_ID
+        )
+    )
+
+
 def HZ_PROFILE_FUNCTION(func: Callable):
     @wraps(func)
     def profiler(*args, **kwargs):
@@ -2,6 +2,8 @@ from pyhazel.imgui_glfw_renderer import ImGuiGlfwRenderer
 from pyhazel.layer import Layer
 from pyhazel.events import Event
 from pyhazel.events import EventCategory
+from pyhazel.renderer import RenderCommand
+from pyhazel.renderer import GPUProfiler
 from pyhazel.debug.instrumentor import *
 import imgui
 
@@ -27,6 +29,8 @@ class ImGuiLayer(Layer):
         from .application import Application  # prevent circular import
         app = Application.instance
         self.renderer = ImGuiGlfwRenderer(app.window.native_window)
+        # The renderer issues its GL calls around the state cache
+        RenderCommand.reset_state_cache()
 
         self.blocking_events = False
 
@@ -51,7 +55,10 @@ class ImGuiLayer(Layer):
     @HZ_PROFILE_FUNCTION
     def end(self):
         imgui.render()
-        self.renderer.render(imgui.get_draw_data())
+        # The draw data stays valid until the next imgui.new_frame
+        with GPUProfiler.scope("ImGui"):
+            RenderCommand.submit(self.renderer.render, imgui.get_draw_data())
+        RenderCommand.reset_state_cache()
 
     @HZ_PROFILE_FUNCTION
     def on_imgui_render(self):
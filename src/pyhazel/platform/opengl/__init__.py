@@ -1,8 +1,13 @@
 from .opengl_context import *
+from .opengl_state_cache import *
 from .opengl_index_buffer import *
 from .opengl_renderer_api import *
 from .opengl_vertex_array import *
 from .opengl_vertex_buffer import *
+from .opengl_ring_vertex_buffer import *
 from .opengl_shader import *
 from .opengl_texture import *
+from .opengl_texture_array import *
 from .opengl_framebuffer import *
+from .opengl_gpu_timer import *
+from .opengl_uniform_buffer import *
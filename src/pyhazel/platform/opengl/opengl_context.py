@@ -22,3 +22,9 @@ class OpenGLContent(GraphicsContent):
     @HZ_PROFILE_FUNCTION
     def swap_buffers(self):
         glfw.swap_buffers(self.window_handle)
+
+    def make_current(self):
+        glfw.make_context_current(self.window_handle)
+
+    def release(self):
+        glfw.make_context_current(None)
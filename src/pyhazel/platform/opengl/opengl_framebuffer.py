@@ -1,5 +1,7 @@
 from pyhazel.renderer.framebuffer import FramebufferSpecification
 from pyhazel.renderer.framebuffer import Framebuffer
+from pyhazel.renderer.render_command import RenderCommand
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
 import numpy as np
 
@@ -21,6 +23,8 @@ class OpenGLFramebuffer(Framebuffer):
         glDeleteFramebuffers(1, self.renderer_id[0])
         glDeleteTextures(1, self.color_attachement[0])
         glDeleteTextures(1, self.depth_attachement[0])
+        OpenGLStateCache.forget_texture(int(self.color_attachement[0]))
+        OpenGLStateCache.forget_texture(int(self.depth_attachement[0]))
 
     @property
     def color_attachment_renderer_id(self) -> int:
@@ -39,20 +43,16 @@ class OpenGLFramebuffer(Framebuffer):
         glBindFramebuffer(GL_FRAMEBUFFER, self.renderer_id[0])
 
         glCreateTextures(GL_TEXTURE_2D, 1, self.color_attachement)
-        glBindTexture(GL_TEXTURE_2D, self.color_attachement[0])
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
+        color_attachement = int(self.color_attachement[0])
+        glTextureStorage2D(
+            color_attachement,
+            1,
             GL_RGBA8,
             self.specification.width,
-            self.specification.height,
-            0,
-            GL_RGBA,
-            GL_UNSIGNED_BYTE,
-            None
+            self.specification.height
         )
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
-        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTextureParameteri(color_attachement, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTextureParameteri(color_attachement, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
 
         glFramebufferTexture2D(
             GL_FRAMEBUFFER,
@@ -63,9 +63,8 @@ class OpenGLFramebuffer(Framebuffer):
         )
 
         glCreateTextures(GL_TEXTURE_2D, 1, self.depth_attachement)
-        glBindTexture(GL_TEXTURE_2D, self.depth_attachement[0])
-        glTexStorage2D(
-            GL_TEXTURE_2D,
+        glTextureStorage2D(
+            int(self.depth_attachement[0]),
             1,
             GL_DEPTH24_STENCIL8,
             self.specification.width,
@@ -86,7 +85,7 @@ class OpenGLFramebuffer(Framebuffer):
 
     def bind(self):
         glBindFramebuffer(GL_FRAMEBUFFER, self.renderer_id[0])
-        glViewport(0, 0, self.specification.width, self.specification.height)
+        OpenGLStateCache.set_viewport(0, 0, self.specification.width, self.specification.height)
 
     def unbind(self):
         glBindFramebuffer(GL_FRAMEBUFFER, 0)
@@ -100,4 +99,5 @@ class OpenGLFramebuffer(Framebuffer):
         self.specification.width = width
         self.specification.height = height
 
-        self.invalidate()
+        # Recreates the attachments on the thread owning the context
+        RenderCommand.submit(self.invalidate)
@@ -0,0 +1,36 @@
+from typing import Optional
+from pyhazel.renderer import GPUTimer
+from OpenGL.GL import *
+
+__all__ = ["OpenGLGPUTimer"]
+
+
+class OpenGLGPUTimer(GPUTimer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.free_queries: list[int] = []
+
+    def timestamp(self) -> int:
+        if self.free_queries:
+            query = self.free_queries.pop()
+        else:
+            query = int(glGenQueries(1))
+
+        glQueryCounter(query, GL_TIMESTAMP)
+        return query
+
+    def try_get_result(self, query: int) -> Optional[int]:
+        available = GLint(0)
+        glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE, available)
+        if not available.value:
+            return None
+
+        result = GLuint64(0)
+        glGetQueryObjectui64v(query, GL_QUERY_RESULT, result)
+        return result.value
+
+    def release(self, query: int):
+        self.free_queries.append(query)
+
+    def current_time(self) -> int:
+        return int(glGetInteger64v(GL_TIMESTAMP))
@@ -4,6 +4,7 @@ from typing import TYPE_CHECKING
 from pyhazel.renderer import IndexBuffer
 from OpenGL.GL import *
 from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
 
 
 if TYPE_CHECKING:
@@ -20,7 +21,7 @@ class OpenGLIndexBuffer(IndexBuffer):
         self._renderer_id = glGenBuffers(1)
         self._count = len(data)
 
-        glBindBuffer(GL_ARRAY_BUFFER, self._renderer_id)
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, self._renderer_id)
         glBufferData(
             GL_ARRAY_BUFFER,
             data.nbytes,
@@ -35,11 +36,11 @@ class OpenGLIndexBuffer(IndexBuffer):
 
     @HZ_PROFILE_FUNCTION
     def bind(self):
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._renderer_id)
+        OpenGLStateCache.bind_buffer(GL_ELEMENT_ARRAY_BUFFER, self._renderer_id)
 
     @HZ_PROFILE_FUNCTION
     def unbind(self):
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        OpenGLStateCache.bind_buffer(GL_ELEMENT_ARRAY_BUFFER, 0)
 
     @property
     def count(self) -> int:
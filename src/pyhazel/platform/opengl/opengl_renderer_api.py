@@ -7,6 +7,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from pyhazel.renderer import RendererAPI
 from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
 import glm
 
@@ -20,27 +21,68 @@ __all__ = ["OpenGLRendererAPI"]
 class OpenGLRendererAPI(RendererAPI):
     @HZ_PROFILE_FUNCTION
     def init(self):
-        glEnable(GL_BLEND)
-        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        OpenGLStateCache.set_capability(GL_BLEND, True)
+        OpenGLStateCache.set_blend_func(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
 
-        glEnable(GL_DEPTH_TEST)
+        OpenGLStateCache.set_capability(GL_DEPTH_TEST, True)
 
     def set_viewport(self, x: float, y: float, width: float, height: float):
-        glViewport(x, y, width, height)
+        OpenGLStateCache.set_viewport(x, y, width, height)
 
     def set_clear_color(self, color: glm.vec4):
-        glClearColor(color.r, color.g, color.b, color.a)
+        OpenGLStateCache.set_clear_color(color.r, color.g, color.b, color.a)
 
     def clear(self):
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
-    def draw_vertex_array(self, vertex_array: VertexArray, index_count: int = -1):
+    def reset_state_cache(self):
+        OpenGLStateCache.reset()
+
+    @property
+    def state_call_counts(self) -> tuple[int, int]:
+        return OpenGLStateCache.issued_calls, OpenGLStateCache.elided_calls
+
+    def reset_state_call_counts(self):
+        OpenGLStateCache.reset_call_counts()
+
+    def draw_vertex_array(self, vertex_array: VertexArray, index_count: int = -1, base_vertex: int = 0):
+        # Elided by the state cache when already bound
         vertex_array.bind()
 
         count = vertex_array.index_buffer.count if index_count == -1 else index_count
-        glDrawElements(
-            GL_TRIANGLES,
-            count,
-            GL_UNSIGNED_INT,
-            None
-        )
+        if base_vertex == 0:
+            glDrawElements(
+                GL_TRIANGLES,
+                count,
+                GL_UNSIGNED_INT,
+                None
+            )
+        else:
+            glDrawElementsBaseVertex(
+                GL_TRIANGLES,
+                count,
+                GL_UNSIGNED_INT,
+                None,
+                base_vertex
+            )
+
+    def draw_vertex_array_instanced(self, vertex_array: VertexArray, index_count: int, instance_count: int, base_instance: int = 0):
+        vertex_array.bind()
+
+        if base_instance == 0:
+            glDrawElementsInstanced(
+                GL_TRIANGLES,
+                index_count,
+                GL_UNSIGNED_INT,
+                None,
+                instance_count
+            )
+        else:
+            glDrawElementsInstancedBaseInstance(
+                GL_TRIANGLES,
+                index_count,
+                GL_UNSIGNED_INT,
+                None,
+                instance_count,
+                base_instance
+            )
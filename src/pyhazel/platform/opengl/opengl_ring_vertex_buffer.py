@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from pyhazel.renderer.vertex_buffer import RingVertexBuffer
+from pyhazel.debug.instrumentor import *
+from .opengl_vertex_buffer import OpenGLVertexBuffer
+from .opengl_state_cache import OpenGLStateCache
+from OpenGL.GL import *
+import numpy as np
+import ctypes
+
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+
+__all__ = ["OpenGLRingVertexBuffer"]
+
+FENCE_TIMEOUT_NANO_SECONDS = 1_000_000
+
+
+class OpenGLRingVertexBuffer(OpenGLVertexBuffer, RingVertexBuffer):
+    @HZ_PROFILE_FUNCTION
+    def __init__(self) -> None:
+        super().__init__()
+        self._segment_size = 0
+        self._segment_count = 0
+        self._segment_index = 0
+        self._fences = []
+        self._mapped: ndarray = None
+
+    @classmethod
+    def init_ring_factory(cls, segment_size: int, segment_count: int):
+        instance = cls()
+        instance._segment_size = segment_size
+        instance._segment_count = segment_count
+        instance._fences = [None for _ in range(segment_count)]
+
+        size = segment_size * segment_count
+        flags = GL_MAP_WRITE_BIT | GL_MAP_PERSISTENT_BIT | GL_MAP_COHERENT_BIT
+
+        # Immutable storage is required for a mapping that outlives draw calls
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, instance._renderer_id)
+        glBufferStorage(GL_ARRAY_BUFFER, size, None, flags)
+        pointer = glMapBufferRange(GL_ARRAY_BUFFER, 0, size, flags)
+        instance._mapped = np.ctypeslib.as_array(
+            ctypes.cast(pointer, ctypes.POINTER(ctypes.c_ubyte)),
+            shape=(size,)
+        )
+        return instance
+
+    @HZ_PROFILE_FUNCTION
+    def destroy(self):
+        pass
+        # todo: wire up to parent class and implement
+
+    @property
+    def segment_index(self) -> int:
+        return self._segment_index
+
+    @property
+    def mapped_segment(self) -> ndarray:
+        offset = self._segment_index * self._segment_size
+        return self._mapped[offset:offset + self._segment_size]
+
+    @HZ_PROFILE_FUNCTION
+    def advance(self):
+        self._fences[self._segment_index] = glFenceSync(
+            GL_SYNC_GPU_COMMANDS_COMPLETE,
+            0
+        )
+        self._segment_index = (self._segment_index + 1) % self._segment_count
+        self.wait_for_segment(self._segment_index)
+
+    @HZ_PROFILE_FUNCTION
+    def wait_for_segment(self, index: int):
+        fence = self._fences[index]
+        if fence is None:
+            return
+
+        while True:
+            result = glClientWaitSync(
+                fence,
+                GL_SYNC_FLUSH_COMMANDS_BIT,
+                FENCE_TIMEOUT_NANO_SECONDS
+            )
+            if result in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                break
+            assert result != GL_WAIT_FAILED, "Waiting on ring buffer fence failed"
+
+        glDeleteSync(fence)
+        self._fences[index] = None
+
+    def set_data(self, data: ndarray, size: int = 0):
+        # The mapping is coherent, so a plain copy is visible to the GPU
+        self.mapped_segment[:size] = data.view(np.uint8)[:size]
@@ -1,11 +1,20 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
 from pathlib import Path
 from pyhazel.renderer.shader import Shader
 from pyhazel.debug.instrumentor import *
+from pyhazel.config import *
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
-from OpenGL.GL.shaders import compileProgram, compileShader
+from OpenGL.GL.KHR.parallel_shader_compile import *
+from OpenGL.error import GLError
+import hashlib
+import ctypes
+import struct
 import glm
 
 
@@ -24,11 +33,31 @@ def shader_type_from_string(shader_type: str) -> GLenum:
     assert False, "Unknown shader type"
 
 
+@dataclass
+class PendingProgram:
+    """Program whose compile and link were issued but not checked yet."""
+    program: int
+    shaders: list[int] = field(default_factory=list)
+    cache_path: Optional[Path] = None
+
+
 class OpenGLShader(Shader):
+    # vendor, renderer and version of the driver, part of every cache key
+    _driver_info: Optional[str] = None
+    # None until queried, GL_KHR_parallel_shader_compile availability
+    _parallel_compile: Optional[bool] = None
+    # file reads and pre processing of create_many_from_filepaths
+    PRE_PROCESS_THREADS = 4
+    # shaders whose compile was issued but not resolved yet
+    _unresolved: list[OpenGLShader] = []
+
     def __init__(self) -> None:
         super().__init__()
         self._renderer_id: int = -1
         self._name = ""
+        # uniform name -> location, reflected after linking
+        self._uniform_locations: dict[str, int] = {}
+        self._pending: Optional[PendingProgram] = None
 
     @HZ_PROFILE_FUNCTION
     def destroy(self):
@@ -49,6 +78,31 @@ class OpenGLShader(Shader):
         shader._name = Path(filepath).stem
         return shader
 
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def create_many_from_filepaths(cls, filepaths: Sequence[str]) -> list[OpenGLShader]:
+        """
+        Read and pre process the files on a thread pool, then issue every
+        compile and link before checking any of them, so the driver can
+        work on all programs at once. Each shader resolves when first used,
+        or in resolve_pending.
+        """
+        cls.enable_parallel_compile()
+
+        def load(filepath: str) -> tuple[OpenGLShader, dict[GLenum, str]]:
+            shader = cls()
+            shader._name = Path(filepath).stem
+            return shader, shader.pre_process(shader.read_file(filepath))
+
+        with ThreadPoolExecutor(cls.PRE_PROCESS_THREADS, thread_name_prefix="ShaderLoad") as executor:
+            loaded = list(executor.map(load, filepaths))
+
+        # GL calls stay on the thread owning the context
+        for shader, shader_sources in loaded:
+            shader.begin_compile(shader_sources)
+
+        return [shader for shader, _ in loaded]
+
     @classmethod
     @HZ_PROFILE_FUNCTION
     def create_from_source(cls, name: str, vertex_src: str, fragment_src: str):
@@ -95,26 +149,211 @@ class OpenGLShader(Shader):
 
     @HZ_PROFILE_FUNCTION
     def compile(self, shader_sources: dict[GLenum, str]) -> int:
+        self.begin_compile(shader_sources)
+        self.resolve()
+
+        OpenGLStateCache.use_program(self._renderer_id)
+
+        return self._renderer_id
+
+    @HZ_PROFILE_FUNCTION
+    def begin_compile(self, shader_sources: dict[GLenum, str]):
+        """Issue the compile and link without waiting for their status."""
+        cache_path = self.get_cache_path(shader_sources)
+
+        if cache_path is not None:
+            program = self.load_program_binary(cache_path)
+            if program is not None:
+                self._renderer_id = program
+                self._pending = PendingProgram(program)
+                OpenGLShader._unresolved.append(self)
+                return
+
         compiled_shaders = []
         for shader_type, source in shader_sources.items():
-            compiled_shader = compileShader(
-                source,
-                shader_type
-            )
+            compiled_shader = glCreateShader(shader_type)
+            glShaderSource(compiled_shader, source)
+            glCompileShader(compiled_shader)
             compiled_shaders.append(compiled_shader)
 
-        _renderer_id = compileProgram(*compiled_shaders)
-        glUseProgram(_renderer_id)
+        program = glCreateProgram()
+        for compiled_shader in compiled_shaders:
+            glAttachShader(program, compiled_shader)
+        # Must be set before linking for the binary to be retrievable
+        glProgramParameteri(program, GL_PROGRAM_BINARY_RETRIEVABLE_HINT, GL_TRUE)
+        glLinkProgram(program)
+
+        self._renderer_id = program
+        self._pending = PendingProgram(program, compiled_shaders, cache_path)
+        OpenGLShader._unresolved.append(self)
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def resolve_pending(cls):
+        """Resolve every shader still compiling, on the thread owning the context."""
+        while cls._unresolved:
+            cls._unresolved[0].resolve()
+
+    @HZ_PROFILE_FUNCTION
+    def resolve(self):
+        """Check the status of the compile started by begin_compile, blocking until done."""
+        pending = self._pending
+        if pending is None:
+            return
+        self._pending = None
+        OpenGLShader._unresolved.remove(self)
+
+        if not glGetProgramiv(pending.program, GL_LINK_STATUS):
+            compile_logs = [
+                glGetShaderInfoLog(compiled_shader)
+                for compiled_shader in pending.shaders
+                if not glGetShaderiv(compiled_shader, GL_COMPILE_STATUS)
+            ]
+            info_log = compile_logs or glGetProgramInfoLog(pending.program)
+            raise RuntimeError(f"Shader {self._name} link failure: {info_log}")
+
+        for compiled_shader in pending.shaders:
+            glDetachShader(pending.program, compiled_shader)
+            glDeleteShader(compiled_shader)
+
+        if pending.cache_path is not None:
+            self.save_program_binary(pending.program, pending.cache_path)
+
+        self.reflect_uniforms()
+
+    @classmethod
+    def enable_parallel_compile(cls) -> bool:
+        if cls._parallel_compile is None:
+            cls._parallel_compile = bool(glInitParallelShaderCompileKHR())
+            if cls._parallel_compile:
+                # Let the driver pick its number of compiler threads
+                glMaxShaderCompilerThreadsKHR(0xFFFFFFFF)
+        return cls._parallel_compile
+
+    @classmethod
+    def get_driver_info(cls) -> str:
+        if cls._driver_info is None:
+            cls._driver_info = "\n".join(
+                glGetString(name).decode("ascii")
+                for name in (GL_VENDOR, GL_RENDERER, GL_VERSION)
+            )
+        return cls._driver_info
+
+    def get_cache_path(self, shader_sources: dict[GLenum, str]) -> Optional[Path]:
+        """Program binary location keyed by the sources and the driver."""
+        if not SHADER_CACHE_ENABLED:
+            return None
+
+        if glGetIntegerv(GL_NUM_PROGRAM_BINARY_FORMATS) == 0:
+            return None  # driver does not support program binaries
 
-        return _renderer_id
+        key = hashlib.sha256(self.get_driver_info().encode("utf-8"))
+        for shader_type in sorted(shader_sources):
+            key.update(str(int(shader_type)).encode("ascii"))
+            key.update(shader_sources[shader_type].encode("utf-8"))
+
+        return Path(SHADER_CACHE_DIRECTORY) / f"{key.hexdigest()}.bin"
+
+    @HZ_PROFILE_FUNCTION
+    def load_program_binary(self, cache_path: Path) -> Optional[int]:
+        """Create a program from a cached binary, or None if unusable."""
+        try:
+            data = cache_path.read_bytes()
+        except OSError:
+            return None
+
+        if len(data) <= 4:
+            return None
+
+        binary_format, = struct.unpack_from("<I", data)
+        binary = data[4:]
+
+        program = glCreateProgram()
+        try:
+            glProgramBinary(program, binary_format, binary, len(binary))
+            linked = glGetProgramiv(program, GL_LINK_STATUS)
+        except GLError:
+            # Format not supported (e.g. after a GPU change)
+            linked = False
+
+        if not linked:
+            # Rejected by the driver, drop the entry and compile instead
+            glDeleteProgram(program)
+            try:
+                cache_path.unlink()
+            except OSError:
+                pass
+            return None
+
+        return program
+
+    @HZ_PROFILE_FUNCTION
+    def save_program_binary(self, program: int, cache_path: Path):
+        size = int(glGetProgramiv(program, GL_PROGRAM_BINARY_LENGTH))
+        if size == 0:
+            return
+
+        length = GLsizei(0)
+        binary_format = GLenum(0)
+        binary = (ctypes.c_ubyte * size)()
+        glGetProgramBinary(
+            program,
+            size,
+            ctypes.byref(length),
+            ctypes.byref(binary_format),
+            binary
+        )
+
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(
+                struct.pack("<I", binary_format.value) + bytes(binary)[:length.value]
+            )
+        except OSError:
+            print(f"Could not write shader cache {cache_path}")
+
+    @HZ_PROFILE_FUNCTION
+    def reflect_uniforms(self):
+        """Build the name -> location table of all active uniforms."""
+        self._uniform_locations.clear()
+
+        uniform_count = int(glGetProgramiv(self._renderer_id, GL_ACTIVE_UNIFORMS))
+        for index in range(uniform_count):
+            name, size, _ = glGetActiveUniform(self._renderer_id, index)
+            name = name.decode("ascii") if isinstance(name, bytes) else name
+            location = glGetUniformLocation(self._renderer_id, name)
+            if location == -1:
+                # Member of a uniform block, set through its UniformBuffer
+                continue
+            self._uniform_locations[name] = location
+
+            if name.endswith("[0]"):
+                # Arrays are reported by their first element
+                base_name = name[:-3]
+                self._uniform_locations[base_name] = location
+                for element in range(1, size):
+                    self._uniform_locations[f"{base_name}[{element}]"] = location + element
+
+    def get_uniform_location(self, name: str) -> int:
+        if self._pending is not None:
+            self.resolve()
+        # -1 (inactive uniform) is silently ignored by glProgramUniform*
+        return self._uniform_locations.get(name, -1)
+
+    def has_uniform(self, name: str) -> bool:
+        if self._pending is not None:
+            self.resolve()
+        return name in self._uniform_locations
 
     @HZ_PROFILE_FUNCTION
     def bind(self):
-        glUseProgram(self._renderer_id)
+        if self._pending is not None:
+            self.resolve()
+        OpenGLStateCache.use_program(self._renderer_id)
 
     @HZ_PROFILE_FUNCTION
     def unbind(self):
-        glUseProgram(0)
+        OpenGLStateCache.use_program(0)
 
     @HZ_PROFILE_FUNCTION
     def set_int(self, name: str, value: int):
@@ -144,42 +383,38 @@ class OpenGLShader(Shader):
     def set_mat4(self, name: str, value: glm.mat4):
         self.upload_uniform_mat4(name, value)
 
+    # Uploads use the glProgramUniform* DSA calls, so the program does not
+    # have to be bound
+
     def upload_uniform_int(self, name: str, value: int):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform1i(location, value)
+        location = self.get_uniform_location(name)
+        glProgramUniform1i(self._renderer_id, location, value)
 
     # todo get np type
     def upload_uniform_int_array(self, name: str, values: ndarray, count: int):
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform1iv(location, count, values)
+        location = self.get_uniform_location(name)
+        glProgramUniform1iv(self._renderer_id, location, count, values)
 
     def upload_uniform_float(self, name: str, value: float):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform1f(location, value)
+        location = self.get_uniform_location(name)
+        glProgramUniform1f(self._renderer_id, location, value)
 
     def upload_uniform_float2(self, name: str, value: glm.vec2):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform2f(location, value.x, value.y)
+        location = self.get_uniform_location(name)
+        glProgramUniform2f(self._renderer_id, location, value.x, value.y)
 
     def upload_uniform_float3(self, name: str, value: glm.vec3):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform3f(location, value.x, value.y, value.z)
+        location = self.get_uniform_location(name)
+        glProgramUniform3f(self._renderer_id, location, value.x, value.y, value.z)
 
     def upload_uniform_float4(self, name: str, value: glm.vec4):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniform4f(location, value.x, value.y, value.z, value.w)
+        location = self.get_uniform_location(name)
+        glProgramUniform4f(self._renderer_id, location, value.x, value.y, value.z, value.w)
 
     def upload_uniform_mat3(self, name: str, matrix: glm.mat3):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniformMatrix3fv(location, 1, GL_FALSE, glm.value_ptr(matrix))
+        location = self.get_uniform_location(name)
+        glProgramUniformMatrix3fv(self._renderer_id, location, 1, GL_FALSE, glm.value_ptr(matrix))
 
     def upload_uniform_mat4(self, name: str, matrix: glm.mat4):
-        self.bind()
-        location = glGetUniformLocation(self._renderer_id, name)
-        glUniformMatrix4fv(location, 1, GL_FALSE, glm.value_ptr(matrix))
+        location = self.get_uniform_location(name)
+        glProgramUniformMatrix4fv(self._renderer_id, location, 1, GL_FALSE, glm.value_ptr(matrix))
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Optional
+from OpenGL.GL import *
+
+
+__all__ = ["OpenGLStateCache"]
+
+
+class OpenGLStateCache:
+    """
+    Shadow copy of the context state set by the engine. Every setter skips
+    the GL call when the state already holds the requested value, as each
+    call is a PyOpenGL round trip. Code issuing GL calls around the cache
+    (e.g. the ImGui renderer) must be followed by reset.
+    """
+    vertex_array: Optional[int] = None
+    # target -> buffer, GL_ELEMENT_ARRAY_BUFFER is part of the vertex array
+    buffers: dict[int, int] = {}
+    program: Optional[int] = None
+    # unit -> texture, textures are only bound with glBindTextureUnit, the
+    # engine creates and fills them with DSA calls that need no binding
+    texture_units: dict[int, int] = {}
+    # capability -> enabled
+    capabilities: dict[int, bool] = {}
+    blend_func: Optional[tuple[int, int]] = None
+    viewport: Optional[tuple[int, int, int, int]] = None
+    clear_color: Optional[tuple[float, float, float, float]] = None
+
+    issued_calls: int = 0
+    elided_calls: int = 0
+
+    @classmethod
+    def reset(cls):
+        """Forget the tracked state, the next call of every setter is issued."""
+        cls.vertex_array = None
+        cls.buffers = {}
+        cls.program = None
+        cls.texture_units = {}
+        cls.capabilities = {}
+        cls.blend_func = None
+        cls.viewport = None
+        cls.clear_color = None
+
+    @classmethod
+    def reset_call_counts(cls):
+        cls.issued_calls = 0
+        cls.elided_calls = 0
+
+    @classmethod
+    def track(cls, changed: bool) -> bool:
+        if changed:
+            cls.issued_calls += 1
+        else:
+            cls.elided_calls += 1
+        return changed
+
+    @classmethod
+    def bind_vertex_array(cls, renderer_id: int):
+        if cls.track(cls.vertex_array != renderer_id):
+            glBindVertexArray(renderer_id)
+            cls.vertex_array = renderer_id
+            # The element buffer binding belongs to the vertex array
+            cls.buffers.pop(GL_ELEMENT_ARRAY_BUFFER, None)
+
+    @classmethod
+    def bind_buffer(cls, target: int, renderer_id: int):
+        if cls.track(cls.buffers.get(target) != renderer_id):
+            glBindBuffer(target, renderer_id)
+            cls.buffers[target] = renderer_id
+
+    @classmethod
+    def use_program(cls, renderer_id: int):
+        if cls.track(cls.program != renderer_id):
+            glUseProgram(renderer_id)
+            cls.program = renderer_id
+
+    @classmethod
+    def bind_texture_unit(cls, unit: int, renderer_id: int):
+        if cls.track(cls.texture_units.get(unit) != renderer_id):
+            glBindTextureUnit(unit, renderer_id)
+            cls.texture_units[unit] = renderer_id
+
+    @classmethod
+    def forget_texture(cls, renderer_id: int):
+        # Deleting a texture unbinds it and frees its name for reuse
+        for unit, bound_id in list(cls.texture_units.items()):
+            if bound_id == renderer_id:
+                del cls.texture_units[unit]
+
+    @classmethod
+    def set_capability(cls, capability: int, enabled: bool):
+        if cls.track(cls.capabilities.get(capability) != enabled):
+            if enabled:
+                glEnable(capability)
+            else:
+                glDisable(capability)
+            cls.capabilities[capability] = enabled
+
+    @classmethod
+    def set_blend_func(cls, source: int, destination: int):
+        if cls.track(cls.blend_func != (source, destination)):
+            glBlendFunc(source, destination)
+            cls.blend_func = (source, destination)
+
+    @classmethod
+    def set_viewport(cls, x: int, y: int, width: int, height: int):
+        viewport = (int(x), int(y), int(width), int(height))
+        if cls.track(cls.viewport != viewport):
+            glViewport(*viewport)
+            cls.viewport = viewport
+
+    @classmethod
+    def set_clear_color(cls, r: float, g: float, b: float, a: float):
+        if cls.track(cls.clear_color != (r, g, b, a)):
+            glClearColor(r, g, b, a)
+            cls.clear_color = (r, g, b, a)
@@ -1,11 +1,18 @@
 from pyhazel.renderer.texture import Texture2D
+from pyhazel.renderer.texture import ImageData
+from pyhazel.renderer.texture_loader import TextureLoader
+from pyhazel.renderer.render_command import RenderCommand
 from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
-from PIL import Image
 import numpy as np
+import ctypes
 
 __all__ = ["OpenGLTexture"]
 
+# pixel unpack buffers of a streaming texture, used in turn
+PIXEL_BUFFER_COUNT = 2
+
 
 class OpenGLTexture(Texture2D):
     def __init__(self) -> None:
@@ -17,10 +24,17 @@ class OpenGLTexture(Texture2D):
         self.internal_format = None
         # describes format of pixel data in client memory
         self.data_format = None
+        # False while an asynchronous load shows the placeholder
+        self._loaded = True
+        # pixel unpack buffers streaming set_data, empty = upload from client memory
+        self._pixel_buffers: list[int] = []
+        self._pixel_buffer_index = 0
+        # bytes of every mip level
+        self._storage_size = 0
 
     @classmethod
     @HZ_PROFILE_FUNCTION
-    def create(cls, width: int, height: int) -> Texture2D:
+    def create(cls, width: int, height: int, streaming: bool = False) -> Texture2D:
         self = cls()
 
         self._width = width
@@ -28,8 +42,7 @@ class OpenGLTexture(Texture2D):
         self.internal_format = GL_RGBA8
         self.data_format = GL_RGBA
 
-        self._renderer_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, self._renderer_id)
+        self._renderer_id = self.create_texture()
 
         # set texture filtering parameters
         glTextureParameteri(self._renderer_id,
@@ -40,44 +53,95 @@ class OpenGLTexture(Texture2D):
         glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_S, GL_REPEAT)
         glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_T, GL_REPEAT)
 
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
+        glTextureStorage2D(
+            self._renderer_id,
+            1,
             self.internal_format,
             self._width,
-            self._height,
-            0,
-            self.data_format,
-            GL_UNSIGNED_BYTE,
-            bytes.fromhex('00000000')
+            self._height
         )
+        self._storage_size = self._width * self._height * self.bytes_per_pixel
+
+        if streaming:
+            self.create_pixel_buffers()
 
         return self
 
+    @staticmethod
+    def create_texture() -> int:
+        renderer_id = np.empty(1, dtype=np.uint32)
+        glCreateTextures(GL_TEXTURE_2D, 1, renderer_id)
+        return int(renderer_id[0])
+
+    def create_pixel_buffers(self):
+        size = self._width * self._height * self.bytes_per_pixel
+        pixel_buffers = np.empty(PIXEL_BUFFER_COUNT, dtype=np.uint32)
+        glCreateBuffers(PIXEL_BUFFER_COUNT, pixel_buffers)
+        for pixel_buffer in pixel_buffers:
+            # Immutable storage, only ever written through a mapping
+            glNamedBufferStorage(int(pixel_buffer), size, None, GL_MAP_WRITE_BIT)
+        self._pixel_buffers = [int(pixel_buffer) for pixel_buffer in pixel_buffers]
+
     @classmethod
     @HZ_PROFILE_FUNCTION
     def create_from_path(cls, path: str) -> Texture2D:
+        if RenderCommand.is_recording():
+            # The render thread owns the context, upload like async loads
+            return cls.create_from_path_async(path)
+
+        self = cls()
+        self.source_path = path
+        self.upload_image(self.decode_image(path))
+        return self
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def create_from_path_async(cls, path: str) -> Texture2D:
         self = cls()
+        self.source_path = path
 
-        self._renderer_id = glGenTextures(1)
-        glBindTexture(GL_TEXTURE_2D, self._renderer_id)
+        self.show_placeholder()
+        TextureLoader.load(self, path)
+        return self
+
+    def show_placeholder(self):
+        # Batches treat the texture as the placeholder until uploaded
+        placeholder = TextureLoader.placeholder
+        self._renderer_id = placeholder.renderer_id
+        self._width = placeholder.width
+        self._height = placeholder.height
+        self._loaded = False
+
+    @HZ_PROFILE_FUNCTION
+    def evict(self) -> None:
+        if not self._loaded:
+            return
+
+        renderer_id = self._renderer_id
+        self.show_placeholder()
+        # After any recorded command still binding the texture
+        RenderCommand.submit(self.delete_storage, renderer_id)
+
+    @staticmethod
+    def delete_storage(renderer_id: int) -> None:
+        glDeleteTextures(1, [renderer_id])
+        OpenGLStateCache.forget_texture(renderer_id)
+
+    @HZ_PROFILE_FUNCTION
+    def upload_image(self, image: ImageData) -> None:
+        renderer_id = self.create_texture()
 
         # set texture filtering parameters
-        glTextureParameteri(self._renderer_id,
+        glTextureParameteri(renderer_id,
                             GL_TEXTURE_MIN_FILTER, GL_LINEAR)
         glTextureParameteri(
-            self._renderer_id, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            renderer_id, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
 
-        glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_S, GL_REPEAT)
-        glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_T, GL_REPEAT)
-
-        # load image data
-        image = Image.open(path)
-        image = image.transpose(Image.FLIP_TOP_BOTTOM)
-        data = image.tobytes()
+        glTextureParameteri(renderer_id, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTextureParameteri(renderer_id, GL_TEXTURE_WRAP_T, GL_REPEAT)
 
         if image.mode == "RGB":
-            self.internal_format = GL_RGB
+            self.internal_format = GL_RGB8
             self.data_format = GL_RGB
         elif image.mode == "RGBA":
             self.internal_format = GL_RGBA8
@@ -85,28 +149,59 @@ class OpenGLTexture(Texture2D):
         else:
             assert False, "Format not supported!"
 
-        self._width = image.width
-        self._height = image.height
-
-        glTexImage2D(
-            GL_TEXTURE_2D,
-            0,
+        levels = [image] + image.mip_levels
+        glTextureStorage2D(
+            renderer_id,
+            len(levels),
             self.internal_format,
-            self._width,
-            self._height,
-            0,
-            self.data_format,
-            GL_UNSIGNED_BYTE,
-            data
+            image.width,
+            image.height
         )
+        for level, level_image in enumerate(levels):
+            glTextureSubImage2D(
+                renderer_id,
+                level,
+                0,
+                0,
+                level_image.width,
+                level_image.height,
+                self.data_format,
+                GL_UNSIGNED_BYTE,
+                level_image.data
+            )
 
-        return self
+        if image.mip_levels:
+            glTextureParameteri(renderer_id, GL_TEXTURE_MIN_FILTER, GL_LINEAR_MIPMAP_LINEAR)
+
+        self._width = image.width
+        self._height = image.height
+        self._storage_size = sum(
+            level_image.width * level_image.height * self.bytes_per_pixel
+            for level_image in levels
+        )
+        # Swapped last, readers see either the placeholder or the full image
+        self._renderer_id = renderer_id
+        self._loaded = True
 
     @HZ_PROFILE_FUNCTION
     def destroy(self):
         pass
         # todo: wire up to parent class and implement
 
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def gpu_memory_size(self) -> int:
+        if not self._loaded:
+            return 0
+        return self._storage_size
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return 4 if self.data_format == GL_RGBA else 3
+
     @property
     def renderer_id(self) -> int:
         return self._renderer_id
@@ -120,27 +215,82 @@ class OpenGLTexture(Texture2D):
         return self._height
 
     def set_data(self, data, size: int):
-        bpp = 4 if self.data_format == GL_RGBA else 3
-        assert size == bpp * self.width * self.height, "Data must be entire texture"
+        assert size == self.bytes_per_pixel * self.width * self.height, "Data must be entire texture"
+        self.set_sub_data(data, 0, 0, self.width, self.height)
+
+    def set_sub_data(self, data, x: int, y: int, width: int, height: int):
+        assert x >= 0 and y >= 0 and x + width <= self.width and y + height <= self.height, "Region outside of texture"
+        if isinstance(data, np.ndarray):
+            data = RenderCommand.capture(data)
+        RenderCommand.submit(self.upload_sub_data, data, x, y, width, height)
+
+    @HZ_PROFILE_FUNCTION
+    def upload_sub_data(self, data, x: int, y: int, width: int, height: int):
+        if not self._pixel_buffers:
+            glTextureSubImage2D(
+                self._renderer_id,
+                0,
+                x,
+                y,
+                width,
+                height,
+                self.data_format,
+                GL_UNSIGNED_BYTE,
+                data
+            )
+            return
+
+        pixel_buffer = self._pixel_buffers[self._pixel_buffer_index]
+        self._pixel_buffer_index = (self._pixel_buffer_index + 1) % len(self._pixel_buffers)
+
+        # The buffers are used in turn, so the one mapped here was last read
+        # an upload ago and the GPU is normally done with it. Invalidating
+        # tells the driver the old contents are not needed, so it never
+        # waits for that transfer
+        size = width * height * self.bytes_per_pixel
+        pointer = glMapNamedBufferRange(
+            pixel_buffer,
+            0,
+            size,
+            GL_MAP_WRITE_BIT | GL_MAP_INVALIDATE_BUFFER_BIT
+        )
+        mapped = np.ctypeslib.as_array(
+            ctypes.cast(pointer, ctypes.POINTER(ctypes.c_ubyte)),
+            shape=(size,)
+        )
+        mapped[:] = np.frombuffer(data, dtype=np.uint8, count=size)
+        glUnmapNamedBuffer(pixel_buffer)
+
+        # Returns once queued, the GPU pulls the pixels from the buffer
+        OpenGLStateCache.bind_buffer(GL_PIXEL_UNPACK_BUFFER, pixel_buffer)
         glTextureSubImage2D(
             self._renderer_id,
             0,
-            0,
-            0,
-            self.width,
-            self.height,
+            x,
+            y,
+            width,
+            height,
             self.data_format,
             GL_UNSIGNED_BYTE,
-            data
+            ctypes.c_void_p(0)
         )
+        # Uploads from client memory require no unpack buffer bound
+        OpenGLStateCache.bind_buffer(GL_PIXEL_UNPACK_BUFFER, 0)
 
     @HZ_PROFILE_FUNCTION
     def bind(self, slot: int = 0) -> None:
-        glBindTextureUnit(slot, self._renderer_id)
+        self.mark_bound()
+        OpenGLStateCache.bind_texture_unit(slot, self._renderer_id)
 
     @HZ_PROFILE_FUNCTION
     def delete(self) -> None:
+        if not self._loaded:
+            # The placeholder is shared, only drop the pending load
+            TextureLoader.cancel(self)
+            return
+
         glDeleteTextures(1, self._renderer_id)
+        OpenGLStateCache.forget_texture(self._renderer_id)
 
     def __eq__(self, __o: object) -> bool:
         return self._renderer_id == __o._renderer_id
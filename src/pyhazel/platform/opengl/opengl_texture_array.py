@@ -0,0 +1,169 @@
+from pyhazel.renderer.texture import Texture2D
+from pyhazel.renderer.texture import Texture2DArray
+from pyhazel.renderer.render_command import RenderCommand
+from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
+from OpenGL.GL import *
+import numpy as np
+
+__all__ = ["OpenGLTextureArray"]
+
+
+class OpenGLTextureArray(Texture2DArray):
+    def __init__(self) -> None:
+        super().__init__()
+        self._renderer_id = None
+        self._width = None
+        self._height = None
+        self._layers = None
+        # describes how texture is stored in the GPU
+        self.internal_format = GL_RGBA8
+        # describes format of pixel data in client memory
+        self.data_format = GL_RGBA
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def create(cls, width: int, height: int, layers: int) -> Texture2DArray:
+        self = cls()
+
+        self._width = width
+        self._height = height
+        self._layers = layers
+
+        renderer_id = np.empty(1, dtype=np.uint32)
+        glCreateTextures(GL_TEXTURE_2D_ARRAY, 1, renderer_id)
+        self._renderer_id = int(renderer_id[0])
+
+        # set texture filtering parameters
+        glTextureParameteri(self._renderer_id,
+                            GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTextureParameteri(
+            self._renderer_id, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+
+        glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTextureParameteri(self._renderer_id, GL_TEXTURE_WRAP_T, GL_REPEAT)
+
+        glTextureStorage3D(
+            self._renderer_id,
+            1,
+            self.internal_format,
+            self._width,
+            self._height,
+            self._layers
+        )
+
+        return self
+
+    @HZ_PROFILE_FUNCTION
+    def destroy(self):
+        pass
+        # todo: wire up to parent class and implement
+
+    @property
+    def renderer_id(self) -> int:
+        return self._renderer_id
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def layers(self) -> int:
+        return self._layers
+
+    def set_data(self, data, size: int):
+        assert size == 4 * self.width * self.height * self.layers, "Data must be entire texture"
+        if isinstance(data, np.ndarray):
+            data = RenderCommand.capture(data)
+        RenderCommand.submit(self.upload_data, data)
+
+    def upload_data(self, data):
+        glTextureSubImage3D(
+            self._renderer_id,
+            0,
+            0,
+            0,
+            0,
+            self.width,
+            self.height,
+            self.layers,
+            self.data_format,
+            GL_UNSIGNED_BYTE,
+            data
+        )
+
+    def set_layer_data(self, layer: int, data, size: int):
+        assert size == 4 * self.width * self.height, "Data must be entire layer"
+        if isinstance(data, np.ndarray):
+            data = RenderCommand.capture(data)
+        RenderCommand.submit(self.upload_layer_data, layer, data)
+
+    def upload_layer_data(self, layer: int, data):
+        glTextureSubImage3D(
+            self._renderer_id,
+            0,
+            0,
+            0,
+            layer,
+            self.width,
+            self.height,
+            1,
+            self.data_format,
+            GL_UNSIGNED_BYTE,
+            data
+        )
+
+    @HZ_PROFILE_FUNCTION
+    def copy_layer_from(self, layer: int, texture: Texture2D):
+        assert texture.width == self.width and texture.height == self.height, \
+            "Texture size must match the texture array"
+
+        if texture.internal_format == self.internal_format:
+            # GPU side copy, no round trip through client memory
+            glCopyImageSubData(
+                texture.renderer_id,
+                GL_TEXTURE_2D,
+                0,
+                0,
+                0,
+                0,
+                self._renderer_id,
+                GL_TEXTURE_2D_ARRAY,
+                0,
+                0,
+                0,
+                layer,
+                self.width,
+                self.height,
+                1
+            )
+            return
+
+        # Formats differ (e.g. RGB), let the driver convert on read back
+        pixels = np.empty(4 * self.width * self.height, dtype=np.uint8)
+        glGetTextureImage(
+            texture.renderer_id,
+            0,
+            self.data_format,
+            GL_UNSIGNED_BYTE,
+            pixels.nbytes,
+            pixels
+        )
+        # Already running on the thread owning the context
+        self.upload_layer_data(layer, pixels)
+
+    @HZ_PROFILE_FUNCTION
+    def bind(self, slot: int = 0) -> None:
+        OpenGLStateCache.bind_texture_unit(slot, self._renderer_id)
+
+    @HZ_PROFILE_FUNCTION
+    def delete(self) -> None:
+        glDeleteTextures(1, self._renderer_id)
+        OpenGLStateCache.forget_texture(self._renderer_id)
+
+    def __eq__(self, __o: object) -> bool:
+        return self._renderer_id == __o._renderer_id
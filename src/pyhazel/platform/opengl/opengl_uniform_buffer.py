@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from pyhazel.renderer.uniform_buffer import UniformBuffer
+from pyhazel.debug.instrumentor import *
+from OpenGL.GL import *
+import numpy as np
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+
+__all__ = ["OpenGLUniformBuffer"]
+
+
+class OpenGLUniformBuffer(UniformBuffer):
+    @HZ_PROFILE_FUNCTION
+    def __init__(self, size: int, binding: int) -> None:
+        super().__init__()
+        self._size = size
+        self._binding = binding
+        renderer_id = np.empty(1, dtype=np.uint32)
+        glCreateBuffers(1, renderer_id)
+        self._renderer_id = int(renderer_id[0])
+        glNamedBufferData(self._renderer_id, size, None, GL_DYNAMIC_DRAW)
+        glBindBufferBase(GL_UNIFORM_BUFFER, binding, self._renderer_id)
+
+    @HZ_PROFILE_FUNCTION
+    def destroy(self):
+        glDeleteBuffers(1, [self._renderer_id])
+
+    @HZ_PROFILE_FUNCTION
+    def set_data(self, data: ndarray, size: int, offset: int = 0):
+        assert offset + size <= self._size, "Uniform buffer overflow"
+        glNamedBufferSubData(self._renderer_id, offset, size, data)
+
+    @property
+    def binding(self) -> int:
+        return self._binding
+
+    @property
+    def renderer_id(self) -> int:
+        return self._renderer_id
@@ -7,6 +7,7 @@ from pyhazel.renderer import ShaderDataType
 from pyhazel.renderer import BufferElement
 from pyhazel.renderer import BufferLayout
 from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
 
 if TYPE_CHECKING:
@@ -39,6 +40,14 @@ def shader_data_type_to_opengl_base_type(value: ShaderDataType):
         return GL_INT
     elif value == ShaderDataType.BOOL:
         return GL_BOOL
+    elif value == ShaderDataType.HALF:
+        return GL_HALF_FLOAT
+    elif value == ShaderDataType.HALF2:
+        return GL_HALF_FLOAT
+    elif value == ShaderDataType.USHORT:
+        return GL_UNSIGNED_SHORT
+    elif value == ShaderDataType.UBYTE4:
+        return GL_UNSIGNED_BYTE
 
     assert False, "Unknown ShaderDataType"
 
@@ -75,7 +84,7 @@ class OpenGLVertexArray(VertexArray):
         self._vertex_buffers: list[VertexBuffer] = []
         self._renderer_id = glGenVertexArrays(1)
         self._vertex_buffer_offset = 0
-        glBindVertexArray(self._renderer_id)
+        OpenGLStateCache.bind_vertex_array(self._renderer_id)
 
         self.set_vertex_attrib_callbacks = {
             frozenset({
@@ -87,7 +96,11 @@ class OpenGLVertexArray(VertexArray):
                 ShaderDataType.INT2.name,
                 ShaderDataType.INT3.name,
                 ShaderDataType.INT4.name,
-                ShaderDataType.BOOL.name
+                ShaderDataType.BOOL.name,
+                ShaderDataType.HALF.name,
+                ShaderDataType.HALF2.name,
+                ShaderDataType.USHORT.name,
+                ShaderDataType.UBYTE4.name
             }): self.set_vector_vertex_attrib_callback,
             frozenset({
                 ShaderDataType.MAT3.name,
@@ -102,18 +115,19 @@ class OpenGLVertexArray(VertexArray):
 
     @HZ_PROFILE_FUNCTION
     def bind(self):
-        glBindVertexArray(self._renderer_id)
+        OpenGLStateCache.bind_vertex_array(self._renderer_id)
 
     @HZ_PROFILE_FUNCTION
     def unbind(self):
-        glBindVertexArray(0)
+        OpenGLStateCache.bind_vertex_array(0)
 
     @HZ_PROFILE_FUNCTION
     def add_vertex_buffer(self, vertex_buffer: VertexBuffer):
         assert len(vertex_buffer.buffer_layout.elements) > 0
 
-        glBindVertexArray(self._renderer_id)
+        OpenGLStateCache.bind_vertex_array(self._renderer_id)
         vertex_buffer.bind()
+        self._vertex_buffers.append(vertex_buffer)
 
         layout = vertex_buffer.buffer_layout
         for element in layout:
@@ -145,6 +159,8 @@ class OpenGLVertexArray(VertexArray):
             layout.stride,
             ctypes.c_void_p(element.offset)
         )
+        if element.divisor != 0:
+            glVertexAttribDivisor(self._vertex_buffer_offset, element.divisor)
         self._vertex_buffer_offset += 1
 
     @HZ_PROFILE_FUNCTION
@@ -161,7 +177,7 @@ class OpenGLVertexArray(VertexArray):
                 layout.stride,
                 ctypes.c_void_p(element.offset + 4 * count * index)
             )
-            glVertexArrayBindingDivisor(self._vertex_buffer_offset, 1)
+            glVertexAttribDivisor(self._vertex_buffer_offset, element.divisor)
             self._vertex_buffer_offset += 1
 
     @property
@@ -175,6 +191,6 @@ class OpenGLVertexArray(VertexArray):
     @index_buffer.setter
     @HZ_PROFILE_FUNCTION
     def index_buffer(self, value: IndexBuffer):
-        glBindVertexArray(self._renderer_id)
+        OpenGLStateCache.bind_vertex_array(self._renderer_id)
         value.bind()
         self._index_buffer = value
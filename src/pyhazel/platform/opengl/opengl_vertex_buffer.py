@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 from pyhazel.renderer.vertex_buffer import VertexBuffer
 from pyhazel.debug.instrumentor import *
+from .opengl_state_cache import OpenGLStateCache
 from OpenGL.GL import *
 
 
@@ -27,7 +28,7 @@ class OpenGLVertexBuffer(VertexBuffer):
         # GL_ELEMENT_ARRAY_BUFFER is not valid without an actively bound VAO
         # Binding with GL_ARRAY_BUFFER allows the data to be loaded regardless of VAO state.
         instance = cls()
-        glBindBuffer(GL_ARRAY_BUFFER, instance._renderer_id)
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, instance._renderer_id)
         glBufferData(GL_ARRAY_BUFFER, size, None, GL_DYNAMIC_DRAW)
         return instance
 
@@ -36,7 +37,7 @@ class OpenGLVertexBuffer(VertexBuffer):
         # GL_ELEMENT_ARRAY_BUFFER is not valid without an actively bound VAO
         # Binding with GL_ARRAY_BUFFER allows the data to be loaded regardless of VAO state.
         instance = cls()
-        glBindBuffer(GL_ARRAY_BUFFER, instance._renderer_id)
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, instance._renderer_id)
         glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
         return instance
 
@@ -47,11 +48,11 @@ class OpenGLVertexBuffer(VertexBuffer):
 
     @HZ_PROFILE_FUNCTION
     def bind(self):
-        glBindBuffer(GL_ARRAY_BUFFER, self._renderer_id)
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, self._renderer_id)
 
     @HZ_PROFILE_FUNCTION
     def unbind(self):
-        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        OpenGLStateCache.bind_buffer(GL_ARRAY_BUFFER, 0)
 
     @property
     def buffer_layout(self) -> BufferLayout:
@@ -62,5 +63,5 @@ class OpenGLVertexBuffer(VertexBuffer):
         self.layout = value
 
     def set_data(self, data: ndarray, size: int = 0):
-        glBindBuffer(GL_ARRAY_BUFFER, self._renderer_id)
-        glBufferSubData(GL_ARRAY_BUFFER, 0, size, data)
+        # Named upload, no bind needed
+        glNamedBufferSubData(self._renderer_id, 0, size, data)
@@ -1,5 +1,8 @@
 from .render_command import *
 from .renderer_api import *
+from .command_list import *
+from .render_thread import *
+from .gpu_timer import *
 from .buffer_element import *
 from .buffer_layout import *
 from .graphics_context import *
@@ -7,11 +10,19 @@ from .orthographic_camera import *
 from .index_buffer import *
 from .render_command import *
 from .renderer import *
+from .render_queue import *
 from .renderer_2d import *
+from .static_batch import *
 from .shader_data_type import *
 from .shader import *
 from .vertex_array import *
 from .vertex_buffer import *
 from .texture import *
+from .texture_loader import *
+from .texture_cache import *
+from .texture_asset import *
 from .framebuffer import *
+from .uniform_buffer import *
 from .shader_library import *
+from .sub_texture_2d import *
+from .texture_atlas import *
@@ -10,3 +10,5 @@ class BufferElement:
     name: str
     offset: int = 0
     normalized: bool = False
+    # 0 = advance per vertex, N = advance once every N instances
+    divisor: int = 0
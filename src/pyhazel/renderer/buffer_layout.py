@@ -1,5 +1,6 @@
 from typing import Iterator
 from .buffer_element import BufferElement
+import numpy as np
 
 
 __all__ = ["BufferLayout"]
@@ -15,6 +16,7 @@ class BufferLayout:
         self.stride = 0
         self.count = 0
         self._calculate_offsets_and_stride()
+        self.dtype = self._create_dtype()
 
     def _calculate_offsets_and_stride(self):
         offset = 0
@@ -24,5 +26,20 @@ class BufferLayout:
             self.stride += element.s_type.size
             self.count += element.s_type.count
 
+    def _create_dtype(self) -> np.dtype:
+        """
+        Build a NumPy structured dtype mirroring this layout, so a raw vertex
+        buffer can be viewed as records and written column by column.
+        """
+        return np.dtype({
+            "names": [element.name for element in self.elements],
+            "formats": [
+                (element.s_type.base_type, element.s_type.shape)
+                for element in self.elements
+            ],
+            "offsets": [element.offset for element in self.elements],
+            "itemsize": self.stride
+        })
+
     def __iter__(self) -> Iterator[BufferElement]:
         return iter(self.elements)
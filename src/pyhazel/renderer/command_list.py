@@ -0,0 +1,23 @@
+from typing import Any, Callable
+
+__all__ = ["CommandList"]
+
+
+class CommandList:
+    """Recorded render commands, replayed in order by execute."""
+
+    def __init__(self) -> None:
+        self.commands: list[tuple[Callable[..., Any], tuple]] = []
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def record(self, function: Callable[..., Any], *args):
+        self.commands.append((function, args))
+
+    def execute(self):
+        for function, args in self.commands:
+            function(*args)
+
+    def clear(self):
+        self.commands.clear()
@@ -4,6 +4,7 @@ from abc import ABC
 from abc import abstractmethod
 from dataclasses import dataclass
 from pyhazel.renderer import RendererAPI
+from pyhazel.renderer import RenderCommand
 
 
 @dataclass
@@ -17,6 +18,7 @@ class FramebufferSpecification:
 class Framebuffer(ABC):
     @classmethod
     def create(cls, spec: FramebufferSpecification) -> Framebuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+from typing import Optional
+from abc import ABC
+from abc import abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from dataclasses import field
+from .renderer_api import RendererAPI
+from .render_command import RenderCommand
+from pyhazel.debug.instrumentor import *
+import time
+
+__all__ = ["GPUTimer", "GPUProfiler"]
+
+
+class GPUTimer(ABC):
+    """Pool of GPU timestamp queries."""
+
+    @staticmethod
+    def create() -> GPUTimer:
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLGPUTimer
+            return OpenGLGPUTimer()
+
+        assert False, "Renderer type is undefined"
+
+    @abstractmethod
+    def timestamp(self) -> int:
+        """Record the GPU time once preceding commands complete; returns a query handle."""
+        pass
+
+    @abstractmethod
+    def try_get_result(self, query: int) -> Optional[int]:
+        """GPU time in nanoseconds, or None if the query is not available yet."""
+        pass
+
+    @abstractmethod
+    def release(self, query: int):
+        """Return a resolved query to the pool."""
+        pass
+
+    @abstractmethod
+    def current_time(self) -> int:
+        """Current GPU time in nanoseconds, read synchronously."""
+        pass
+
+
+@dataclass
+class GPUScope:
+    name: str
+    start_query: int
+    end_query: int = -1
+
+
+@dataclass
+class GPUFrame:
+    scopes: list[GPUScope] = field(default_factory=list)
+
+
+class GPUProfiler:
+    """
+    Times GPU passes with timestamp queries which are read back a few
+    frames later, once available, so the CPU never waits on the GPU.
+    Results go to frame_times and to a GPU track of the Instrumentor trace.
+
+    All query work is submitted through RenderCommand, so it runs on the
+    render thread when one is used.
+    """
+
+    timer: Optional[GPUTimer] = None
+    # frames whose queries were issued but not resolved yet
+    pending_frames: deque[GPUFrame] = deque()
+    current_frame = GPUFrame()
+    open_scopes: list[GPUScope] = []
+    # GPU milliseconds of every scope name in the latest resolved frame
+    frame_times: dict[str, float] = {}
+    # microseconds to add to GPU timestamps to get Instrumentor times
+    clock_offset_us: float = 0
+    max_pending_frames: int = 8
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def init(cls):
+        cls.timer = GPUTimer.create()
+        cls.clock_offset_us = (
+            time.perf_counter_ns() - cls.timer.current_time()
+        ) * 0.001
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls.timer is not None
+
+    @classmethod
+    def scope(cls, name: str) -> GPUProfileScope:
+        return GPUProfileScope(name)
+
+    @classmethod
+    def begin(cls, name: str):
+        RenderCommand.submit(cls.begin_query, name)
+
+    @classmethod
+    def end(cls):
+        RenderCommand.submit(cls.end_query)
+
+    @classmethod
+    def new_frame(cls):
+        """Close the current frame and resolve finished ones."""
+        if cls.is_enabled():
+            RenderCommand.submit(cls.resolve_frames)
+
+    @classmethod
+    def begin_query(cls, name: str):
+        scope = GPUScope(name, cls.timer.timestamp())
+        cls.open_scopes.append(scope)
+        cls.current_frame.scopes.append(scope)
+
+    @classmethod
+    def end_query(cls):
+        cls.open_scopes.pop().end_query = cls.timer.timestamp()
+
+    @classmethod
+    def resolve_frames(cls):
+        assert not cls.open_scopes, "GPU profile scope left open at end of frame!"
+
+        cls.pending_frames.append(cls.current_frame)
+        cls.current_frame = GPUFrame()
+
+        while cls.pending_frames:
+            results = cls.try_resolve_frame(cls.pending_frames[0])
+            if results is None:
+                if len(cls.pending_frames) <= cls.max_pending_frames:
+                    break
+                results = []  # queries lagging too far behind, drop the frame
+
+            frame = cls.pending_frames.popleft()
+            for scope in frame.scopes:
+                cls.timer.release(scope.start_query)
+                cls.timer.release(scope.end_query)
+
+            if results:
+                cls.publish(results)
+
+    @classmethod
+    def try_resolve_frame(cls, frame: GPUFrame) -> Optional[list[tuple[str, int, int]]]:
+        results = []
+        for scope in frame.scopes:
+            start = cls.timer.try_get_result(scope.start_query)
+            end = cls.timer.try_get_result(scope.end_query)
+            if start is None or end is None:
+                return None
+            results.append((scope.name, start, end))
+        return results
+
+    @classmethod
+    def publish(cls, results: list[tuple[str, int, int]]):
+        frame_times: dict[str, float] = {}
+        for name, start, end in results:
+            frame_times[name] = frame_times.get(name, 0) + (end - start) * 1e-6
+            HZ_PROFILE_GPU_EVENT(
+                name,
+                start * 0.001 + cls.clock_offset_us,
+                end * 0.001 + cls.clock_offset_us
+            )
+        cls.frame_times = frame_times
+
+
+class GPUProfileScope:
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self):
+        if GPUProfiler.is_enabled():
+            GPUProfiler.begin(self.name)
+
+    def __exit__(self, exc_type, value, traceback):
+        if GPUProfiler.is_enabled():
+            GPUProfiler.end()
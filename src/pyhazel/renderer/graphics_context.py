@@ -12,3 +12,13 @@ class GraphicsContent(ABC):
     @abstractmethod
     def swap_buffers(self):
         pass
+
+    @abstractmethod
+    def make_current(self):
+        """Make the context current on the calling thread."""
+        pass
+
+    @abstractmethod
+    def release(self):
+        """Detach the context from the calling thread."""
+        pass
@@ -5,6 +5,7 @@ from typing import TYPE_CHECKING
 from abc import ABC
 from abc import abstractmethod
 from .renderer_api import RendererAPI
+from .render_command import RenderCommand
 
 if TYPE_CHECKING:
     from numpy import ndarray
@@ -15,6 +16,7 @@ __all__ = ["IndexBuffer"]
 class IndexBuffer(ABC):
     @staticmethod
     def create(data: ndarray, count: int = 0) -> IndexBuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
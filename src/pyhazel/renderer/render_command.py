@@ -1,9 +1,12 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import threading
+import numpy as np
 import glm
 
 if TYPE_CHECKING:
     from .vertex_array import VertexArray
+    from .command_list import CommandList
 
 __all__ = ["RenderCommand"]
 
@@ -25,6 +28,10 @@ class LazyRendererAPIFactory:
 
 class RenderCommand:
     _renderer_api = None
+    # list recording graphics calls for the render thread, None = call immediately
+    command_list: Optional[CommandList] = None
+    # thread executing the command lists, submits from it run immediately
+    render_thread_id: Optional[int] = None
 
     @classmethod
     @property
@@ -34,22 +41,65 @@ class RenderCommand:
             cls._renderer_api = RendererAPI.create()
         return cls._renderer_api
 
+    @classmethod
+    def is_recording(cls) -> bool:
+        """True while graphics calls must be recorded, i.e. off the render thread."""
+        return cls.command_list is not None and threading.get_ident() != cls.render_thread_id
+
+    @classmethod
+    def submit(cls, function: Callable[..., Any], *args):
+        """
+        Call function, which issues graphics calls, on the thread owning the
+        graphics context: immediately, or when the command list being
+        recorded is executed by the render thread.
+        """
+        if cls.is_recording():
+            cls.command_list.record(function, *args)
+        else:
+            function(*args)
+
+    @classmethod
+    def capture(cls, data: np.ndarray) -> np.ndarray:
+        """Copy data read by a submitted command if it runs later."""
+        return data.copy() if cls.is_recording() else data
+
     @classmethod
     def init(cls):
         cls.renderer_api.init()
 
     @classmethod
     def on_window_resize(cls, x: float, y: float, width: float, height: float):
-        cls.renderer_api.set_viewport(x, y, width, height)
+        cls.submit(cls.renderer_api.set_viewport, x, y, width, height)
 
     @classmethod
     def set_clear_color(cls, color: glm.vec4):
-        cls.renderer_api.set_clear_color(color)
+        cls.submit(cls.renderer_api.set_clear_color, glm.vec4(color))
+
+    @classmethod
+    def reset_state_cache(cls):
+        cls.submit(cls.renderer_api.reset_state_cache)
 
     @classmethod
     def clear(cls):
-        cls.renderer_api.clear()
+        from .gpu_timer import GPUProfiler  # prevent circular import
+        with GPUProfiler.scope("Clear"):
+            cls.submit(cls.renderer_api.clear)
+
+    @classmethod
+    def draw_vertex_array(cls, vertex_array: VertexArray, count: int = -1, base_vertex: int = 0):
+        cls.submit(
+            cls.renderer_api.draw_vertex_array,
+            vertex_array,
+            count,
+            base_vertex
+        )
 
     @classmethod
-    def draw_vertex_array(cls, vertex_array: VertexArray, count: int = -1):
-        cls.renderer_api.draw_vertex_array(vertex_array, count)
+    def draw_vertex_array_instanced(cls, vertex_array: VertexArray, count: int, instance_count: int, base_instance: int = 0):
+        cls.submit(
+            cls.renderer_api.draw_vertex_array_instanced,
+            vertex_array,
+            count,
+            instance_count,
+            base_instance
+        )
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+from pyhazel.debug.instrumentor import *
+import numpy as np
+import glm
+
+if TYPE_CHECKING:
+    from .texture import Texture2D
+
+__all__ = ["QuadRenderQueue", "compute_sort_keys"]
+
+
+def compute_sort_keys(layers: np.ndarray, depths: np.ndarray, shader_ids: np.ndarray, texture_ids: np.ndarray) -> np.ndarray:
+    """
+    Pack the sort criteria of N commands into 64-bit keys:
+
+        | layer (8) | depth (24) | shader (8) | texture (24) |
+
+    Depth is ordered back to front (ascending z) so blended sprites compose
+    correctly; commands at the same depth are grouped by shader, then by
+    texture, which keeps texture switches to a minimum.
+    """
+    # Map float bits onto unsigned integers with the same ordering
+    bits = np.asarray(depths, dtype=np.float32).view(np.uint32)
+    ordered_depths = np.where(
+        bits & np.uint32(0x80000000),
+        ~bits,
+        bits | np.uint32(0x80000000)
+    )
+
+    keys = (np.asarray(layers, dtype=np.uint64) & np.uint64(0xFF)) << np.uint64(56)
+    keys |= (ordered_depths.astype(np.uint64) >> np.uint64(8)) << np.uint64(32)
+    keys |= (np.asarray(shader_ids, dtype=np.uint64) & np.uint64(0xFF)) << np.uint64(24)
+    keys |= np.asarray(texture_ids, dtype=np.uint64) & np.uint64(0xFFFFFF)
+    return keys
+
+
+class QuadRenderQueue:
+    """
+    Preallocated list of quad draw commands recorded between begin_scene and
+    end_scene, sorted by compute_sort_keys before batches are built.
+    """
+
+    command_dtype = np.dtype([
+        ("transform", np.float32, (4, 4)),  # glm column order
+        ("color", np.float32, (4,)),
+        ("tex_coords", np.float32, (4, 2)),
+        ("tiling_factor", np.float32),
+        ("layer", np.uint8),
+        ("shader_id", np.uint8),
+        # identifies the texture object, renderer ids change while loading
+        ("texture_id", np.int64),
+    ])
+
+    def __init__(self, capacity: int) -> None:
+        self.commands = np.zeros(capacity, dtype=self.command_dtype)
+        # texture of every command, None for the white texture
+        self.textures = np.empty(capacity, dtype=object)
+        self.count = 0
+        # sort layer applied to subsequently submitted commands
+        self.layer = 0
+        # id() of every recorded texture -> its texture_id, 0 = white texture
+        self.texture_keys: dict[int, int] = {}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.commands)
+
+    def clear(self):
+        self.textures[:self.count] = None  # release texture references
+        self.count = 0
+        self.texture_keys.clear()
+
+    def reserve(self, count: int):
+        required = self.count + count
+        if required <= self.capacity:
+            return
+
+        capacity = max(required, self.capacity * 2)
+        commands = np.zeros(capacity, dtype=self.command_dtype)
+        commands[:self.count] = self.commands[:self.count]
+        textures = np.empty(capacity, dtype=object)
+        textures[:self.count] = self.textures[:self.count]
+
+        self.commands = commands
+        self.textures = textures
+
+    def get_texture_key(self, texture: Optional[Texture2D]) -> int:
+        if texture is None:
+            return 0
+        # Stable while the texture is referenced by self.textures
+        key = self.texture_keys.get(id(texture))
+        if key is None:
+            key = len(self.texture_keys) + 1
+            self.texture_keys[id(texture)] = key
+        return key
+
+    def submit(self, transform: glm.mat4, color: glm.vec4, tex_coords: np.ndarray, texture: Optional[Texture2D], tiling_factor: float):
+        self.reserve(1)
+
+        self.commands[self.count] = (
+            transform.to_tuple(),
+            tuple(color),
+            tex_coords,
+            tiling_factor,
+            self.layer,
+            0,  # todo: shader id once Renderer2D supports more than one shader
+            self.get_texture_key(texture)
+        )
+        self.textures[self.count] = texture
+        self.count += 1
+
+    def submit_many(self, transforms: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, textures: Optional[Sequence[Optional[Texture2D]]], tiling_factors: np.ndarray):
+        count = len(transforms)
+        self.reserve(count)
+
+        commands = self.commands[self.count:self.count + count]
+        commands["transform"] = transforms
+        commands["color"] = colors
+        commands["tex_coords"] = tex_coords
+        commands["tiling_factor"] = tiling_factors
+        commands["layer"] = self.layer
+        commands["shader_id"] = 0
+
+        if textures is None:
+            commands["texture_id"] = 0
+        else:
+            commands["texture_id"] = np.fromiter(
+                (self.get_texture_key(texture) for texture in textures),
+                dtype=np.int64,
+                count=count
+            )
+            self.textures[self.count:self.count + count] = textures
+
+        self.count += count
+
+    @HZ_PROFILE_FUNCTION
+    def sorted_commands(self) -> tuple[np.ndarray, np.ndarray]:
+        """Return copies of the commands and their textures in sort key order."""
+        commands = self.commands[:self.count]
+        keys = compute_sort_keys(
+            commands["layer"],
+            commands["transform"][:, 3, 2],  # z translation
+            commands["shader_id"],
+            commands["texture_id"]
+        )
+        # Stable, so equal keys keep their submission order
+        order = np.argsort(keys, kind="stable")
+        return commands[order], self.textures[:self.count][order]
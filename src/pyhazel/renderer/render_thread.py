@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+from .render_command import RenderCommand
+from pyhazel.debug.instrumentor import *
+import threading
+
+if TYPE_CHECKING:
+    from .command_list import CommandList
+    from .graphics_context import GraphicsContent
+
+__all__ = ["RenderThread"]
+
+
+class RenderThread:
+    """
+    Thread owning the graphics context which executes one command list at
+    a time, so the main thread can record the next frame meanwhile.
+    """
+
+    def __init__(self, context: GraphicsContent) -> None:
+        self.context = context
+        self.thread = threading.Thread(
+            target=self.run,
+            name="RenderThread",
+            daemon=True
+        )
+        self.condition = threading.Condition()
+        self.pending: Optional[CommandList] = None
+        self.running = False
+        self.error: Optional[BaseException] = None
+
+    @HZ_PROFILE_FUNCTION
+    def start(self):
+        # The context can only be current on one thread
+        self.context.release()
+        self.running = True
+        self.thread.start()
+
+    @HZ_PROFILE_FUNCTION
+    def stop(self):
+        self.wait()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
+        self.context.make_current()
+
+    @HZ_PROFILE_FUNCTION
+    def submit(self, command_list: CommandList):
+        """Execute command_list once the previous one has finished."""
+        self.wait()
+        with self.condition:
+            self.pending = command_list
+            self.condition.notify_all()
+
+    @HZ_PROFILE_FUNCTION
+    def wait(self):
+        """Block until the submitted command list has been executed."""
+        with self.condition:
+            self.condition.wait_for(
+                lambda: self.pending is None or self.error is not None
+            )
+            if self.error is not None:
+                raise RuntimeError("Render thread failed") from self.error
+
+    def run(self):
+        self.context.make_current()
+        # Commands submitting further commands run them right away
+        RenderCommand.render_thread_id = threading.get_ident()
+        try:
+            while True:
+                with self.condition:
+                    self.condition.wait_for(
+                        lambda: self.pending is not None or not self.running
+                    )
+                    if self.pending is None:
+                        break
+                    command_list = self.pending
+
+                with HZ_PROFILE_SCOPE("RenderThread Execute"):
+                    command_list.execute()
+
+                with self.condition:
+                    self.pending = None
+                    self.condition.notify_all()
+        except BaseException as error:
+            with self.condition:
+                self.error = error
+                self.condition.notify_all()
+        finally:
+            RenderCommand.render_thread_id = None
+            self.context.release()
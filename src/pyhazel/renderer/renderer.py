@@ -5,13 +5,19 @@ from dataclasses import dataclass
 from copy import copy
 from . import RenderCommand
 from .renderer_2d import Renderer2D
+from .uniform_buffer import CAMERA_UNIFORM_SIZE
+from .gpu_timer import GPUProfiler
+from .texture_loader import TextureLoader
 from pyhazel.debug.instrumentor import *
+from pyhazel.config import *
+import numpy as np
 import glm
 
 if TYPE_CHECKING:
     from . import Shader
     from . import OrthographicCamera
     from . import VertexArray
+    from . import UniformBuffer
     from pyhazel.platform.opengl import OpenGLShader
 
 __all__ = ["Renderer"]
@@ -20,17 +26,33 @@ __all__ = ["Renderer"]
 @dataclass
 class SceneData:
     view_projection_matrix: glm.mat4 = None
+    camera_uniform_buffer: UniformBuffer = None
 
 
 class Renderer:
     scene_data = SceneData()
 
-    @staticmethod
+    @classmethod
     @HZ_PROFILE_FUNCTION
-    def init():
+    def init(cls):
         RenderCommand.init()
         Renderer2D.init()
 
+        # One buffer owns the Camera binding point
+        cls.scene_data.camera_uniform_buffer = Renderer2D.data.camera_uniform_buffer
+
+        # Asynchronously loaded textures show white until uploaded
+        TextureLoader.init(Renderer2D.data.white_texture)
+
+        if GPU_PROFILING_ENABLED:
+            GPUProfiler.init()
+
+    @staticmethod
+    @HZ_PROFILE_FUNCTION
+    def shutdown():
+        TextureLoader.shutdown()
+        Renderer2D.shutdown()
+
     @staticmethod
     def on_window_resize(width: float, height: float):
         RenderCommand.on_window_resize(0, 0, width, height)
@@ -40,6 +62,13 @@ class Renderer:
         matrix = copy(camera.view_projection_matrix)
         cls.scene_data.view_projection_matrix = matrix
 
+        # Uploaded once here rather than per submitted shader
+        RenderCommand.submit(
+            cls.scene_data.camera_uniform_buffer.set_data,
+            np.array(matrix.to_tuple(), dtype=np.float32),
+            CAMERA_UNIFORM_SIZE
+        )
+
     @staticmethod
     def end_scene():
         pass
@@ -49,15 +78,19 @@ class Renderer:
         # todo: eventually move into material and won't need to downcast
         opengl_shader: OpenGLShader = shader
 
-        opengl_shader.bind()
-        opengl_shader.upload_uniform_mat4(
-            "u_ViewProjection",
-            cls.scene_data.view_projection_matrix
-        )
-        opengl_shader.upload_uniform_mat4(
+        RenderCommand.submit(opengl_shader.bind)
+        if opengl_shader.has_uniform("u_ViewProjection"):
+            # Shaders without the Camera block
+            RenderCommand.submit(
+                opengl_shader.upload_uniform_mat4,
+                "u_ViewProjection",
+                cls.scene_data.view_projection_matrix
+            )
+        RenderCommand.submit(
+            opengl_shader.upload_uniform_mat4,
             "u_Transform",
-            transform
+            glm.mat4(transform)
         )
 
-        vertex_array.bind()
+        # draw_vertex_array binds the vertex array
         RenderCommand.draw_vertex_array(vertex_array)
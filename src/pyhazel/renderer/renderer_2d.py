@@ -1,18 +1,34 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional, Union
+from typing import TYPE_CHECKING, Callable, Optional, Sequence, Union
+from concurrent.futures import ThreadPoolExecutor
+from collections import deque
 from dataclasses import dataclass
 from dataclasses import field
+from enum import Enum
+from enum import auto
 
 from .vertex_array import VertexArray
 from .vertex_buffer import VertexBuffer
+from .vertex_buffer import RingVertexBuffer
 from .buffer_layout import BufferLayout
 from .buffer_element import BufferElement
 from .shader_data_type import ShaderDataType
 from .index_buffer import IndexBuffer
 from .texture import Texture2D
+from .texture import Texture2DArray
+from .sub_texture_2d import SubTexture2D
 from .shader import Shader
+from .uniform_buffer import UniformBuffer
+from .uniform_buffer import CAMERA_UNIFORM_BINDING
+from .uniform_buffer import CAMERA_UNIFORM_SIZE
 from .render_command import RenderCommand
+from .render_queue import QuadRenderQueue
+from .gpu_timer import GPUProfiler
+from .renderer_2d_shaders import QUAD_VERTEX_SRC
+from .renderer_2d_shaders import QUAD_INSTANCED_VERTEX_SRC
+from .renderer_2d_shaders import QUAD_FRAGMENT_SRC
+from .renderer_2d_shaders import QUAD_TEXTURE_ARRAY_FRAGMENT_SRC
 from pyhazel.debug.instrumentor import *
 
 import numpy as np
@@ -21,17 +37,74 @@ import glm
 if TYPE_CHECKING:
     from .orthographic_camera import OrthographicCamera
     from .camera import Camera
+    from .static_batch import StaticBatch
 
 __all__ = [
     "Renderer2D",
-    "Statistics"
+    "Renderer2DSpecification",
+    "Statistics",
+    "FrameStatistics",
+    "FlushReason"
 ]
 
 
+class FlushReason(Enum):
+    BATCH_FULL = auto()  # no room for more quads in the vertex buffer
+    TEXTURE_SLOTS_FULL = auto()  # every texture slot is in use
+    STATIC_BATCH = auto()  # a static batch, or the quads batched ahead of it
+    END_SCENE = auto()
+
+
+@dataclass
+class FrameStatistics:
+    draw_calls: int = 0
+    quad_count: int = 0
+    static_batch_builds: int = 0
+    culled_quad_count: int = 0
+    flush_reasons: dict[FlushReason, int] = field(default_factory=dict)
+    bytes_uploaded: int = 0
+    texture_binds: int = 0
+    shader_binds: int = 0
+    peak_batch_quads: int = 0
+    state_calls_issued: int = 0
+    state_calls_elided: int = 0
+
+
 class Statistics:
-    def __init__(self) -> None:
+    def __init__(self, history_size: int = 120) -> None:
         self.draw_calls: int = 0
         self.quad_count: int = 0
+        self.static_batch_builds: int = 0
+        self.culled_quad_count: int = 0
+        # draw calls issued for every reason
+        self.flush_reasons: dict[FlushReason, int] = {
+            reason: 0 for reason in FlushReason
+        }
+        self.bytes_uploaded: int = 0
+        self.texture_binds: int = 0
+        self.shader_binds: int = 0
+        # most quads drawn by a single draw call
+        self.peak_batch_quads: int = 0
+        # issued and elided state calls, collected on the thread owning the
+        # context as its state cache counts them (a frame late when threaded)
+        self.state_call_counts: tuple[int, int] = (0, 0)
+        # statistics of the most recent frames, archived by reset
+        self.history: deque[FrameStatistics] = deque(maxlen=history_size)
+
+    @property
+    def gpu_times(self) -> dict[str, float]:
+        """GPU milliseconds per profiled pass of the latest resolved frame."""
+        return GPUProfiler.frame_times
+
+    @property
+    def state_calls_issued(self) -> int:
+        """State changing graphics calls that reached the driver this frame."""
+        return self.state_call_counts[0]
+
+    @property
+    def state_calls_elided(self) -> int:
+        """Redundant state changing graphics calls dropped this frame."""
+        return self.state_call_counts[1]
 
     @property
     def total_vertex_count(self):
@@ -41,27 +114,182 @@ class Statistics:
     def total_index_count(self):
         return self.quad_count * 6
 
+    def record_draw_call(self, reason: FlushReason, quad_count: int):
+        self.draw_calls += 1
+        self.flush_reasons[reason] += 1
+        self.peak_batch_quads = max(self.peak_batch_quads, quad_count)
+
+    def collect_state_call_counts(self):
+        renderer_api = RenderCommand.renderer_api
+        self.state_call_counts = renderer_api.state_call_counts
+        renderer_api.reset_state_call_counts()
+
+    def snapshot(self) -> FrameStatistics:
+        return FrameStatistics(
+            self.draw_calls,
+            self.quad_count,
+            self.static_batch_builds,
+            self.culled_quad_count,
+            dict(self.flush_reasons),
+            self.bytes_uploaded,
+            self.texture_binds,
+            self.shader_binds,
+            self.peak_batch_quads,
+            self.state_calls_issued,
+            self.state_calls_elided
+        )
+
     def reset(self):
+        """Archive the counters of the finished frame and start a new one."""
+        RenderCommand.submit(self.collect_state_call_counts)
+        self.history.append(self.snapshot())
+
         self.draw_calls = 0
         self.quad_count = 0
+        self.static_batch_builds = 0
+        self.culled_quad_count = 0
+        for reason in self.flush_reasons:
+            self.flush_reasons[reason] = 0
+        self.bytes_uploaded = 0
+        self.texture_binds = 0
+        self.shader_binds = 0
+        self.peak_batch_quads = 0
+
+
+QUAD_VERTEX_POSITIONS = np.array(
+    [[-0.5, -0.5], [0.5, -0.5], [0.5, 0.5], [-0.5, 0.5]],
+    dtype=np.float32
+)
+QUAD_TEX_COORDS = np.array(
+    [[0, 0], [1, 0], [1, 1], [0, 1]],
+    dtype=np.float32
+)
+# QUAD_VERTEX_POSITIONS in homogeneous coordinates
+QUAD_CORNERS = np.array(
+    [[-0.5, -0.5, 0, 1], [0.5, -0.5, 0, 1], [0.5, 0.5, 0, 1], [-0.5, 0.5, 0, 1]],
+    dtype=np.float32
+)
+
+
+@HZ_PROFILE_FUNCTION
+def compute_quad_vertex_positions(positions: np.ndarray, sizes: np.ndarray, rotations_rad: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized equivalent of applying Renderer2D.compute_transform to the
+    four unit quad corners. Returns an array of shape (N, 4, 3), written
+    to out if given.
+    """
+    local = QUAD_VERTEX_POSITIONS[np.newaxis, :, :] * sizes[:, np.newaxis, :]
+    cos = np.cos(rotations_rad)[:, np.newaxis]
+    sin = np.sin(rotations_rad)[:, np.newaxis]
+
+    result = np.empty((len(positions), 4, 3), dtype=np.float32) if out is None else out
+    result[:, :, 0] = local[:, :, 0] * cos - local[:, :, 1] * sin + positions[:, np.newaxis, 0]
+    result[:, :, 1] = local[:, :, 0] * sin + local[:, :, 1] * cos + positions[:, np.newaxis, 1]
+    result[:, :, 2] = positions[:, np.newaxis, 2]
+    return result
+
+
+@HZ_PROFILE_FUNCTION
+def compute_quad_transforms(positions: np.ndarray, sizes: np.ndarray, rotations_rad: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized equivalent of Renderer2D.compute_transform. Returns an array
+    of shape (N, 4, 4) holding each matrix column by column, matching the
+    memory layout of glm.mat4, written to out if given.
+    """
+    cos = np.cos(rotations_rad)
+    sin = np.sin(rotations_rad)
+
+    if out is None:
+        result = np.zeros((len(positions), 4, 4), dtype=np.float32)
+    else:
+        result = out
+        result[:] = 0
+    result[:, 0, 0] = cos * sizes[:, 0]
+    result[:, 0, 1] = sin * sizes[:, 0]
+    result[:, 1, 0] = -sin * sizes[:, 1]
+    result[:, 1, 1] = cos * sizes[:, 1]
+    result[:, 2, 2] = 1
+    result[:, 3, 0:3] = positions
+    result[:, 3, 3] = 1
+    return result
+
+
+@HZ_PROFILE_FUNCTION
+def compute_quad_vertex_positions_from_transforms(transforms: np.ndarray) -> np.ndarray:
+    """
+    Apply N transforms of shape (N, 4, 4), in glm column order, to the four
+    unit quad corners. Returns an array of shape (N, 4, 3).
+    """
+    return (QUAD_CORNERS @ transforms)[:, :, 0:3]
+
+
+def compute_visible_quads(view_projection: np.ndarray, corners: np.ndarray) -> np.ndarray:
+    """
+    Vectorized frustum test of N quads given by their world space corners
+    of shape (N, 4, 3). A quad is culled when all four corners lie outside
+    the same clip plane. view_projection is in glm column order.
+    Returns a boolean mask of the visible quads.
+    """
+    clip = corners @ view_projection[0:3] + view_projection[3]
+    w = clip[:, :, 3:4]
+    outside = (
+        (clip[:, :, 0:3] > w).all(axis=1) |
+        (clip[:, :, 0:3] < -w).all(axis=1)
+    )
+    return ~outside.any(axis=1)
+
+
+def compute_view_bounds(view_projection: glm.mat4) -> tuple[float, float, float, float]:
+    """(min x, min y, max x, max y) of the view frustum corners in world space."""
+    inverse_view_projection = glm.inverse(view_projection)
+    xs = []
+    ys = []
+    for x in (-1, 1):
+        for y in (-1, 1):
+            for z in (-1, 1):
+                corner = inverse_view_projection * glm.vec4(x, y, z, 1)
+                xs.append(corner.x / corner.w)
+                ys.append(corner.y / corner.w)
+
+    return min(xs), min(ys), max(xs), max(ys)
+
+
+def create_quad_indices(quad_count: int) -> np.ndarray:
+    """Two triangles (0, 1, 2) and (2, 3, 0) for every four vertices."""
+    offsets = np.arange(0, quad_count * 4, 4, dtype=np.uint32)
+    quad = np.array([0, 1, 2, 2, 3, 0], dtype=np.uint32)
+    return (offsets[:, np.newaxis] + quad).ravel()
 
 
 class QuadVertexData:
-    layout = BufferLayout(
+    # 44 bytes per vertex
+    float_layout = BufferLayout(
         BufferElement(ShaderDataType.FLOAT3, "a_Position"),
         BufferElement(ShaderDataType.FLOAT4, "a_Color"),
         BufferElement(ShaderDataType.FLOAT2, "a_TexCoord"),
         BufferElement(ShaderDataType.FLOAT, "a_TexIndex"),
         BufferElement(ShaderDataType.FLOAT, "a_TilingFactor"),
     )
+    # 24 bytes per vertex, read by the same shaders
+    packed_layout = BufferLayout(
+        BufferElement(ShaderDataType.FLOAT3, "a_Position"),
+        BufferElement(ShaderDataType.UBYTE4, "a_Color", normalized=True),
+        BufferElement(ShaderDataType.HALF2, "a_TexCoord"),
+        BufferElement(ShaderDataType.USHORT, "a_TexIndex"),
+        BufferElement(ShaderDataType.HALF, "a_TilingFactor"),
+    )
 
-    def __init__(self, max_vertices: int) -> None:
+    def __init__(self, max_vertices: int, packed: bool = False) -> None:
         self.max_vertices = max_vertices
         self.vertex_count = 0
+        self.packed = packed
+        self.layout = self.packed_layout if packed else self.float_layout
         self.internal_buffer = np.zeros(
-            max_vertices * self.layout.count,
-            dtype=np.float32
+            max_vertices * self.layout.stride,
+            dtype=np.uint8
         )
+        # record view over internal_buffer, one record per vertex
+        self.vertices = self.internal_buffer.view(self.layout.dtype)
 
     @property
     def index_count(self) -> int:
@@ -78,52 +306,114 @@ class QuadVertexData:
     def clear(self):
         self.vertex_count = 0
 
+    def bind_storage(self, storage: np.ndarray):
+        """Write vertices into storage (e.g. mapped GPU memory) from now on."""
+        self.internal_buffer = storage.view(np.uint8)
+        self.vertices = storage.view(self.layout.dtype)
+
+    def encode_colors(self, colors: np.ndarray) -> np.ndarray:
+        """Convert float colors to the a_Color format of the layout."""
+        if not self.packed:
+            return colors
+        return np.clip(colors, 0, 1) * 255 + 0.5  # rounded when stored
+
     def add_vertex(self, position: glm.vec3, color: glm.vec4, tex_coord: glm.vec2, tex_index: float, tiling_factor: float):
-        # position
-        offset = self.get_element_offset(0)
-        self.internal_buffer[offset + 0] = position.x
-        self.internal_buffer[offset + 1] = position.y
-        self.internal_buffer[offset + 2] = position.z
-
-        # color
-        offset = self.get_element_offset(1)
-        self.internal_buffer[offset + 0] = color.x
-        self.internal_buffer[offset + 1] = color.y
-        self.internal_buffer[offset + 2] = color.z
-        self.internal_buffer[offset + 3] = color.w
-
-        # tex_coord
-        offset = self.get_element_offset(2)
-        self.internal_buffer[offset + 0] = tex_coord.x
-        self.internal_buffer[offset + 1] = tex_coord.y
-
-        # tex_index
-        offset = self.get_element_offset(3)
-        self.internal_buffer[offset + 0] = tex_index
-
-        # tiling_factor
-        offset = self.get_element_offset(4)
-        self.internal_buffer[offset + 0] = tiling_factor
+        if self.packed:
+            color = glm.clamp(color, 0, 1) * 255 + 0.5  # rounded when stored
 
+        self.vertices[self.vertex_count] = (
+            (position.x, position.y, position.z),
+            tuple(color),
+            tuple(tex_coord),
+            tex_index,
+            tiling_factor
+        )
         self.vertex_count += 1
 
-    def get_element_offset(self, index: int) -> int:
-        return self.vertex_count * self.layout.count + int(self.layout.elements[index].offset / 4)
+    def add_quads(self, positions: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        """
+        Write the four vertices of N quads in one batched operation.
+
+        positions has shape (N, 4, 3); colors (N, 4); tex_coords (4, 2) or
+        (N, 4, 2); tex_indices and tiling_factors (N,).
+        """
+        count = len(positions) * 4
+        assert self.vertex_count + count <= self.max_vertices, "Quads do not fit in buffer"
+
+        self.write_quads(
+            self.vertex_count // 4,
+            positions,
+            colors,
+            tex_coords,
+            tex_indices,
+            tiling_factors
+        )
+        self.vertex_count += count
+
+    def write_quads(self, first_quad: int, positions: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        """
+        Write N quads starting at quad first_quad without changing
+        vertex_count, so disjoint ranges can be written concurrently.
+        """
+        first_vertex = first_quad * 4
+        quads = self.vertices[
+            first_vertex:first_vertex + len(positions) * 4
+        ].reshape(-1, 4)
+
+        quads["a_Position"] = positions
+        quads["a_Color"] = self.encode_colors(colors)[:, np.newaxis, :]
+        quads["a_TexCoord"] = tex_coords
+        quads["a_TexIndex"] = tex_indices[:, np.newaxis]
+        quads["a_TilingFactor"] = tiling_factors[:, np.newaxis]
 
     def is_full(self) -> bool:
         return self.vertex_count >= self.max_vertices
 
+    @property
+    def free_quads(self) -> int:
+        return int((self.max_vertices - self.vertex_count) / 4)
+
 
 class QuadVertexBuffer:
-    def __init__(self, max_vertices: int) -> None:
-        self.data = QuadVertexData(max_vertices)
-        self.buffer = VertexBuffer.create(self.data.max_size)
+    """Quad batch that expands every quad into four transformed vertices."""
+
+    vertex_positions = (
+        glm.vec4(-0.5, -0.5, 0.0, 1.0),
+        glm.vec4(0.5, -0.5, 0.0, 1.0),
+        glm.vec4(0.5,  0.5, 0.0, 1.0),
+        glm.vec4(-0.5,  0.5, 0.0, 1.0)
+    )
+    texture_coords = (
+        glm.vec2(0, 0),
+        glm.vec2(1, 0),
+        glm.vec2(1, 1),
+        glm.vec2(0, 1)
+    )
+
+    def __init__(self, max_vertices: int, ring_segments: int = 0, packed: bool = False) -> None:
+        self.data = QuadVertexData(max_vertices, packed)
+        if ring_segments > 0:
+            self.buffer = RingVertexBuffer.create(
+                self.data.max_size,
+                ring_segments
+            )
+            self.data.bind_storage(self.buffer.mapped_segment)
+        else:
+            self.buffer = VertexBuffer.create(self.data.max_size)
         self.buffer.buffer_layout = self.data.layout
 
     @property
     def index_count(self) -> int:
         return self.data.index_count
 
+    @property
+    def quad_count(self) -> int:
+        return int(self.data.vertex_count / 4)
+
+    @property
+    def free_quads(self) -> int:
+        return self.data.free_quads
+
     def is_full(self) -> bool:
         return self.data.is_full()
 
@@ -139,15 +429,350 @@ class QuadVertexBuffer:
             tiling_factor
         )
 
+    def add_quad(self, transform: glm.mat4, color: glm.vec4, tex_index: float, tiling_factor: float, tex_coords: Optional[Sequence[glm.vec2]] = None):
+        if tex_coords is None:
+            tex_coords = self.texture_coords
+
+        for index, texture_coord in enumerate(tex_coords):
+            self.data.add_vertex(
+                transform * self.vertex_positions[index],
+                color,
+                texture_coord,
+                tex_index,
+                tiling_factor
+            )
+
+    # shape of the per-quad geometry consumed by add_quads
+    geometry_shape = (4, 3)
+
+    def compute_geometry(self, positions: np.ndarray, sizes: np.ndarray, rotations_rad: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return compute_quad_vertex_positions(positions, sizes, rotations_rad, out)
+
+    def compute_geometry_from_transforms(self, transforms: np.ndarray) -> np.ndarray:
+        return compute_quad_vertex_positions_from_transforms(transforms)
+
+    def compute_corners(self, geometry: np.ndarray) -> np.ndarray:
+        return geometry
+
+    def add_quads(self, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        self.data.add_quads(
+            geometry,
+            colors,
+            tex_coords,
+            tex_indices,
+            tiling_factors
+        )
+
+    def write_quads(self, first_quad: int, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        self.data.write_quads(
+            first_quad,
+            geometry,
+            colors,
+            tex_coords,
+            tex_indices,
+            tiling_factors
+        )
+
+    def commit_quads(self, count: int):
+        """Append count quads previously filled in with write_quads."""
+        assert self.data.vertex_count + count * 4 <= self.data.max_vertices, "Quads do not fit in buffer"
+        self.data.vertex_count += count * 4
+
     def clear(self):
         self.data.clear()
 
+    @property
+    def is_persistent_mapped(self) -> bool:
+        return isinstance(self.buffer, RingVertexBuffer)
+
     def submit_data(self):
-        self.buffer.set_data(
-            self.data.internal_buffer,
+        if self.is_persistent_mapped:
+            return  # vertices were written straight into mapped memory
+
+        RenderCommand.submit(
+            self.buffer.set_data,
+            RenderCommand.capture(self.data.internal_buffer[:self.data.size]),
             self.data.size
         )
 
+    def draw(self, vertex_array: VertexArray):
+        if not self.is_persistent_mapped:
+            RenderCommand.draw_vertex_array(vertex_array, self.index_count)
+            return
+
+        RenderCommand.draw_vertex_array(
+            vertex_array,
+            self.index_count,
+            self.buffer.segment_index * self.data.max_vertices
+        )
+        self.buffer.advance()
+        self.data.bind_storage(self.buffer.mapped_segment)
+        self.data.clear()
+
+
+class QuadInstanceData:
+    layout = BufferLayout(
+        BufferElement(ShaderDataType.MAT4, "a_Transform", divisor=1),
+        BufferElement(ShaderDataType.FLOAT4, "a_Color", divisor=1),
+        BufferElement(ShaderDataType.FLOAT4, "a_TexRect", divisor=1),
+        BufferElement(ShaderDataType.FLOAT, "a_TexIndex", divisor=1),
+        BufferElement(ShaderDataType.FLOAT, "a_TilingFactor", divisor=1),
+    )
+
+    def __init__(self, max_instances: int) -> None:
+        self.max_instances = max_instances
+        self.instance_count = 0
+        self.internal_buffer = np.zeros(
+            max_instances * self.layout.stride,
+            dtype=np.uint8
+        )
+        # record view over internal_buffer, one record per quad
+        self.instances = self.internal_buffer.view(self.layout.dtype)
+
+    @property
+    def size(self) -> int:
+        return self.instance_count * self.layout.stride
+
+    @property
+    def max_size(self) -> int:
+        return self.max_instances * self.layout.stride
+
+    def clear(self):
+        self.instance_count = 0
+
+    def bind_storage(self, storage: np.ndarray):
+        """Write instances into storage (e.g. mapped GPU memory) from now on."""
+        self.internal_buffer = storage.view(np.uint8)
+        self.instances = storage.view(self.layout.dtype)
+
+    def add_instance(self, transform: glm.mat4, color: glm.vec4, tex_rect: tuple[float, float, float, float], tex_index: float, tiling_factor: float):
+        self.instances[self.instance_count] = (
+            transform.to_tuple(),
+            tuple(color),
+            tex_rect,
+            tex_index,
+            tiling_factor
+        )
+        self.instance_count += 1
+
+    def add_instances(self, transforms: np.ndarray, colors: np.ndarray, tex_rects: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        """
+        Write N instance records at once. transforms has shape (N, 4, 4) in
+        glm column order; colors (N, 4); tex_rects (4,) or (N, 4) holding
+        (min u, min v, max u, max v); tex_indices and tiling_factors (N,).
+        """
+        count = len(transforms)
+        assert self.instance_count + count <= self.max_instances, "Quads do not fit in buffer"
+
+        self.write_instances(
+            self.instance_count,
+            transforms,
+            colors,
+            tex_rects,
+            tex_indices,
+            tiling_factors
+        )
+        self.instance_count += count
+
+    def write_instances(self, first_instance: int, transforms: np.ndarray, colors: np.ndarray, tex_rects: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        """
+        Write N instance records starting at first_instance without changing
+        instance_count, so disjoint ranges can be written concurrently.
+        """
+        instances = self.instances[first_instance:first_instance + len(transforms)]
+        instances["a_Transform"] = transforms
+        instances["a_Color"] = colors
+        instances["a_TexRect"] = tex_rects
+        instances["a_TexIndex"] = tex_indices
+        instances["a_TilingFactor"] = tiling_factors
+
+    def is_full(self) -> bool:
+        return self.instance_count >= self.max_instances
+
+    @property
+    def free_quads(self) -> int:
+        return self.max_instances - self.instance_count
+
+
+class QuadInstanceBuffer:
+    """
+    Quad batch that uploads one record per quad and draws every quad as an
+    instance of a single unit quad.
+    """
+
+    quad_layout = BufferLayout(
+        BufferElement(ShaderDataType.FLOAT3, "a_Position"),
+        BufferElement(ShaderDataType.FLOAT2, "a_TexCoord"),
+    )
+    quad_vertices = np.array([
+        -0.5, -0.5, 0.0, 0.0, 0.0,
+        0.5, -0.5, 0.0, 1.0, 0.0,
+        0.5,  0.5, 0.0, 1.0, 1.0,
+        -0.5,  0.5, 0.0, 0.0, 1.0,
+    ], dtype=np.float32)
+    quad_indices = np.array([0, 1, 2, 2, 3, 0], dtype=np.uint32)
+
+    def __init__(self, max_instances: int, ring_segments: int = 0) -> None:
+        self.data = QuadInstanceData(max_instances)
+
+        self.quad_buffer = VertexBuffer.create_from_data(self.quad_vertices)
+        self.quad_buffer.buffer_layout = self.quad_layout
+
+        if ring_segments > 0:
+            self.buffer = RingVertexBuffer.create(
+                self.data.max_size,
+                ring_segments
+            )
+            self.data.bind_storage(self.buffer.mapped_segment)
+        else:
+            self.buffer = VertexBuffer.create(self.data.max_size)
+        self.buffer.buffer_layout = self.data.layout
+
+    @property
+    def index_count(self) -> int:
+        return len(self.quad_indices)
+
+    @property
+    def quad_count(self) -> int:
+        return self.data.instance_count
+
+    @property
+    def free_quads(self) -> int:
+        return self.data.free_quads
+
+    def is_full(self) -> bool:
+        return self.data.is_full()
+
+    def bind_to_vao(self, vao: VertexArray):
+        vao.add_vertex_buffer(self.quad_buffer)
+        vao.add_vertex_buffer(self.buffer)
+        vao.index_buffer = IndexBuffer.create(self.quad_indices)
+
+    def add_quad(self, transform: glm.mat4, color: glm.vec4, tex_index: float, tiling_factor: float, tex_coords: Optional[Sequence[glm.vec2]] = None):
+        if tex_coords is None:
+            tex_rect = (0.0, 0.0, 1.0, 1.0)
+        else:
+            tex_rect = (*tex_coords[0], *tex_coords[2])
+
+        self.data.add_instance(
+            transform,
+            color,
+            tex_rect,
+            tex_index,
+            tiling_factor
+        )
+
+    # shape of the per-quad geometry consumed by add_quads
+    geometry_shape = (4, 4)
+
+    def compute_geometry(self, positions: np.ndarray, sizes: np.ndarray, rotations_rad: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        return compute_quad_transforms(positions, sizes, rotations_rad, out)
+
+    def compute_geometry_from_transforms(self, transforms: np.ndarray) -> np.ndarray:
+        return transforms
+
+    def compute_corners(self, geometry: np.ndarray) -> np.ndarray:
+        return compute_quad_vertex_positions_from_transforms(geometry)
+
+    @staticmethod
+    def compute_tex_rects(tex_coords: np.ndarray) -> np.ndarray:
+        # Unit quad corners 0 and 2 hold the min and max texture coordinates
+        return np.concatenate(
+            (tex_coords[..., 0, :], tex_coords[..., 2, :]),
+            axis=-1
+        )
+
+    def add_quads(self, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        self.data.add_instances(
+            geometry,
+            colors,
+            self.compute_tex_rects(tex_coords),
+            tex_indices,
+            tiling_factors
+        )
+
+    def write_quads(self, first_quad: int, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        self.data.write_instances(
+            first_quad,
+            geometry,
+            colors,
+            self.compute_tex_rects(tex_coords),
+            tex_indices,
+            tiling_factors
+        )
+
+    def commit_quads(self, count: int):
+        """Append count quads previously filled in with write_quads."""
+        assert self.data.instance_count + count <= self.data.max_instances, "Quads do not fit in buffer"
+        self.data.instance_count += count
+
+    def clear(self):
+        self.data.clear()
+
+    @property
+    def is_persistent_mapped(self) -> bool:
+        return isinstance(self.buffer, RingVertexBuffer)
+
+    def submit_data(self):
+        if self.is_persistent_mapped:
+            return  # instances were written straight into mapped memory
+
+        RenderCommand.submit(
+            self.buffer.set_data,
+            RenderCommand.capture(self.data.internal_buffer[:self.data.size]),
+            self.data.size
+        )
+
+    def draw(self, vertex_array: VertexArray):
+        if not self.is_persistent_mapped:
+            RenderCommand.draw_vertex_array_instanced(
+                vertex_array,
+                self.index_count,
+                self.quad_count
+            )
+            return
+
+        RenderCommand.draw_vertex_array_instanced(
+            vertex_array,
+            self.index_count,
+            self.quad_count,
+            self.buffer.segment_index * self.data.max_instances
+        )
+        self.buffer.advance()
+        self.data.bind_storage(self.buffer.mapped_segment)
+        self.data.clear()
+
+
+@dataclass
+class Renderer2DSpecification:
+    # draw quads as instances of one unit quad instead of expanding them into vertices
+    instanced: bool = False
+    # stream quads through a persistently mapped ring buffer instead of glBufferSubData
+    persistent_mapped: bool = False
+    # number of batches that can be in flight on the GPU when persistent_mapped is set
+    ring_segments: int = 3
+    # sample all textures from the layers of one GL_TEXTURE_2D_ARRAY instead of 32 texture units
+    texture_array: bool = False
+    # layer size and count of the texture array; textures drawn in this mode must match the size
+    texture_array_width: int = 256
+    texture_array_height: int = 256
+    texture_array_layers: int = 256
+    # store quad vertices in the 24 byte packed layout instead of 44 bytes of floats,
+    # vertex path only: instances already carry one record per quad
+    packed_vertices: bool = False
+    # record quads and sort them by layer, depth, shader and texture in end_scene
+    deferred: bool = False
+    # skip quads outside the view frustum of the current scene
+    frustum_culling: bool = True
+    # worker threads building the vertex data of large submissions, 0 = build on the calling thread
+    batch_threads: int = 0
+    # smallest submission split across the batch threads
+    parallel_batch_min_quads: int = 4096
+
+    @property
+    def quad_ring_segments(self) -> int:
+        return self.ring_segments if self.persistent_mapped else 0
+
 
 @dataclass
 class Renderer2DData:  # todo: rename
@@ -157,76 +782,158 @@ class Renderer2DData:  # todo: rename
     max_texture_slots: int = 32  # todo: render caps
 
     quad_vertex_array: Optional[VertexArray] = None
-    quad_vertex_buffer: Optional[QuadVertexBuffer] = None
+    quad_batch: Optional[Union[QuadVertexBuffer, QuadInstanceBuffer]] = None
     texture_shader: Optional[Shader] = None
+    camera_uniform_buffer: Optional[UniformBuffer] = None
     white_texture: Optional[Texture2D] = None
 
     texture_slots: list[Optional[Texture2D]] = field(default_factory=lambda: [
                                                      None for _ in range(Renderer2DData.max_texture_slots)])
     texture_slot_index: int = 1  # 0 = white texture
-
-    quad_vertex_positions: list[Optional[glm.vec4]] = field(
-        default_factory=lambda: [None for _ in range(4)])
+    # id() -> slot of every texture bound in the current batch, by identity
+    # since the renderer id changes when a loading texture is uploaded
+    texture_slot_lookup: dict[int, int] = field(default_factory=dict)
+
+    texture_array: Optional[Texture2DArray] = None
+    texture_layer_index: int = 1  # 0 = white texture
+    # renderer id -> layer of every texture copied into texture_array
+    texture_layer_lookup: dict[int, int] = field(default_factory=dict)
+    # incremented whenever full layers are recycled, invalidating assignments
+    texture_layer_generation: int = 0
+
+    render_queue: Optional[QuadRenderQueue] = None
+    # view projection of the current scene in glm column order
+    view_projection: Optional[np.ndarray] = None
+    # xy bounds of the view in world space, for the scalar culling test
+    view_bounds: Optional[tuple[float, float, float, float]] = None
+    batch_executor: Optional[ThreadPoolExecutor] = None
 
     stats: Statistics = field(default_factory=Statistics)
 
 
 class Renderer2D:
     data: Renderer2DData = None
+    specification: Renderer2DSpecification = Renderer2DSpecification()
 
     @classmethod
     @HZ_PROFILE_FUNCTION
-    def init(cls):
+    def init(cls, specification: Optional[Renderer2DSpecification] = None):
+        if specification is not None:
+            cls.specification = specification
+
+        assert not (cls.specification.instanced and cls.specification.packed_vertices), \
+            "packed_vertices only applies to the vertex path, not to instanced quads"
+
         cls.data = Renderer2DData()
 
         # VAO
         cls.data.quad_vertex_array = VertexArray.create()
 
-        # VBO
-        cls.data.quad_vertex_buffer = QuadVertexBuffer(cls.data.max_verticies)
-        cls.data.quad_vertex_buffer.bind_to_vao(cls.data.quad_vertex_array)
-
-        # IBO
-        square_indices = np.zeros(cls.data.max_indicies, dtype=np.uint32)
-        offset = 0
-        for index in range(0, cls.data.max_indicies, 6):
-            square_indices[index + 0] = offset + 0
-            square_indices[index + 1] = offset + 1
-            square_indices[index + 2] = offset + 2
-
-            square_indices[index + 3] = offset + 2
-            square_indices[index + 4] = offset + 3
-            square_indices[index + 5] = offset + 0
+        # White texture
+        cls.data.white_texture = cls.create_single_pixel_white_texture()
 
-            offset += 4
+        if cls.specification.instanced:
+            cls.init_instanced_quads()
+        else:
+            cls.init_vertex_quads()
 
-        square_ib = IndexBuffer.create(square_indices)
-        cls.data.quad_vertex_array.index_buffer = square_ib
+        if cls.specification.deferred:
+            cls.data.render_queue = QuadRenderQueue(cls.data.max_quads)
 
-        # White texture
-        cls.data.white_texture = cls.create_single_pixel_white_texture()
+        if cls.specification.batch_threads > 0:
+            cls.data.batch_executor = ThreadPoolExecutor(
+                cls.specification.batch_threads,
+                thread_name_prefix="Renderer2DBatch"
+            )
 
-        # Samplers
-        samplers = np.arange(0, cls.data.max_texture_slots, dtype=np.int32)
+        # Camera, shared by every shader declaring the Camera block
+        cls.data.camera_uniform_buffer = UniformBuffer.create(
+            CAMERA_UNIFORM_SIZE,
+            CAMERA_UNIFORM_BINDING
+        )
 
         # Shader
-        shader = Shader.create_from_filepath("assets/shaders/Texture.glsl")
+        shader = cls.create_texture_shader()
         shader.bind()
-        shader.set_int_array(
-            "u_Textures",
-            samplers,
-            cls.data.max_texture_slots
-        )
+
+        if cls.specification.texture_array:
+            cls.init_texture_array()
+            shader.set_int("u_TextureArray", 0)
+        else:
+            # Samplers
+            samplers = np.arange(
+                0,
+                cls.data.max_texture_slots,
+                dtype=np.int32
+            )
+            shader.set_int_array(
+                "u_Textures",
+                samplers,
+                cls.data.max_texture_slots
+            )
 
         cls.data.texture_shader = shader
 
         # Set all texture slots to 0
         cls.data.texture_slots[0] = cls.data.white_texture
+        cls.reset_texture_slots()
+
+    @classmethod
+    def init_vertex_quads(cls):
+        # VBO
+        cls.data.quad_batch = QuadVertexBuffer(
+            cls.data.max_verticies,
+            cls.specification.quad_ring_segments,
+            cls.specification.packed_vertices
+        )
+        cls.data.quad_batch.bind_to_vao(cls.data.quad_vertex_array)
 
-        cls.data.quad_vertex_positions[0] = glm.vec4(-0.5, -0.5, 0.0, 1.0)
-        cls.data.quad_vertex_positions[1] = glm.vec4(0.5, -0.5, 0.0, 1.0)
-        cls.data.quad_vertex_positions[2] = glm.vec4(0.5,  0.5, 0.0, 1.0)
-        cls.data.quad_vertex_positions[3] = glm.vec4(-0.5,  0.5, 0.0, 1.0)
+        # IBO
+        square_indices = create_quad_indices(cls.data.max_quads)
+        square_ib = IndexBuffer.create(square_indices)
+        cls.data.quad_vertex_array.index_buffer = square_ib
+
+    @classmethod
+    def init_instanced_quads(cls):
+        # Unit quad VBO + IBO and per-instance VBO
+        cls.data.quad_batch = QuadInstanceBuffer(
+            cls.data.max_quads,
+            cls.specification.quad_ring_segments
+        )
+        cls.data.quad_batch.bind_to_vao(cls.data.quad_vertex_array)
+
+    @classmethod
+    def init_texture_array(cls):
+        width = cls.specification.texture_array_width
+        height = cls.specification.texture_array_height
+
+        cls.data.texture_array = Texture2DArray.create(
+            width,
+            height,
+            cls.specification.texture_array_layers
+        )
+
+        # Layer 0 = white texture
+        white_data = np.full(width * height * 4, 255, dtype=np.uint8)
+        cls.data.texture_array.set_layer_data(0, white_data, white_data.nbytes)
+        cls.data.texture_layer_lookup[cls.data.white_texture.renderer_id] = 0
+
+    @classmethod
+    def create_texture_shader(cls) -> Shader:
+        if not cls.specification.instanced and not cls.specification.texture_array:
+            return Shader.create_from_filepath("assets/shaders/Texture.glsl")
+
+        if cls.specification.instanced:
+            vertex_src = QUAD_INSTANCED_VERTEX_SRC
+        else:
+            vertex_src = QUAD_VERTEX_SRC
+
+        if cls.specification.texture_array:
+            fragment_src = QUAD_TEXTURE_ARRAY_FRAGMENT_SRC
+        else:
+            fragment_src = QUAD_FRAGMENT_SRC
+
+        return Shader.create_from_source("Texture", vertex_src, fragment_src)
 
     @classmethod
     def create_single_pixel_white_texture(self) -> Texture2D:
@@ -238,72 +945,170 @@ class Renderer2D:
         texture.set_data(texture_data, texture_data.nbytes)
         return texture
 
+    @classmethod
+    def reset_texture_slots(cls):
+        cls.data.texture_slot_index = 1
+        cls.data.texture_slot_lookup.clear()
+        cls.data.texture_slot_lookup[id(cls.data.white_texture)] = 0
+
     @classmethod
     def bind_texture_slots(cls):
+        if cls.data.texture_array is not None:
+            RenderCommand.submit(cls.data.texture_array.bind, 0)
+            cls.data.stats.texture_binds += 1
+            return
+
         for index in range(cls.data.texture_slot_index):
-            cls.data.texture_slots[index].bind(index)
+            RenderCommand.submit(cls.data.texture_slots[index].bind, index)
+        cls.data.stats.texture_binds += cls.data.texture_slot_index
 
     @classmethod
     @HZ_PROFILE_FUNCTION
     def shutdown(cls):
-        pass
+        if cls.data.batch_executor is not None:
+            cls.data.batch_executor.shutdown()
+            cls.data.batch_executor = None
 
     @classmethod
-    @HZ_PROFILE_FUNCTION
-    def begin_scene_from_camera(cls, camera: Camera, transform: glm.mat4):
-        view_proj = camera.projection * glm.inverse(transform)
+    def parallel_for(cls, count: int, kernel: Callable[[int, int], None]):
+        """
+        Call kernel(start, end) over disjoint ranges covering [0, count),
+        spread across the batch threads when count is large enough. NumPy
+        releases the GIL in the kernels, so the ranges build in parallel.
+        """
+        executor = cls.data.batch_executor
+        if executor is None or count < cls.specification.parallel_batch_min_quads:
+            kernel(0, count)
+            return
+
+        bounds = np.linspace(0, count, cls.specification.batch_threads + 1).astype(int)
+        futures = [
+            executor.submit(kernel, int(start), int(end))
+            for start, end in zip(bounds[:-1], bounds[1:])
+            if end > start
+        ]
+        for future in futures:
+            future.result()  # re-raise worker exceptions
+
+    @classmethod
+    def set_view_projection(cls, view_projection: glm.mat4):
+        # glm column order is the std140 layout of a mat4
+        cls.data.view_projection = np.array(view_projection.to_tuple(), dtype=np.float32)
+        cls.data.view_bounds = compute_view_bounds(view_projection)
+        RenderCommand.submit(
+            cls.data.camera_uniform_buffer.set_data,
+            cls.data.view_projection,
+            CAMERA_UNIFORM_SIZE
+        )
+        cls.data.stats.bytes_uploaded += CAMERA_UNIFORM_SIZE
 
         # Shader
         shader = cls.data.texture_shader
-        shader.bind()
-        shader.set_mat4(
-            "u_ViewProjection",
-            view_proj
-        )
+        RenderCommand.submit(shader.bind)
+        cls.data.stats.shader_binds += 1
+        if shader.has_uniform("u_ViewProjection"):
+            # Asset shaders that predate the Camera block
+            RenderCommand.submit(shader.set_mat4, "u_ViewProjection", glm.mat4(view_projection))
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def begin_scene_from_camera(cls, camera: Camera, transform: glm.mat4):
+        view_proj = camera.projection * glm.inverse(transform)
+        cls.set_view_projection(view_proj)
 
         # Quad
-        cls.data.quad_vertex_buffer.clear()
-        cls.data.texture_slot_index = 1
+        cls.data.quad_batch.clear()
+        cls.reset_texture_slots()
+        if cls.data.render_queue is not None:
+            cls.data.render_queue.clear()
 
     @classmethod
     @HZ_PROFILE_FUNCTION
     def begin_scene(cls, camera: OrthographicCamera):
-        # Shader
-        shader = cls.data.texture_shader
-        shader.bind()
-        shader.set_mat4(
-            "u_ViewProjection",
-            camera.view_projection_matrix
-        )
+        cls.set_view_projection(camera.view_projection_matrix)
 
         # Quad
-        cls.data.quad_vertex_buffer.clear()
-        cls.data.texture_slot_index = 1
+        cls.data.quad_batch.clear()
+        cls.reset_texture_slots()
+        if cls.data.render_queue is not None:
+            cls.data.render_queue.clear()
 
     @classmethod
     @HZ_PROFILE_FUNCTION
     def end_scene(cls):
-        cls.data.quad_vertex_buffer.submit_data()
-        cls.flush()
+        if cls.data.render_queue is not None:
+            cls.flush_render_queue()
+
+        cls.submit_batch()
+        cls.flush(FlushReason.END_SCENE)
 
     @classmethod
-    def flush(cls):
-        if cls.data.quad_vertex_buffer.index_count == 0:
-            return  # Nothing to draw
+    @HZ_PROFILE_FUNCTION
+    def flush_render_queue(cls):
+        """Sort the recorded commands and build batches from them."""
+        queue = cls.data.render_queue
+        if queue.count == 0:
+            return
 
-        cls.bind_texture_slots()
+        commands, textures = queue.sorted_commands()
+        queue.clear()
 
-        RenderCommand.draw_vertex_array(
-            cls.data.quad_vertex_array,
-            cls.data.quad_vertex_buffer.index_count
+        geometry = cls.data.quad_batch.compute_geometry_from_transforms(
+            commands["transform"]
+        )
+        cls.batch_quads(
+            geometry,
+            commands["color"],
+            commands["tex_coords"],
+            textures,
+            commands["tiling_factor"],
+            commands["texture_id"]
         )
-        cls.data.stats.draw_calls += 1
 
     @classmethod
-    def flush_and_reset(cls):
-        cls.end_scene()
-        cls.data.quad_vertex_buffer.clear()
-        cls.data.texture_slot_index = 1
+    def set_sort_layer(cls, layer: int):
+        """Sort layer (0-255) of quads submitted from now on in deferred mode."""
+        cls.data.render_queue.layer = layer
+
+    @classmethod
+    def submit_batch(cls):
+        """Upload the quads of the current batch."""
+        if cls.data.quad_batch.quad_count == 0:
+            return
+
+        cls.data.stats.bytes_uploaded += cls.data.quad_batch.data.size
+        cls.data.quad_batch.submit_data()
+
+    @classmethod
+    def flush(cls, reason: FlushReason = FlushReason.END_SCENE):
+        quad_count = cls.data.quad_batch.quad_count
+        if quad_count == 0:
+            return  # Nothing to draw
+
+        with GPUProfiler.scope("Renderer2D Flush"):
+            cls.bind_texture_slots()
+            cls.data.quad_batch.draw(cls.data.quad_vertex_array)
+
+        cls.data.stats.record_draw_call(reason, quad_count)
+
+    @classmethod
+    def flush_and_reset(cls, reason: FlushReason):
+        cls.submit_batch()
+        cls.flush(reason)
+        cls.data.quad_batch.clear()
+        cls.reset_texture_slots()
+
+        texture_array = cls.data.texture_array
+        if texture_array is not None and cls.data.texture_layer_index >= texture_array.layers:
+            cls.reset_texture_layers()
+
+    @classmethod
+    def reset_texture_layers(cls):
+        """Free every layer but the white texture's, once no pending draw uses them."""
+        cls.data.texture_layer_index = 1
+        cls.data.texture_layer_lookup.clear()
+        cls.data.texture_layer_lookup[cls.data.white_texture.renderer_id] = 0
+        cls.data.texture_layer_generation += 1
 
     @classmethod
     @HZ_PROFILE_FUNCTION
@@ -321,23 +1126,131 @@ class Renderer2D:
 
         return translate * rotate * scale
 
+    @classmethod
+    def forget_texture(cls, texture: Texture2D):
+        """Drop the layer of a texture whose storage is about to be freed."""
+        if cls.data is None:
+            return
+        cls.data.texture_layer_lookup.pop(texture.renderer_id, None)
+
+    @classmethod
+    def try_get_texture_slot(cls, texture: Texture2D) -> Optional[int]:
+        """Return the batch slot of texture, or None if all slots are in use."""
+        # Records the use for the texture cache and reloads evicted textures
+        texture.mark_bound()
+
+        if cls.data.texture_array is not None:
+            return cls.get_texture_layer(texture)
+
+        tex_index = cls.data.texture_slot_lookup.get(id(texture))
+        if tex_index is not None:
+            return tex_index
+
+        if cls.data.texture_slot_index >= cls.data.max_texture_slots:
+            return None
+
+        tex_index = cls.data.texture_slot_index
+        cls.data.texture_slots[tex_index] = texture
+        cls.data.texture_slot_lookup[id(texture)] = tex_index
+        cls.data.texture_slot_index += 1
+
+        return tex_index
+
+    @classmethod
+    def get_texture_layer(cls, texture: Texture2D) -> Optional[int]:
+        """
+        Return the texture array layer holding texture, copying it into the
+        next free layer on first use. Layers persist across batches until
+        all are taken, then None is returned and flush_and_reset recycles them.
+        """
+        layer = cls.data.texture_layer_lookup.get(texture.renderer_id)
+        if layer is not None:
+            return layer
+
+        layer = cls.data.texture_layer_index
+        if layer >= cls.data.texture_array.layers:
+            return None
+
+        RenderCommand.submit(cls.data.texture_array.copy_layer_from, layer, texture)
+        cls.data.texture_layer_lookup[texture.renderer_id] = layer
+        cls.data.texture_layer_index += 1
+
+        return layer
+
     @classmethod
     def get_texture_slot(cls, texture: Texture2D):
-        tex_index = 0
+        tex_index = cls.try_get_texture_slot(texture)
+        if tex_index is None:
+            cls.flush_and_reset(FlushReason.TEXTURE_SLOTS_FULL)
+            tex_index = cls.try_get_texture_slot(texture)
+
+        return tex_index
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def get_texture_slots(cls, textures: Sequence[Optional[Texture2D]], texture_ids: Optional[np.ndarray] = None) -> tuple[np.ndarray, int]:
+        """
+        Resolve the batch slots of a whole sequence of textures (None entries
+        use the white texture) while touching each distinct texture once.
+        texture_ids may hold keys telling the textures apart if already known.
+        Textures are told apart by identity, not renderer id: loading
+        textures share the placeholder's id and get their own once uploaded.
+
+        Returns the slot of every texture that fits in the current batch and
+        how many leading textures that covers; resolution stops at the first
+        texture that would need a slot beyond max_texture_slots.
+        """
+        count = len(textures)
+        if texture_ids is None:
+            texture_ids = np.fromiter(
+                (0 if texture is None else id(texture) for texture in textures),
+                dtype=np.int64,
+                count=count
+            )
+        unique_ids, first_indices, inverse = np.unique(
+            texture_ids,
+            return_index=True,
+            return_inverse=True
+        )
 
-        for index in range(1, cls.data.texture_slot_index):
-            if cls.data.texture_slots[index] == texture:
-                tex_index = index
+        resolved = count
+        unique_slots = np.zeros(len(unique_ids), dtype=np.float32)
+        for unique_index in np.argsort(first_indices):
+            first_index = first_indices[unique_index]
+            texture = textures[first_index]
+            tex_index = 0 if texture is None else cls.try_get_texture_slot(texture)
+            if tex_index is None:
+                resolved = first_index
                 break
-        else:
-            if cls.data.texture_slot_index >= cls.data.max_texture_slots:
-                cls.flush_and_reset()
+            unique_slots[unique_index] = tex_index
 
-            tex_index = cls.data.texture_slot_index
-            cls.data.texture_slots[tex_index] = texture
-            cls.data.texture_slot_index += 1
+        return unique_slots[inverse[:resolved]], resolved
 
-        return tex_index
+    @classmethod
+    def culling_enabled(cls) -> bool:
+        return cls.specification.frustum_culling and cls.data.view_projection is not None
+
+    @classmethod
+    def is_quad_visible(cls, transform: glm.mat4) -> bool:
+        """
+        Scalar test of a single quad: its xy bounds against the view bounds.
+        Plain floats, numpy would cost more than the draw it may save.
+        """
+        if not cls.culling_enabled():
+            return True
+
+        min_x, min_y, max_x, max_y = cls.data.view_bounds
+        x_axis = transform[0]
+        y_axis = transform[1]
+        center = transform[3]
+        # Half extents of the unit quad spanned by the scaled, rotated axes
+        extent_x = 0.5 * (abs(x_axis.x) + abs(y_axis.x))
+        extent_y = 0.5 * (abs(x_axis.y) + abs(y_axis.y))
+
+        return (
+            center.x + extent_x >= min_x and center.x - extent_x <= max_x and
+            center.y + extent_y >= min_y and center.y - extent_y <= max_y
+        )
 
     @classmethod
     @HZ_PROFILE_FUNCTION
@@ -350,59 +1263,275 @@ class Renderer2D:
 
     @classmethod
     @HZ_PROFILE_FUNCTION
-    def draw_quad_impl(cls, transform: glm.vec4, color: glm.vec4 = glm.vec4(1.0)):
-        if cls.data.quad_vertex_buffer.is_full():
-            cls.flush_and_reset()
-
-        texture_coords = [
-            glm.vec2(0, 0),
-            glm.vec2(1, 0),
-            glm.vec2(1, 1),
-            glm.vec2(0, 1)
-        ]
+    def draw_quad_impl(cls, transform: glm.mat4, color: glm.vec4 = glm.vec4(1.0)):
+        if cls.data.render_queue is not None:
+            cls.data.render_queue.submit(
+                transform,
+                color,
+                QUAD_TEX_COORDS,
+                None,
+                1
+            )
+            return
+
+        if not cls.is_quad_visible(transform):
+            cls.data.stats.culled_quad_count += 1
+            return
+
+        if cls.data.quad_batch.is_full():
+            cls.flush_and_reset(FlushReason.BATCH_FULL)
+
         tex_index = 0  # white texture
         tiling_factor = 1
 
-        for index, texture_coord in enumerate(texture_coords):
-            cls.data.quad_vertex_buffer.add_vertex(
-                transform * cls.data.quad_vertex_positions[index],
-                color,
-                texture_coord,
-                tex_index,
-                tiling_factor
-            )
+        cls.data.quad_batch.add_quad(
+            transform,
+            color,
+            tex_index,
+            tiling_factor
+        )
 
         cls.data.stats.quad_count += 1
 
     @classmethod
     @HZ_PROFILE_FUNCTION
-    def draw_texture(cls, position: Union[glm.vec2, glm.vec3], size: glm.vec2, rotation_rad: float, texture: Texture2D, tiling_factor: float = 1, tint_color: glm.vec4 = glm.vec4(1.0)):
+    def draw_texture(cls, position: Union[glm.vec2, glm.vec3], size: glm.vec2, rotation_rad: float, texture: Union[Texture2D, SubTexture2D], tiling_factor: float = 1, tint_color: glm.vec4 = glm.vec4(1.0)):
         if isinstance(position, glm.vec2):
             position = glm.vec3(position.x, position.y, 0)
 
-        if cls.data.quad_vertex_buffer.is_full():
-            cls.flush_and_reset()
+        if cls.data.render_queue is not None:
+            tex_coords = QUAD_TEX_COORDS
+            if isinstance(texture, SubTexture2D):
+                tex_coords = texture.tex_coords_array
+                texture = texture.texture
 
-        texture_index = cls.get_texture_slot(texture)
-        texture_coords = [
-            glm.vec2(0, 0),
-            glm.vec2(1, 0),
-            glm.vec2(1, 1),
-            glm.vec2(0, 1)
-        ]
-        transform = cls.compute_transform(position, size, rotation_rad)
-
-        for index, texture_coord in enumerate(texture_coords):
-            cls.data.quad_vertex_buffer.add_vertex(
-                transform * cls.data.quad_vertex_positions[index],
+            cls.data.render_queue.submit(
+                cls.compute_transform(position, size, rotation_rad),
                 tint_color,
-                texture_coord,
-                texture_index,
+                tex_coords,
+                texture,
                 tiling_factor
             )
+            return
+
+        transform = cls.compute_transform(position, size, rotation_rad)
+        if not cls.is_quad_visible(transform):
+            cls.data.stats.culled_quad_count += 1
+            return
+
+        if cls.data.quad_batch.is_full():
+            cls.flush_and_reset(FlushReason.BATCH_FULL)
+
+        tex_coords = None
+        if isinstance(texture, SubTexture2D):
+            tex_coords = texture.tex_coords
+            texture = texture.texture
+
+        texture_index = cls.get_texture_slot(texture)
+
+        cls.data.quad_batch.add_quad(
+            transform,
+            tint_color,
+            texture_index,
+            tiling_factor,
+            tex_coords
+        )
 
         cls.data.stats.quad_count += 1
 
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def draw_quads(cls, positions: np.ndarray, sizes: np.ndarray, rotations_rad: np.ndarray, colors: np.ndarray, textures: Optional[Sequence[Union[None, Texture2D, SubTexture2D]]] = None, tiling_factors: Union[float, np.ndarray] = 1):
+        """
+        Submit N quads at once.
+
+        positions is (N, 2) or (N, 3); sizes (N, 2); rotations_rad (N,);
+        colors (N, 4) and textures an optional sequence of N textures or
+        sub-textures (None entries use the white texture). sizes,
+        rotations, colors and tiling factors may also be given as a single
+        value shared by all quads. The submission is split into batches
+        whenever the quad batch is full or the texture slots are exhausted.
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        count = len(positions)
+        if count == 0:
+            return
+
+        if positions.shape[1] == 2:
+            positions = np.column_stack(
+                (positions, np.zeros(count, dtype=np.float32))
+            )
+
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float32), (count, 2))
+        rotations_rad = np.broadcast_to(
+            np.asarray(rotations_rad, dtype=np.float32),
+            (count,)
+        )
+        colors = np.broadcast_to(np.asarray(colors, dtype=np.float32), (count, 4))
+        tiling_factors = np.broadcast_to(
+            np.asarray(tiling_factors, dtype=np.float32),
+            (count,)
+        )
+        tex_coords = QUAD_TEX_COORDS
+
+        if textures is not None and any(isinstance(texture, SubTexture2D) for texture in textures):
+            tex_coords = np.empty((count, 4, 2), dtype=np.float32)
+            tex_coords[:] = QUAD_TEX_COORDS
+            for index, texture in enumerate(textures):
+                if isinstance(texture, SubTexture2D):
+                    tex_coords[index] = texture.tex_coords_array
+            textures = [
+                texture.texture if isinstance(texture, SubTexture2D) else texture
+                for texture in textures
+            ]
+
+        if cls.data.render_queue is not None:
+            cls.data.render_queue.submit_many(
+                compute_quad_transforms(positions, sizes, rotations_rad),
+                colors,
+                tex_coords,
+                textures,
+                tiling_factors
+            )
+            return
+
+        quad_batch = cls.data.quad_batch
+        geometry = np.empty(
+            (count, *quad_batch.geometry_shape),
+            dtype=np.float32
+        )
+
+        def compute_geometry(start: int, end: int):
+            quad_batch.compute_geometry(
+                positions[start:end],
+                sizes[start:end],
+                rotations_rad[start:end],
+                geometry[start:end]
+            )
+
+        cls.parallel_for(count, compute_geometry)
+        cls.batch_quads(
+            geometry,
+            colors,
+            tex_coords,
+            textures,
+            tiling_factors
+        )
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def batch_quads(cls, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, textures: Optional[Sequence[Optional[Texture2D]]], tiling_factors: np.ndarray, texture_ids: Optional[np.ndarray] = None):
+        """
+        Add N quads, already in the geometry format of the active quad batch,
+        flushing whenever the batch is full or the texture slots run out.
+        Quads outside the view frustum are culled first.
+        """
+        if cls.culling_enabled():
+            visible = np.empty(len(geometry), dtype=bool)
+
+            def cull(start: int, end: int):
+                visible[start:end] = compute_visible_quads(
+                    cls.data.view_projection,
+                    cls.data.quad_batch.compute_corners(geometry[start:end])
+                )
+
+            cls.parallel_for(len(geometry), cull)
+            visible_count = int(np.count_nonzero(visible))
+            cls.data.stats.culled_quad_count += len(geometry) - visible_count
+            if visible_count == 0:
+                return
+
+            if visible_count < len(geometry):
+                geometry = geometry[visible]
+                colors = colors[visible]
+                if tex_coords.ndim == 3:
+                    tex_coords = tex_coords[visible]
+                if textures is not None:
+                    textures = np.asarray(textures, dtype=object)[visible]
+                tiling_factors = tiling_factors[visible]
+                if texture_ids is not None:
+                    texture_ids = texture_ids[visible]
+
+        count = len(geometry)
+        tex_indices = np.zeros(count, dtype=np.float32)  # white texture
+
+        start = 0
+        while start < count:
+            if cls.data.quad_batch.is_full():
+                cls.flush_and_reset(FlushReason.BATCH_FULL)
+
+            end = min(count, start + cls.data.quad_batch.free_quads)
+            if textures is not None:
+                slots, resolved = cls.get_texture_slots(
+                    textures[start:end],
+                    None if texture_ids is None else texture_ids[start:end]
+                )
+                if resolved == 0:
+                    cls.flush_and_reset(FlushReason.TEXTURE_SLOTS_FULL)
+                    continue
+                end = start + resolved
+                tex_indices[start:end] = slots
+
+            cls.write_quads(
+                geometry[start:end],
+                colors[start:end],
+                tex_coords if tex_coords.ndim == 2 else tex_coords[start:end],
+                tex_indices[start:end],
+                tiling_factors[start:end]
+            )
+            cls.data.stats.quad_count += end - start
+            start = end
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def draw_static_batch(cls, batch: StaticBatch):
+        """
+        Draw a static batch with one draw call, rebuilding it first if it is
+        dirty. Quads batched so far are flushed first to keep draw order;
+        in deferred mode the static batch is drawn before all queued quads.
+        """
+        if batch.quad_count == 0:
+            return
+
+        if batch.layer_generation != cls.data.texture_layer_generation:
+            batch.mark_dirty()  # layers were recycled since the build
+        elif batch.layers_outdated():
+            batch.mark_dirty()  # a texture finished loading since the build
+
+        if batch.dirty:
+            batch.build()
+            cls.data.stats.static_batch_builds += 1
+            cls.data.stats.bytes_uploaded += batch.quad_count * batch.quad_size
+
+        if cls.data.quad_batch.quad_count > 0:
+            cls.flush_and_reset(FlushReason.STATIC_BATCH)
+
+        batch.bind_texture_slots()
+        cls.data.stats.texture_binds += max(1, len(batch.texture_slots))
+        RenderCommand.submit(batch.draw)
+
+        cls.data.stats.record_draw_call(FlushReason.STATIC_BATCH, batch.quad_count)
+        cls.data.stats.quad_count += batch.quad_count
+
+    @classmethod
+    def write_quads(cls, geometry: np.ndarray, colors: np.ndarray, tex_coords: np.ndarray, tex_indices: np.ndarray, tiling_factors: np.ndarray):
+        """Append N quads that fit in the quad batch, each worker filling its own range."""
+        quad_batch = cls.data.quad_batch
+        first_quad = quad_batch.quad_count
+
+        def write(start: int, end: int):
+            quad_batch.write_quads(
+                first_quad + start,
+                geometry[start:end],
+                colors[start:end],
+                tex_coords if tex_coords.ndim == 2 else tex_coords[start:end],
+                tex_indices[start:end],
+                tiling_factors[start:end]
+            )
+
+        cls.parallel_for(len(geometry), write)
+        quad_batch.commit_quads(len(geometry))
+
     @classmethod
     def reset_stats(cls):
         cls.data.stats.reset()
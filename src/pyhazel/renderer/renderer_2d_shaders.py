@@ -0,0 +1,103 @@
+"""
+Built-in shader sources used by Renderer2D render paths that have no
+counterpart in the application's assets/shaders directory.
+"""
+
+__all__ = []
+
+
+QUAD_VERTEX_SRC = """
+#version 450 core
+
+layout(location = 0) in vec3 a_Position;
+layout(location = 1) in vec4 a_Color;
+layout(location = 2) in vec2 a_TexCoord;
+layout(location = 3) in float a_TexIndex;
+layout(location = 4) in float a_TilingFactor;
+
+layout(std140, binding = 0) uniform Camera
+{
+    mat4 u_ViewProjection;
+};
+
+out vec4 v_Color;
+out vec2 v_TexCoord;
+out float v_TexIndex;
+out float v_TilingFactor;
+
+void main()
+{
+    v_Color = a_Color;
+    v_TexCoord = a_TexCoord;
+    v_TexIndex = a_TexIndex;
+    v_TilingFactor = a_TilingFactor;
+    gl_Position = u_ViewProjection * vec4(a_Position, 1.0);
+}
+"""
+
+QUAD_INSTANCED_VERTEX_SRC = """
+#version 450 core
+
+layout(location = 0) in vec3 a_Position;
+layout(location = 1) in vec2 a_TexCoord;
+layout(location = 2) in mat4 a_Transform;
+layout(location = 6) in vec4 a_Color;
+layout(location = 7) in vec4 a_TexRect;
+layout(location = 8) in float a_TexIndex;
+layout(location = 9) in float a_TilingFactor;
+
+layout(std140, binding = 0) uniform Camera
+{
+    mat4 u_ViewProjection;
+};
+
+out vec4 v_Color;
+out vec2 v_TexCoord;
+out float v_TexIndex;
+out float v_TilingFactor;
+
+void main()
+{
+    v_Color = a_Color;
+    v_TexCoord = mix(a_TexRect.xy, a_TexRect.zw, a_TexCoord);
+    v_TexIndex = a_TexIndex;
+    v_TilingFactor = a_TilingFactor;
+    gl_Position = u_ViewProjection * a_Transform * vec4(a_Position, 1.0);
+}
+"""
+
+QUAD_FRAGMENT_SRC = """
+#version 450 core
+
+layout(location = 0) out vec4 color;
+
+in vec4 v_Color;
+in vec2 v_TexCoord;
+in float v_TexIndex;
+in float v_TilingFactor;
+
+uniform sampler2D u_Textures[32];
+
+void main()
+{
+    color = texture(u_Textures[int(v_TexIndex)], v_TexCoord * v_TilingFactor) * v_Color;
+}
+"""
+
+QUAD_TEXTURE_ARRAY_FRAGMENT_SRC = """
+#version 450 core
+
+layout(location = 0) out vec4 color;
+
+in vec4 v_Color;
+in vec2 v_TexCoord;
+in float v_TexIndex;
+in float v_TilingFactor;
+
+uniform sampler2DArray u_TextureArray;
+
+void main()
+{
+    color = texture(u_TextureArray, vec3(v_TexCoord * v_TilingFactor, v_TexIndex)) * v_Color;
+}
+"""
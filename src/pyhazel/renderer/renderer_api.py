@@ -47,7 +47,26 @@ class RendererAPI(ABC):
         pass
 
     @abstractmethod
-    def draw_vertex_array(self, vertex_array: VertexArray, count=-1):
+    def reset_state_cache(self):
+        """Forget the tracked graphics state after it was changed externally."""
+        pass
+
+    @property
+    @abstractmethod
+    def state_call_counts(self) -> tuple[int, int]:
+        """State changing calls (issued, elided as redundant) since the last reset."""
+        pass
+
+    @abstractmethod
+    def reset_state_call_counts(self):
+        pass
+
+    @abstractmethod
+    def draw_vertex_array(self, vertex_array: VertexArray, index_count: int = -1, base_vertex: int = 0):
+        pass
+
+    @abstractmethod
+    def draw_vertex_array_instanced(self, vertex_array: VertexArray, index_count: int, instance_count: int, base_instance: int = 0):
         pass
 
     @classmethod
@@ -1,10 +1,11 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Sequence
 from abc import ABC
 from abc import abstractmethod
 from .renderer_api import RendererAPI
+from .render_command import RenderCommand
 import numpy as np
 import glm
 
@@ -18,6 +19,7 @@ __all__ = ["Shader"]
 class Shader(ABC):
     @staticmethod
     def create_from_filepath(filepath: str) -> Shader:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -27,8 +29,22 @@ class Shader(ABC):
 
         assert False, "Renderer type is undefined"
 
+    @staticmethod
+    def create_many_from_filepaths(filepaths: Sequence[str]) -> list[Shader]:
+        """Start compiling every file at once, each shader finishes on first use."""
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLShader
+            return OpenGLShader.create_many_from_filepaths(filepaths)
+
+        assert False, "Renderer type is undefined"
+
     @staticmethod
     def create_from_source(name: str, vertex_src: str, fragment_src: str) -> Shader:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -38,6 +54,18 @@ class Shader(ABC):
 
         assert False, "Renderer type is undefined"
 
+    @staticmethod
+    def resolve_pending():
+        """Finish the compiles started by create_many_from_filepaths."""
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLShader
+            return OpenGLShader.resolve_pending()
+
+        assert False, "Renderer type is undefined"
+
     @abstractmethod
     def bind(self):
         pass
@@ -46,6 +74,11 @@ class Shader(ABC):
     def unbind(self):
         pass
 
+    @abstractmethod
+    def has_uniform(self, name: str) -> bool:
+        """True for an active default-block uniform, False for block members."""
+        pass
+
     @abstractmethod
     def set_int(self, name: str, value: int):
         pass
@@ -6,19 +6,35 @@ __all__ = ["ShaderDataType"]
 
 
 class ShaderDataType(Enum):
-    NONE = None, None
-    FLOAT = 4, 1
-    FLOAT2 = 4 * 2, 2
-    FLOAT3 = 4 * 3, 3
-    FLOAT4 = 4 * 4, 4
-    MAT3 = 4 * 3 * 3, 3  # 3* float3
-    MAT4 = 4 * 4 * 4, 4  # 4* float4
-    INT = 4, 1
-    INT2 = 4 * 2, 2
-    INT3 = 4 * 3, 3
-    INT4 = 4 * 4, 4
-    BOOL = 1, 1
+    NONE = None, None, None
+    FLOAT = 4, 1, "float32"
+    FLOAT2 = 4 * 2, 2, "float32"
+    FLOAT3 = 4 * 3, 3, "float32"
+    FLOAT4 = 4 * 4, 4, "float32"
+    MAT3 = 4 * 3 * 3, 3, "float32"  # 3* float3
+    MAT4 = 4 * 4 * 4, 4, "float32"  # 4* float4
+    INT = 4, 1, "int32"
+    INT2 = 4 * 2, 2, "int32"
+    INT3 = 4 * 3, 3, "int32"
+    INT4 = 4 * 4, 4, "int32"
+    BOOL = 1, 1, "bool"
+    # packed types, converted to float vertex shader inputs
+    HALF = 2, 1, "float16"
+    HALF2 = 2 * 2, 2, "float16"
+    USHORT = 2, 1, "uint16"
+    UBYTE4 = 1 * 4, 4, "uint8"
 
-    def __init__(self, size: Optional[int], count: Optional[int]):
+    def __init__(self, size: Optional[int], count: Optional[int], base_type: Optional[str]):
         self.size = size
         self.count = count
+        # NumPy scalar type of a single component
+        self.base_type = base_type
+
+    @property
+    def shape(self) -> tuple[int, ...]:
+        """NumPy field shape of one element of this type."""
+        if self in (ShaderDataType.MAT3, ShaderDataType.MAT4):
+            return (self.count, self.count)
+        elif self.count == 1:
+            return ()
+        return (self.count,)
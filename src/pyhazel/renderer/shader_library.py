@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from typing import Sequence
 from .shader import Shader
 
 __all__ = ["ShaderLibrary"]
@@ -20,6 +21,13 @@ class ShaderLibrary:
         self.add(name, shader)
         return shader
 
+    def load_many(self, filepaths: Sequence[str]) -> list[Shader]:
+        """Load shaders named after their files, compiling them concurrently."""
+        shaders = Shader.create_many_from_filepaths(filepaths)
+        for shader in shaders:
+            self.add(shader.name, shader)
+        return shaders
+
     def __getitem__(self, name: str):
         assert self.exists(name), "Shader not found!"
         return self.shaders[name]
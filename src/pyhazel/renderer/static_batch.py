@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+from .vertex_array import VertexArray
+from .index_buffer import IndexBuffer
+from .sub_texture_2d import SubTexture2D
+from .render_queue import QuadRenderQueue
+from .render_command import RenderCommand
+from .renderer_2d import Renderer2D
+from .renderer_2d import FlushReason
+from .renderer_2d import QuadVertexBuffer
+from .renderer_2d import QuadVertexData
+from .renderer_2d import QuadInstanceBuffer
+from .renderer_2d import QuadInstanceData
+from .renderer_2d import QUAD_TEX_COORDS
+from .renderer_2d import compute_quad_transforms
+from .renderer_2d import create_quad_indices
+from pyhazel.debug.instrumentor import *
+import numpy as np
+import glm
+
+if TYPE_CHECKING:
+    from .texture import Texture2D
+
+__all__ = ["StaticBatch"]
+
+
+class StaticBatch:
+    """
+    Quads that rarely change, kept in their own GPU buffer. The vertex data
+    is built and uploaded once and replayed with a single draw call by
+    Renderer2D.draw_static_batch until the batch is marked dirty.
+
+    All textures of a static batch must fit in the texture slots of one
+    batch (or in the texture array, in texture array mode).
+
+    The GPU buffers are created, filled and drawn by submitted commands,
+    so a batch can be built while the render thread owns the context.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        # CPU side record of the quads, used to rebuild the vertex data
+        self.quads = QuadRenderQueue(capacity)
+        self.vertex_array: Optional[VertexArray] = None
+        self.quad_batch: Optional[Union[QuadVertexBuffer, QuadInstanceBuffer]] = None
+        self.batch_capacity = 0
+        self.texture_slots: list[Texture2D] = []
+        # Renderer2D texture layer generation the quads were built against
+        self.layer_generation = 0
+        # texture -> renderer id copied into its layer, in texture array mode
+        self.layer_renderer_ids: list[tuple[Texture2D, int]] = []
+        self.dirty = True
+
+    @property
+    def quad_count(self) -> int:
+        return self.quads.count
+
+    def mark_dirty(self):
+        self.dirty = True
+
+    def clear(self):
+        self.quads.clear()
+        self.dirty = True
+
+    def add_quad(self, transform: glm.mat4, color: glm.vec4 = glm.vec4(1.0), texture: Optional[Union[Texture2D, SubTexture2D]] = None, tiling_factor: float = 1.0) -> int:
+        """Record a quad and return its index for set_transform/set_color."""
+        tex_coords = QUAD_TEX_COORDS
+        if isinstance(texture, SubTexture2D):
+            tex_coords = texture.tex_coords_array
+            texture = texture.texture
+
+        self.quads.submit(transform, color, tex_coords, texture, tiling_factor)
+        self.dirty = True
+        return self.quads.count - 1
+
+    def add_quads(self, positions: np.ndarray, sizes: Union[np.ndarray, glm.vec2], rotations_rad: Union[np.ndarray, float], colors: Union[np.ndarray, glm.vec4], textures: Optional[Sequence[Optional[Union[Texture2D, SubTexture2D]]]] = None, tiling_factors: Union[np.ndarray, float] = 1.0) -> range:
+        """
+        Record N quads, with the same arguments as Renderer2D.draw_quads,
+        and return their indices.
+        """
+        positions = np.asarray(positions, dtype=np.float32)
+        count = len(positions)
+        if positions.shape[1] == 2:
+            positions = np.column_stack(
+                (positions, np.zeros(count, dtype=np.float32))
+            )
+        sizes = np.broadcast_to(np.asarray(sizes, dtype=np.float32), (count, 2))
+        rotations_rad = np.broadcast_to(np.asarray(rotations_rad, dtype=np.float32), (count,))
+        colors = np.broadcast_to(np.asarray(colors, dtype=np.float32), (count, 4))
+        tiling_factors = np.broadcast_to(np.asarray(tiling_factors, dtype=np.float32), (count,))
+
+        tex_coords = QUAD_TEX_COORDS
+        if textures is not None and any(isinstance(texture, SubTexture2D) for texture in textures):
+            tex_coords = np.empty((count, 4, 2), dtype=np.float32)
+            tex_coords[:] = QUAD_TEX_COORDS
+            unwrapped = []
+            for index, texture in enumerate(textures):
+                if isinstance(texture, SubTexture2D):
+                    tex_coords[index] = texture.tex_coords_array
+                    texture = texture.texture
+                unwrapped.append(texture)
+            textures = unwrapped
+
+        start = self.quads.count
+        self.quads.submit_many(
+            compute_quad_transforms(positions, sizes, rotations_rad),
+            colors,
+            tex_coords,
+            textures,
+            tiling_factors
+        )
+        self.dirty = True
+        return range(start, self.quads.count)
+
+    def set_transform(self, index: int, transform: glm.mat4):
+        self.quads.commands["transform"][index] = transform.to_tuple()
+        self.dirty = True
+
+    def set_color(self, index: int, color: glm.vec4):
+        self.quads.commands["color"][index] = tuple(color)
+        self.dirty = True
+
+    @property
+    def quad_size(self) -> int:
+        """Bytes uploaded per quad."""
+        if Renderer2D.specification.instanced:
+            return QuadInstanceData.layout.stride
+        if Renderer2D.specification.packed_vertices:
+            return 4 * QuadVertexData.packed_layout.stride
+        return 4 * QuadVertexData.float_layout.stride
+
+    def create_quad_batch(self, capacity: int):
+        self.batch_capacity = capacity
+        self.vertex_array = VertexArray.create()
+
+        if Renderer2D.specification.instanced:
+            self.quad_batch = QuadInstanceBuffer(capacity)
+            self.quad_batch.bind_to_vao(self.vertex_array)
+        else:
+            self.quad_batch = QuadVertexBuffer(
+                capacity * 4,
+                packed=Renderer2D.specification.packed_vertices
+            )
+            self.quad_batch.bind_to_vao(self.vertex_array)
+            self.vertex_array.index_buffer = IndexBuffer.create(
+                create_quad_indices(capacity)
+            )
+
+    def get_texture_slots(self) -> np.ndarray:
+        """
+        Resolve the slot (or texture array layer) of every quad. Quads are
+        grouped by texture identity, the slots are bound with the renderer
+        ids current when drawn.
+        """
+        count = self.quads.count
+        texture_ids = self.quads.commands["texture_id"][:count]
+        textures = self.quads.textures[:count]
+        unique_ids, first_indices, inverse = np.unique(
+            texture_ids,
+            return_index=True,
+            return_inverse=True
+        )
+
+        self.texture_slots = [Renderer2D.data.white_texture]
+        if Renderer2D.data.texture_array is not None:
+            return self.get_texture_layers(textures, first_indices)[inverse]
+
+        unique_slots = np.zeros(len(unique_ids), dtype=np.float32)
+        for unique_index, first_index in enumerate(first_indices):
+            texture = textures[first_index]
+            if texture is None:
+                continue  # 0 = white texture
+
+            unique_slots[unique_index] = len(self.texture_slots)
+            self.texture_slots.append(texture)
+
+        assert len(self.texture_slots) <= Renderer2D.data.max_texture_slots, "Static batch uses too many textures!"
+
+        return unique_slots[inverse]
+
+    def get_texture_layers(self, textures: np.ndarray, first_indices: np.ndarray) -> np.ndarray:
+        """Resolve the texture array layer of every distinct texture."""
+        for _ in range(2):
+            self.layer_renderer_ids = []
+            unique_layers = np.zeros(len(first_indices), dtype=np.float32)
+            for unique_index, first_index in enumerate(first_indices):
+                texture = textures[first_index]
+                if texture is None:
+                    continue  # 0 = white texture
+
+                layer = Renderer2D.get_texture_layer(texture)
+                if layer is None:
+                    break
+                unique_layers[unique_index] = layer
+                self.layer_renderer_ids.append((texture, texture.renderer_id))
+            else:
+                self.layer_generation = Renderer2D.data.texture_layer_generation
+                return unique_layers
+
+            # Every layer is taken: draw the pending quads, recycle the layers, retry
+            Renderer2D.flush_and_reset(FlushReason.TEXTURE_SLOTS_FULL)
+
+        assert False, "Static batch uses more textures than the texture array has layers!"
+
+    def layers_outdated(self) -> bool:
+        """True once a texture copied into a layer got a new renderer id, e.g. after loading."""
+        return any(
+            texture.renderer_id != renderer_id
+            for texture, renderer_id in self.layer_renderer_ids
+        )
+
+    @HZ_PROFILE_FUNCTION
+    def build(self):
+        """Rebuild the vertex data from the recorded quads and upload it."""
+        RenderCommand.submit(
+            self.upload,
+            RenderCommand.capture(self.quads.commands[:self.quads.count]),
+            self.get_texture_slots(),
+            self.quads.capacity
+        )
+        self.dirty = False
+
+    @HZ_PROFILE_FUNCTION
+    def upload(self, commands: np.ndarray, tex_indices: np.ndarray, capacity: int):
+        # Runs on the thread owning the context
+        if self.batch_capacity < capacity:
+            self.create_quad_batch(capacity)
+
+        self.quad_batch.clear()
+        self.quad_batch.add_quads(
+            self.quad_batch.compute_geometry_from_transforms(
+                commands["transform"]
+            ),
+            commands["color"],
+            commands["tex_coords"],
+            tex_indices,
+            commands["tiling_factor"]
+        )
+        self.quad_batch.submit_data()
+
+    def draw(self):
+        # Runs on the thread owning the context
+        self.quad_batch.draw(self.vertex_array)
+
+    def bind_texture_slots(self):
+        if Renderer2D.data.texture_array is not None:
+            RenderCommand.submit(Renderer2D.data.texture_array.bind, 0)
+            return
+
+        for index, texture in enumerate(self.texture_slots):
+            RenderCommand.submit(texture.bind, index)
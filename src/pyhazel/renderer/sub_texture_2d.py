@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+import numpy as np
+import glm
+
+if TYPE_CHECKING:
+    from .texture import Texture2D
+
+__all__ = ["SubTexture2D"]
+
+
+class SubTexture2D:
+    """
+    A rectangular region of a Texture2D, e.g. a sprite in a sprite sheet or
+    texture atlas. min and max are texture coordinates in the range [0, 1].
+    """
+
+    def __init__(self, texture: Texture2D, min: glm.vec2, max: glm.vec2) -> None:
+        self._texture = texture
+        self._tex_coords = (
+            glm.vec2(min.x, min.y),
+            glm.vec2(max.x, min.y),
+            glm.vec2(max.x, max.y),
+            glm.vec2(min.x, max.y)
+        )
+        self._tex_coords_array = np.array(
+            [tuple(coord) for coord in self._tex_coords],
+            dtype=np.float32
+        )
+
+    @classmethod
+    def create_from_coords(cls, texture: Texture2D, coords: glm.vec2, cell_size: glm.vec2, sprite_size: glm.vec2 = glm.vec2(1)) -> SubTexture2D:
+        """Select a sprite from a sprite sheet laid out as a grid of cell_size pixels."""
+        min = glm.vec2(
+            (coords.x * cell_size.x) / texture.width,
+            (coords.y * cell_size.y) / texture.height
+        )
+        max = glm.vec2(
+            ((coords.x + sprite_size.x) * cell_size.x) / texture.width,
+            ((coords.y + sprite_size.y) * cell_size.y) / texture.height
+        )
+        return cls(texture, min, max)
+
+    @classmethod
+    def create_from_region(cls, texture: Texture2D, x: int, y: int, width: int, height: int) -> SubTexture2D:
+        """Select a region given in pixels, with the origin at the bottom left."""
+        min = glm.vec2(x / texture.width, y / texture.height)
+        max = glm.vec2(
+            (x + width) / texture.width,
+            (y + height) / texture.height
+        )
+        return cls(texture, min, max)
+
+    @property
+    def texture(self) -> Texture2D:
+        return self._texture
+
+    @property
+    def tex_coords(self) -> tuple[glm.vec2, glm.vec2, glm.vec2, glm.vec2]:
+        return self._tex_coords
+
+    @property
+    def tex_coords_array(self) -> np.ndarray:
+        """The four texture coordinates as a (4, 2) float32 array."""
+        return self._tex_coords_array
@@ -1,9 +1,27 @@
+from __future__ import annotations
 
+from typing import Optional
 from abc import ABC
 from abc import abstractmethod
+from dataclasses import dataclass
+from dataclasses import field
 from .renderer_api import RendererAPI
+from .render_command import RenderCommand
+from .texture_loader import TextureLoader
+from PIL import Image
 
-__all__ = ["Texture2D"]
+__all__ = ["Texture2D", "Texture2DArray", "ImageData"]
+
+
+@dataclass
+class ImageData:
+    """Decoded pixels, bottom row first as expected by the graphics API."""
+    width: int
+    height: int
+    mode: str  # "RGB" or "RGBA"
+    data: bytes  # or a uint8 ndarray
+    # smaller levels, halving the size each, uploaded after this one
+    mip_levels: list[ImageData] = field(default_factory=list)
 
 
 class Texture(ABC):
@@ -40,19 +58,29 @@ class Texture(ABC):
 
 
 class Texture2D(Texture):
+    # incremented by every bind, orders textures by recency of use
+    bind_counter: int = 0
+    # bind_counter at the latest bind of the texture
+    last_bound: int = 0
+    # image file of the texture, reloaded from after an eviction
+    source_path: Optional[str] = None
+
     @staticmethod
-    def create(width: int, height: int) -> Texture:
+    def create(width: int, height: int, streaming: bool = False) -> Texture:
+        """Streaming textures upload set_data through pixel buffers, for per frame updates."""
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
         elif RendererAPI.api == RendererAPI.API.OpenGL:
             from pyhazel.platform.opengl import OpenGLTexture
-            return OpenGLTexture.create(width, height)
+            return OpenGLTexture.create(width, height, streaming)
 
         assert False, "Renderer type is undefined"
 
     @staticmethod
     def create_from_path(path: str) -> Texture:
+        """Load the image now, or in the background while the render thread owns the context."""
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -61,3 +89,94 @@ class Texture2D(Texture):
             return OpenGLTexture.create_from_path(path)
 
         assert False, "Renderer type is undefined"
+
+    @staticmethod
+    def create_from_path_async(path: str) -> Texture:
+        """
+        Return immediately with a texture showing the white placeholder
+        until TextureLoader has decoded and uploaded the image.
+        """
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLTexture
+            return OpenGLTexture.create_from_path_async(path)
+
+        assert False, "Renderer type is undefined"
+
+    @staticmethod
+    def decode_image(path: str) -> ImageData:
+        """Thread safe, performs no graphics calls."""
+        from .texture_asset import BAKED_TEXTURE_EXTENSION  # prevent circular import
+        from .texture_asset import load_baked_texture
+        if str(path).endswith(BAKED_TEXTURE_EXTENSION):
+            return load_baked_texture(path)
+
+        image = Image.open(path)
+        image = image.transpose(Image.FLIP_TOP_BOTTOM)
+        return ImageData(image.width, image.height, image.mode, image.tobytes())
+
+    def mark_bound(self):
+        Texture2D.bind_counter += 1
+        self.last_bound = Texture2D.bind_counter
+        if not self.is_loaded:
+            self.reload()
+
+    def reload(self):
+        """Load an evicted texture again in the background."""
+        if self.source_path is not None and not TextureLoader.is_pending(self):
+            TextureLoader.load(self, self.source_path)
+
+    @property
+    def is_loaded(self) -> bool:
+        return True
+
+    @property
+    @abstractmethod
+    def gpu_memory_size(self) -> int:
+        """Estimated bytes of GPU storage, 0 unless loaded."""
+        pass
+
+    @abstractmethod
+    def set_sub_data(self, data, x: int, y: int, width: int, height: int) -> None:
+        """Update a region with tightly packed rows, bottom row first."""
+        pass
+
+    @abstractmethod
+    def upload_image(self, image: ImageData) -> None:
+        pass
+
+    @abstractmethod
+    def evict(self) -> None:
+        """Free the GPU storage, the texture shows the placeholder until uploaded again."""
+        pass
+
+
+class Texture2DArray(Texture):
+    """Equally sized 2D images stored as the layers of one texture."""
+
+    @staticmethod
+    def create(width: int, height: int, layers: int) -> Texture:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLTextureArray
+            return OpenGLTextureArray.create(width, height, layers)
+
+        assert False, "Renderer type is undefined"
+
+    @property
+    @abstractmethod
+    def layers(self) -> int:
+        pass
+
+    @abstractmethod
+    def set_layer_data(self, layer: int, data, size: int) -> None:
+        pass
+
+    @abstractmethod
+    def copy_layer_from(self, layer: int, texture: Texture2D) -> None:
+        pass
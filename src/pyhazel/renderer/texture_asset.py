@@ -0,0 +1,107 @@
+"""
+Baked texture assets: pixels stored ready for upload, so loading needs no
+image decode, flip or copy.
+
+Layout, little endian:
+    header   magic "HZTX", version, format, width, height, mip levels
+    levels   tightly packed pixels of every mip level, largest first,
+             bottom row first
+"""
+from __future__ import annotations
+
+from typing import Iterable
+from pathlib import Path
+from .texture import ImageData
+from pyhazel.debug.instrumentor import *
+from PIL import Image
+import numpy as np
+import struct
+import mmap
+
+__all__ = [
+    "BAKED_TEXTURE_EXTENSION",
+    "bake_texture",
+    "bake_textures",
+    "load_baked_texture"
+]
+
+BAKED_TEXTURE_EXTENSION = ".hztex"
+BAKED_TEXTURE_MAGIC = b"HZTX"
+BAKED_TEXTURE_VERSION = 1
+BAKED_TEXTURE_HEADER = struct.Struct("<4sHHIII")
+
+# format field -> (image mode, bytes per pixel)
+BAKED_TEXTURE_FORMATS = {
+    0: ("RGBA", 4),
+}
+RGBA8 = 0
+
+
+def compute_mip_sizes(width: int, height: int, mip_levels: int) -> list[tuple[int, int]]:
+    return [
+        (max(width >> level, 1), max(height >> level, 1))
+        for level in range(mip_levels)
+    ]
+
+
+@HZ_PROFILE_FUNCTION
+def bake_texture(source_path: str, output_path: str, mip_levels: int = 1):
+    """Convert an image PIL can read into a baked RGBA texture."""
+    image = Image.open(source_path).convert("RGBA")
+    image = image.transpose(Image.FLIP_TOP_BOTTOM)
+
+    max_levels = max(image.width, image.height).bit_length()
+    mip_levels = min(mip_levels, max_levels)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "wb") as fp:
+        fp.write(BAKED_TEXTURE_HEADER.pack(
+            BAKED_TEXTURE_MAGIC,
+            BAKED_TEXTURE_VERSION,
+            RGBA8,
+            image.width,
+            image.height,
+            mip_levels
+        ))
+        for size in compute_mip_sizes(image.width, image.height, mip_levels):
+            level = image if size == image.size else image.resize(size, Image.BOX)
+            fp.write(level.tobytes())
+
+
+def bake_textures(source_paths: Iterable[str], output_directory: str, mip_levels: int = 1) -> list[Path]:
+    """Bake every source next to each other in output_directory, keeping file stems."""
+    output_paths = []
+    for source_path in source_paths:
+        output_path = Path(output_directory) / (Path(source_path).stem + BAKED_TEXTURE_EXTENSION)
+        bake_texture(source_path, output_path, mip_levels)
+        output_paths.append(output_path)
+    return output_paths
+
+
+@HZ_PROFILE_FUNCTION
+def load_baked_texture(path: str) -> ImageData:
+    """
+    Map a baked texture into memory. The pixel arrays are views of the
+    mapping, the pages are only read when the upload touches them.
+    """
+    with open(path, "rb") as fp:
+        mapping = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, pixel_format, width, height, mip_levels = BAKED_TEXTURE_HEADER.unpack_from(mapping)
+    assert magic == BAKED_TEXTURE_MAGIC, f"{path} is not a baked texture!"
+    assert version == BAKED_TEXTURE_VERSION, f"{path} was baked by an unsupported version!"
+    assert pixel_format in BAKED_TEXTURE_FORMATS, "Format not supported!"
+    mode, bpp = BAKED_TEXTURE_FORMATS[pixel_format]
+
+    levels = []
+    offset = BAKED_TEXTURE_HEADER.size
+    for level_width, level_height in compute_mip_sizes(width, height, mip_levels):
+        count = level_width * level_height * bpp
+        data = np.frombuffer(mapping, dtype=np.uint8, count=count, offset=offset)
+        levels.append(ImageData(level_width, level_height, mode, data))
+        offset += count
+
+    image = levels[0]
+    image.mip_levels = levels[1:]
+    return image
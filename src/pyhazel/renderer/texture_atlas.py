@@ -0,0 +1,254 @@
+from __future__ import annotations
+
+from typing import Optional
+from dataclasses import dataclass
+from pathlib import Path
+from .texture import Texture2D
+from .sub_texture_2d import SubTexture2D
+from pyhazel.debug.instrumentor import *
+from PIL import Image
+import numpy as np
+import json
+
+__all__ = [
+    "SkylinePacker",
+    "TextureAtlas",
+    "TextureAtlasBuilder"
+]
+
+
+@dataclass
+class AtlasRegion:
+    """Pixel rectangle of an atlas entry, with the origin at the bottom left."""
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+@dataclass
+class SkylineNode:
+    x: int
+    y: int
+    width: int
+
+
+class SkylinePacker:
+    """
+    Bottom-left skyline rectangle packer. The skyline is the upper contour
+    of everything packed so far; each rectangle is placed where its top
+    edge ends up lowest.
+    """
+
+    def __init__(self, width: int, height: int) -> None:
+        self.width = width
+        self.height = height
+        self.skyline: list[SkylineNode] = [SkylineNode(0, 0, width)]
+
+    @property
+    def used_height(self) -> int:
+        return max(node.y for node in self.skyline)
+
+    def insert(self, width: int, height: int) -> Optional[tuple[int, int]]:
+        """Reserve a width x height rectangle and return its position, or None if it does not fit."""
+        best_index = None
+        best_top = None
+        best_width = None
+
+        for index, node in enumerate(self.skyline):
+            y = self._fit(index, width, height)
+            if y is None:
+                continue
+
+            top = y + height
+            if best_top is None or top < best_top or (top == best_top and node.width < best_width):
+                best_index = index
+                best_top = top
+                best_width = node.width
+
+        if best_index is None:
+            return None
+
+        x = self.skyline[best_index].x
+        y = best_top - height
+        self._add_level(best_index, x, best_top, width)
+        return x, y
+
+    def _fit(self, index: int, width: int, height: int) -> Optional[int]:
+        x = self.skyline[index].x
+        if x + width > self.width:
+            return None
+
+        y = 0
+        remaining = width
+        while remaining > 0:
+            node = self.skyline[index]
+            y = max(y, node.y)
+            if y + height > self.height:
+                return None
+            remaining -= node.width
+            index += 1
+
+        return y
+
+    def _add_level(self, index: int, x: int, y: int, width: int):
+        self.skyline.insert(index, SkylineNode(x, y, width))
+
+        # Shrink or remove the nodes now covered by the new one
+        index += 1
+        while index < len(self.skyline):
+            previous = self.skyline[index - 1]
+            node = self.skyline[index]
+            overlap = previous.x + previous.width - node.x
+            if overlap <= 0:
+                break
+
+            node.x += overlap
+            node.width -= overlap
+            if node.width > 0:
+                break
+            del self.skyline[index]
+
+        # Merge neighbours of the same height
+        index = 0
+        while index < len(self.skyline) - 1:
+            node = self.skyline[index]
+            next_node = self.skyline[index + 1]
+            if node.y == next_node.y:
+                node.width += next_node.width
+                del self.skyline[index + 1]
+            else:
+                index += 1
+
+
+class TextureAtlas:
+    """A single texture holding many named images, each exposed as a SubTexture2D."""
+
+    def __init__(self, texture: Texture2D, regions: dict[str, AtlasRegion]) -> None:
+        self._texture = texture
+        self.regions = regions
+        self.sub_textures = {
+            name: SubTexture2D.create_from_region(
+                texture,
+                region.x,
+                region.y,
+                region.width,
+                region.height
+            )
+            for name, region in regions.items()
+        }
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def create_from_path(cls, image_path: str, regions_path: Optional[str] = None) -> TextureAtlas:
+        """Load an atlas written by TextureAtlasBuilder.save."""
+        if regions_path is None:
+            regions_path = str(Path(image_path).with_suffix(".json"))
+
+        with open(regions_path, "r", encoding="utf-8") as fp:
+            regions = {
+                name: AtlasRegion(**region)
+                for name, region in json.load(fp)["regions"].items()
+            }
+
+        return cls(Texture2D.create_from_path(image_path), regions)
+
+    @property
+    def texture(self) -> Texture2D:
+        return self._texture
+
+    def __getitem__(self, name: str) -> SubTexture2D:
+        assert name in self.sub_textures, "Atlas entry not found!"
+        return self.sub_textures[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.sub_textures
+
+
+class TextureAtlasBuilder:
+    """
+    Packs images into one RGBA texture, either at runtime with build() or
+    offline with save() followed by TextureAtlas.create_from_path().
+    """
+
+    def __init__(self, max_size: int = 4096, padding: int = 1) -> None:
+        self.max_size = max_size
+        self.padding = padding
+        self.images: dict[str, Image.Image] = {}
+
+    def add(self, name: str, path: str) -> None:
+        assert name not in self.images, "Atlas entry already exists!"
+        self.images[name] = Image.open(path).convert("RGBA")
+
+    def add_image(self, name: str, image: Image.Image) -> None:
+        assert name not in self.images, "Atlas entry already exists!"
+        self.images[name] = image.convert("RGBA")
+
+    @HZ_PROFILE_FUNCTION
+    def pack(self) -> tuple[np.ndarray, dict[str, AtlasRegion]]:
+        """
+        Return the atlas pixels as a (height, width, 4) uint8 array with the
+        bottom row first, as OpenGL expects, and the region of every image.
+        """
+        packer = SkylinePacker(self.max_size, self.max_size)
+        regions: dict[str, AtlasRegion] = {}
+
+        # Tallest first keeps the skyline flat
+        for name, image in sorted(self.images.items(), key=lambda item: -item[1].height):
+            position = packer.insert(
+                image.width + self.padding,
+                image.height + self.padding
+            )
+            assert position is not None, f"Atlas is full, could not pack '{name}'"
+            regions[name] = AtlasRegion(
+                position[0],
+                position[1],
+                image.width,
+                image.height
+            )
+
+        width = max(
+            (region.x + region.width for region in regions.values()),
+            default=1
+        )
+        height = max(packer.used_height, 1)
+        pixels = np.zeros((height, width, 4), dtype=np.uint8)
+
+        for name, region in regions.items():
+            image = self.images[name].transpose(Image.FLIP_TOP_BOTTOM)
+            pixels[
+                region.y:region.y + region.height,
+                region.x:region.x + region.width
+            ] = np.asarray(image)
+
+        return pixels, regions
+
+    @HZ_PROFILE_FUNCTION
+    def build(self) -> TextureAtlas:
+        pixels, regions = self.pack()
+        height, width, _ = pixels.shape
+
+        texture = Texture2D.create(width, height)
+        texture.set_data(pixels, pixels.nbytes)
+        return TextureAtlas(texture, regions)
+
+    @HZ_PROFILE_FUNCTION
+    def save(self, image_path: str, regions_path: Optional[str] = None) -> None:
+        """Write the packed atlas as an image plus a JSON file of regions."""
+        if regions_path is None:
+            regions_path = str(Path(image_path).with_suffix(".json"))
+
+        pixels, regions = self.pack()
+        Image.fromarray(pixels).transpose(Image.FLIP_TOP_BOTTOM).save(image_path)
+
+        with open(regions_path, "w", encoding="utf-8") as fp:
+            json.dump(
+                {
+                    "regions": {
+                        name: region.__dict__
+                        for name, region in regions.items()
+                    }
+                },
+                fp,
+                indent=4
+            )
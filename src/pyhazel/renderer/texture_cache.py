@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from typing import Optional
+from pathlib import Path
+from .texture import Texture2D
+from .texture_loader import TextureLoader
+from .render_command import RenderCommand
+from .renderer_2d import Renderer2D
+from pyhazel.debug.instrumentor import *
+from pyhazel.config import *
+import hashlib
+
+__all__ = ["TextureCache"]
+
+
+class TextureCache:
+    """
+    Shares one Texture2D per image, keyed by file content so copies at
+    different paths are loaded once. When the textures exceed the GPU
+    memory budget, the least recently bound ones are evicted: their
+    storage is freed and they show the placeholder until bound again,
+    which reloads them in the background.
+    """
+
+    def __init__(self, budget_bytes: int = TEXTURE_CACHE_BUDGET_BYTES) -> None:
+        self.budget_bytes = budget_bytes
+        # content hash -> texture, evicted ones included
+        self.textures: dict[str, Texture2D] = {}
+        # resolved path -> content hash
+        self.path_keys: dict[Path, str] = {}
+        # content hash -> path loading it, used to reload evicted textures
+        self.key_paths: dict[str, str] = {}
+        # bind stamp at the previous trim, textures bound since are in use
+        self.trim_mark: int = 0
+        self.evictions: int = 0
+
+    @property
+    def gpu_memory_size(self) -> int:
+        return sum(texture.gpu_memory_size for texture in self.textures.values())
+
+    def get_key(self, path: str) -> str:
+        resolved = Path(path).resolve()
+        key = self.path_keys.get(resolved)
+        if key is None:
+            key = hashlib.sha1(resolved.read_bytes()).hexdigest()
+            self.path_keys[resolved] = key
+        return key
+
+    @HZ_PROFILE_FUNCTION
+    def load(self, path: str) -> Texture2D:
+        key = self.get_key(path)
+        texture = self.textures.get(key)
+
+        if texture is None:
+            texture = Texture2D.create_from_path(path)
+            self.textures[key] = texture
+            self.key_paths[key] = path
+        elif not texture.is_loaded:
+            # Evicted, or still loading asynchronously
+            if RenderCommand.is_recording():
+                # The render thread owns the context, it uploads the reload
+                texture.reload()
+            else:
+                TextureLoader.cancel(texture)
+                texture.upload_image(texture.decode_image(self.key_paths[key]))
+
+        self.trim()
+        return texture
+
+    @HZ_PROFILE_FUNCTION
+    def load_async(self, path: str) -> Texture2D:
+        key = self.get_key(path)
+        texture = self.textures.get(key)
+
+        if texture is None:
+            texture = Texture2D.create_from_path_async(path)
+            self.textures[key] = texture
+            self.key_paths[key] = path
+        elif not texture.is_loaded and not TextureLoader.is_pending(texture):
+            TextureLoader.load(texture, self.key_paths[key])
+
+        self.trim()
+        return texture
+
+    @HZ_PROFILE_FUNCTION
+    def trim(self, budget_bytes: Optional[int] = None):
+        """Evict least recently bound textures until within the budget."""
+        budget_bytes = self.budget_bytes if budget_bytes is None else budget_bytes
+        mark = Texture2D.bind_counter
+
+        used_bytes = self.gpu_memory_size
+        if used_bytes > budget_bytes:
+            candidates = sorted(
+                (texture for texture in self.textures.values() if texture.is_loaded),
+                key=lambda texture: texture.last_bound
+            )
+            for texture in candidates:
+                if used_bytes <= budget_bytes or texture.last_bound > self.trim_mark:
+                    break  # the rest were bound since the previous trim
+                used_bytes -= texture.gpu_memory_size
+                # The freed name can be reused by a new texture
+                Renderer2D.forget_texture(texture)
+                texture.evict()
+                self.evictions += 1
+
+        self.trim_mark = mark
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from .render_command import RenderCommand
+from pyhazel.debug.instrumentor import *
+from pyhazel.config import *
+import time
+
+if TYPE_CHECKING:
+    from .texture import Texture2D
+
+__all__ = ["TextureLoader"]
+
+
+class TextureLoader:
+    """
+    Decodes images for Texture2D.create_from_path_async on worker threads
+    and uploads them on the render thread, spending at most
+    TEXTURE_UPLOAD_BUDGET_MS per frame so streaming never causes a hitch.
+    """
+    executor: Optional[ThreadPoolExecutor] = None
+    # shown by textures until their image is uploaded
+    placeholder: Optional[Texture2D] = None
+    # textures waiting for their upload with their decode, oldest first
+    pending: list[tuple[Texture2D, Future]] = []
+    lock = Lock()
+
+    @classmethod
+    def init(cls, placeholder: Texture2D):
+        cls.placeholder = placeholder
+
+    @classmethod
+    def shutdown(cls):
+        if cls.executor is not None:
+            cls.executor.shutdown(cancel_futures=True)
+            cls.executor = None
+        with cls.lock:
+            cls.pending.clear()
+
+    @classmethod
+    def load(cls, texture: Texture2D, path: str):
+        assert cls.placeholder is not None, "TextureLoader is not initialized!"
+        if cls.executor is None:
+            cls.executor = ThreadPoolExecutor(
+                TEXTURE_LOADER_THREADS,
+                thread_name_prefix="TextureLoader"
+            )
+
+        future = cls.executor.submit(texture.decode_image, path)
+        with cls.lock:
+            cls.pending.append((texture, future))
+
+    @classmethod
+    def cancel(cls, texture: Texture2D):
+        with cls.lock:
+            for entry in cls.pending:
+                if entry[0] is texture:
+                    entry[1].cancel()
+                    cls.pending.remove(entry)
+                    break
+
+    @classmethod
+    def is_pending(cls, texture: Texture2D) -> bool:
+        with cls.lock:
+            return any(entry[0] is texture for entry in cls.pending)
+
+    @classmethod
+    def pending_count(cls) -> int:
+        with cls.lock:
+            return len(cls.pending)
+
+    @classmethod
+    def new_frame(cls):
+        if cls.pending:
+            RenderCommand.submit(cls.upload_pending)
+
+    @classmethod
+    @HZ_PROFILE_FUNCTION
+    def upload_pending(cls, budget_ms: float = TEXTURE_UPLOAD_BUDGET_MS):
+        """Upload decoded images until the budget is spent, at least one per call."""
+        start = time.perf_counter()
+
+        with cls.lock:
+            ready = [entry for entry in cls.pending if entry[1].done()]
+
+        for entry in ready:
+            with cls.lock:
+                if entry not in cls.pending:
+                    continue  # cancelled meanwhile
+                cls.pending.remove(entry)
+
+            texture, future = entry
+            try:
+                image = future.result()
+            except Exception as error:
+                # todo: log instead
+                print(f"Could not load texture {texture.source_path}: {error}")
+                # Keep the placeholder, binding it again must not retry
+                texture.source_path = None
+                continue
+
+            texture.upload_image(image)
+
+            if (time.perf_counter() - start) * 1000.0 >= budget_ms:
+                break
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from abc import ABC
+from abc import abstractmethod
+from .renderer_api import RendererAPI
+from .render_command import RenderCommand
+
+if TYPE_CHECKING:
+    from numpy import ndarray
+
+__all__ = ["UniformBuffer", "CAMERA_UNIFORM_BINDING", "CAMERA_UNIFORM_SIZE"]
+
+# std140 Camera block: layout(binding = 0) uniform Camera { mat4 u_ViewProjection; }
+CAMERA_UNIFORM_BINDING = 0
+CAMERA_UNIFORM_SIZE = 4 * 4 * 4
+
+
+class UniformBuffer(ABC):
+    """
+    Block of uniforms shared by every shader declaring a std140 uniform
+    block at the same binding point. Data is written in std140 layout.
+    """
+    @staticmethod
+    def create(size: int, binding: int) -> UniformBuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLUniformBuffer
+            return OpenGLUniformBuffer(size, binding)
+
+        assert False, "Renderer type is undefined"
+
+    @abstractmethod
+    def set_data(self, data: ndarray, size: int, offset: int = 0):
+        pass
+
+    @property
+    @abstractmethod
+    def binding(self) -> int:
+        pass
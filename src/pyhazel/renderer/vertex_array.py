@@ -5,6 +5,7 @@ from typing import Sequence
 from abc import ABC
 from abc import abstractmethod
 from .renderer_api import RendererAPI
+from .render_command import RenderCommand
 
 if TYPE_CHECKING:
     from .vertex_buffer import VertexBuffer
@@ -17,6 +18,7 @@ __all__ = ["VertexArray"]
 class VertexArray(ABC):
     @staticmethod
     def create() -> VertexArray:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -5,17 +5,19 @@ from typing import TYPE_CHECKING
 from abc import ABC
 from abc import abstractmethod
 from .renderer_api import RendererAPI
+from .render_command import RenderCommand
 
 if TYPE_CHECKING:
     from .buffer_layout import BufferLayout
     from numpy import ndarray
 
-__all__ = ["VertexBuffer"]
+__all__ = ["VertexBuffer", "RingVertexBuffer"]
 
 
 class VertexBuffer(ABC):
     @staticmethod
     def create(size: int) -> VertexBuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -27,6 +29,7 @@ class VertexBuffer(ABC):
 
     @staticmethod
     def create_from_data(data: ndarray) -> VertexBuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
         if RendererAPI.api == RendererAPI.API.NONE:
             print("RendererAPI.API.NONE is not supported")
             return
@@ -67,3 +70,39 @@ class VertexBuffer(ABC):
     @abstractmethod
     def set_data(self, data: ndarray, size=0):
         pass
+
+
+class RingVertexBuffer(VertexBuffer):
+    """
+    A vertex buffer split into segment_count segments of segment_size bytes
+    that stay mapped into client memory. Writes go straight into the current
+    segment; advance() fences the segment and moves on to the next one,
+    waiting only if the GPU is still reading it.
+    """
+
+    @staticmethod
+    def create(segment_size: int, segment_count: int) -> RingVertexBuffer:
+        assert not RenderCommand.is_recording(), "Create graphics resources before Application.run when rendering is threaded!"
+        if RendererAPI.api == RendererAPI.API.NONE:
+            print("RendererAPI.API.NONE is not supported")
+            return
+        elif RendererAPI.api == RendererAPI.API.OpenGL:
+            from pyhazel.platform.opengl import OpenGLRingVertexBuffer
+            return OpenGLRingVertexBuffer.init_ring_factory(segment_size, segment_count)
+
+        assert False, "Renderer type is undefined"
+
+    @property
+    @abstractmethod
+    def segment_index(self) -> int:
+        pass
+
+    @property
+    @abstractmethod
+    def mapped_segment(self) -> ndarray:
+        """uint8 view of the mapped memory of the current segment."""
+        pass
+
+    @abstractmethod
+    def advance(self):
+        pass
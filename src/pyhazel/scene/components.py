@@ -16,9 +16,49 @@ class TagComponent:
 
 class TransformComponent:
     def __init__(self) -> None:
-        self.translate = glm.vec3(0)
-        self.rotation = glm.vec3(0)
-        self.scale = glm.vec3(1)
+        self._translate = glm.vec3(0)
+        self._rotation = glm.vec3(0)
+        self._scale = glm.vec3(1)
+        # incremented by every change, compared by caches of the transform
+        self.version = 0
+        # set by the owning scene to keep its spatial index current
+        self.on_changed: Optional[Callable[[], None]] = None
+
+    @property
+    def translate(self) -> glm.vec3:
+        return self._translate
+
+    @translate.setter
+    def translate(self, value: glm.vec3) -> None:
+        self._translate = glm.vec3(value)
+        self.mark_dirty()
+
+    @property
+    def rotation(self) -> glm.vec3:
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, value: glm.vec3) -> None:
+        self._rotation = glm.vec3(value)
+        self.mark_dirty()
+
+    @property
+    def scale(self) -> glm.vec3:
+        return self._scale
+
+    @scale.setter
+    def scale(self, value: glm.vec3) -> None:
+        self._scale = glm.vec3(value)
+        self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """
+        Called by the setters. Call it after modifying a vector in place,
+        e.g. transform.translate.x += 1, which the setters cannot see.
+        """
+        self.version += 1
+        if self.on_changed is not None:
+            self.on_changed()
 
     def get_transform(self):
         rotation = (
@@ -34,6 +74,14 @@ class SpriteRendererComponent:
         self.color = glm.vec4(color)
 
 
+class StaticComponent:
+    """
+    Marks an entity whose sprite rarely changes. Its quad is drawn from the
+    scene's static batch, which is only rebuilt after
+    Scene.mark_static_dirty is called.
+    """
+
+
 class CameraComponent:
     def __init__(self) -> None:
         self.primary = True
@@ -32,6 +32,7 @@ class Entity:
 
     def remove_component(self, component_type) -> None:
         self.scene.registry.remove_component(self.handle, component_type)
+        self.scene.on_component_removed(self, component_type)
 
     def __bool__(self) -> bool:
         return self.handle != 0
@@ -5,9 +5,14 @@ from typing import Optional
 from typing import Generator
 from pyhazel.scene import components
 from pyhazel.scene.entity import Entity
+from pyhazel.scene.spatial_hash import AABB
+from pyhazel.scene.spatial_hash import SpatialHash
 from pyhazel.renderer.camera import Camera
 from pyhazel import Renderer2D
+from pyhazel import StaticBatch
+from pyhazel.renderer.renderer_2d import compute_view_bounds
 import esper
+import glm
 
 if TYPE_CHECKING:
     from pyhazel import Timestep
@@ -18,6 +23,12 @@ class Scene:
         self.registry = esper.World()
         self.viewport_width: int = 0
         self.viewport_height: int = 0
+        # sprites of entities with a StaticComponent
+        self.static_batch = StaticBatch()
+        # bounds of every sprite entity, refreshed for moved entities only
+        self.spatial_index = SpatialHash()
+        # entities whose transform changed since the index was updated
+        self.moved_entities: set[int] = set()
 
     def all_entities(self) -> Generator[Entity, None, None]:
         # hack - esper doesn't quering all entities without a component
@@ -40,9 +51,113 @@ class Scene:
                 self.viewport_height
             )
 
+        if type(component) == components.TransformComponent:
+            handle = entity.handle
+            component.on_changed = lambda: self.on_transform_changed(handle)
+            self.on_transform_changed(handle)
+
+        if type(component) == components.SpriteRendererComponent:
+            self.on_transform_changed(entity.handle)
+
+        if type(component) in (components.StaticComponent, components.SpriteRendererComponent):
+            self.mark_static_dirty()
+
+    def on_component_removed(self, entity: Entity, component_type) -> None:
+        if component_type in (components.TransformComponent, components.SpriteRendererComponent):
+            self.spatial_index.remove(entity.handle)
+            self.moved_entities.discard(entity.handle)
+
+        if component_type in (components.StaticComponent, components.SpriteRendererComponent):
+            self.mark_static_dirty()
+
+    def on_transform_changed(self, handle: int) -> None:
+        self.moved_entities.add(handle)
+        if self.registry.has_component(handle, components.StaticComponent):
+            self.mark_static_dirty()
+
     def destroy_entity(self, entity: Entity) -> None:
+        if entity.has_component(components.StaticComponent):
+            self.mark_static_dirty()
+
+        self.spatial_index.remove(entity.handle)
+        self.moved_entities.discard(entity.handle)
         self.registry.delete_entity(entity.handle, True)
 
+    @staticmethod
+    def compute_bounds(transform: glm.mat4) -> AABB:
+        """World space bounds of the unit quad drawn with transform."""
+        corners = [
+            transform * glm.vec4(x, y, 0, 1)
+            for x, y in ((-0.5, -0.5), (0.5, -0.5), (0.5, 0.5), (-0.5, 0.5))
+        ]
+        return AABB(
+            glm.vec2(min(c.x for c in corners), min(c.y for c in corners)),
+            glm.vec2(max(c.x for c in corners), max(c.y for c in corners))
+        )
+
+    def update_spatial_index(self) -> None:
+        """
+        Re-bucket the sprites whose transform changed since the last update.
+        In place edits of the transform vectors must call mark_dirty.
+        """
+        for handle in self.moved_entities:
+            transform = self.registry.try_component(
+                handle,
+                components.TransformComponent
+            )
+            if transform is None or not self.registry.has_component(handle, components.SpriteRendererComponent):
+                continue
+
+            self.spatial_index.update(
+                handle,
+                self.compute_bounds(transform.get_transform())
+            )
+        self.moved_entities.clear()
+
+    def query_region(self, aabb: AABB) -> list[Entity]:
+        """Sprite entities whose bounds overlap aabb, in creation order."""
+        self.update_spatial_index()
+        return [
+            Entity(handle, self)
+            for handle in sorted(self.spatial_index.query_region(aabb))
+        ]
+
+    def query_point(self, x: float, y: float) -> list[Entity]:
+        """Sprite entities whose quad contains the point (x, y)."""
+        self.update_spatial_index()
+
+        entities = []
+        for handle in sorted(self.spatial_index.query_point(x, y)):
+            transform = self.registry.try_component(
+                handle,
+                components.TransformComponent
+            )
+            if transform is None:
+                continue
+
+            # Exact test in the local space of the (possibly rotated) quad
+            local = glm.inverse(transform.get_transform()) * glm.vec4(x, y, 0, 1)
+            if abs(local.x) <= 0.5 and abs(local.y) <= 0.5:
+                entities.append(Entity(handle, self))
+
+        return entities
+
+    def mark_static_dirty(self) -> None:
+        """Rebuild the static batch before it is drawn next."""
+        self.static_batch.mark_dirty()
+
+    def build_static_batch(self) -> None:
+        self.static_batch.clear()
+        for _, (transform, sprite, _) in self.registry.get_components(
+            components.TransformComponent,
+            components.SpriteRendererComponent,
+            components.StaticComponent
+        ):
+            self.static_batch.add_quad(
+                transform.get_transform(),
+                sprite.color
+            )
+
     def update(self, ts: Timestep) -> None:
         # Update Scripts
         for handle, nsc in self.registry.get_component(
@@ -74,10 +189,27 @@ class Scene:
                 camera_transform
             )
 
-            for _, (transform, sprite) in self.registry.get_components(
-                components.TransformComponent,
-                components.SpriteRendererComponent
-            ):
+            self.update_spatial_index()
+            if self.static_batch.dirty:
+                self.build_static_batch()
+            Renderer2D.draw_static_batch(self.static_batch)
+
+            # Only visit sprites in the cells the camera can see
+            view_bounds = self.compute_view_bounds(
+                main_camera.projection * glm.inverse(camera_transform)
+            )
+            for handle in sorted(self.spatial_index.query_region(view_bounds)):
+                if self.registry.has_component(handle, components.StaticComponent):
+                    continue
+
+                transform = self.registry.component_for_entity(
+                    handle,
+                    components.TransformComponent
+                )
+                sprite = self.registry.component_for_entity(
+                    handle,
+                    components.SpriteRendererComponent
+                )
                 Renderer2D.draw_quad_impl(
                     transform.get_transform(),
                     sprite.color
@@ -85,6 +217,12 @@ class Scene:
 
             Renderer2D.end_scene()
 
+    @staticmethod
+    def compute_view_bounds(view_projection: glm.mat4) -> AABB:
+        """xy bounds of the view frustum corners in world space."""
+        min_x, min_y, max_x, max_y = compute_view_bounds(view_projection)
+        return AABB(glm.vec2(min_x, min_y), glm.vec2(max_x, max_y))
+
     def on_viewport_resize(self, width: int, height: int) -> None:
         self.viewport_width = width
         self.viewport_height = height
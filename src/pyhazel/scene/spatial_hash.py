@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from math import floor
+import glm
+
+__all__ = ["AABB", "SpatialHash"]
+
+
+@dataclass
+class AABB:
+    min: glm.vec2
+    max: glm.vec2
+
+    def overlaps(self, other: AABB) -> bool:
+        return (
+            self.min.x <= other.max.x and other.min.x <= self.max.x and
+            self.min.y <= other.max.y and other.min.y <= self.max.y
+        )
+
+    def contains(self, x: float, y: float) -> bool:
+        return self.min.x <= x <= self.max.x and self.min.y <= y <= self.max.y
+
+
+class SpatialHash:
+    """
+    Uniform grid over the xy plane mapping cells to the handles whose
+    bounds overlap them. Moving a handle within its cells only updates its
+    bounds, so the index can be kept current incrementally.
+    """
+
+    def __init__(self, cell_size: float = 4.0) -> None:
+        self.cell_size = cell_size
+        self.cells: dict[tuple[int, int], set[int]] = {}
+        self.bounds: dict[int, AABB] = {}
+        # (min x, min y, max x, max y) cell coordinates of every handle
+        self.cell_ranges: dict[int, tuple[int, int, int, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.bounds)
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self.bounds
+
+    def clear(self):
+        self.cells.clear()
+        self.bounds.clear()
+        self.cell_ranges.clear()
+
+    def cell_range(self, aabb: AABB) -> tuple[int, int, int, int]:
+        return (
+            floor(aabb.min.x / self.cell_size),
+            floor(aabb.min.y / self.cell_size),
+            floor(aabb.max.x / self.cell_size),
+            floor(aabb.max.y / self.cell_size)
+        )
+
+    def insert(self, handle: int, aabb: AABB):
+        assert handle not in self.bounds, "Handle already in spatial hash!"
+
+        cell_range = self.cell_range(aabb)
+        min_x, min_y, max_x, max_y = cell_range
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                self.cells.setdefault((x, y), set()).add(handle)
+
+        self.bounds[handle] = aabb
+        self.cell_ranges[handle] = cell_range
+
+    def remove(self, handle: int):
+        if handle not in self.bounds:
+            return
+
+        min_x, min_y, max_x, max_y = self.cell_ranges.pop(handle)
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                cell = self.cells[(x, y)]
+                cell.discard(handle)
+                if not cell:
+                    del self.cells[(x, y)]
+
+        del self.bounds[handle]
+
+    def update(self, handle: int, aabb: AABB):
+        if self.cell_ranges.get(handle) == self.cell_range(aabb):
+            self.bounds[handle] = aabb
+            return
+
+        self.remove(handle)
+        self.insert(handle, aabb)
+
+    def query_region(self, aabb: AABB) -> set[int]:
+        """Handles whose bounds overlap aabb."""
+        min_x, min_y, max_x, max_y = self.cell_range(aabb)
+
+        candidates: set[int] = set()
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self.cells):
+            # Region spans more cells than are occupied
+            for (x, y), cell in self.cells.items():
+                if min_x <= x <= max_x and min_y <= y <= max_y:
+                    candidates |= cell
+        else:
+            for x in range(min_x, max_x + 1):
+                for y in range(min_y, max_y + 1):
+                    cell = self.cells.get((x, y))
+                    if cell is not None:
+                        candidates |= cell
+
+        return {handle for handle in candidates if self.bounds[handle].overlaps(aabb)}
+
+    def query_point(self, x: float, y: float) -> set[int]:
+        """Handles whose bounds contain the point (x, y)."""
+        cell = self.cells.get(
+            (floor(x / self.cell_size), floor(y / self.cell_size)),
+            ()
+        )
+        return {handle for handle in cell if self.bounds[handle].contains(x, y)}
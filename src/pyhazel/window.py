@@ -1,4 +1,7 @@
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
 from abc import ABC
 from abc import abstractmethod
 from collections.abc import Callable
@@ -6,6 +9,9 @@ from dataclasses import dataclass
 from .events import Event
 from .config import *
 
+if TYPE_CHECKING:
+    from .renderer.graphics_context import GraphicsContent
+
 __all__ = [
     "Window",
     "EventCallbackType",
@@ -39,6 +45,19 @@ class Window(ABC):
     def on_update(self) -> None:
         pass
 
+    @abstractmethod
+    def poll_events(self) -> None:
+        pass
+
+    @abstractmethod
+    def swap_buffers(self) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def graphics_context(self) -> GraphicsContent:
+        pass
+
     @property
     @abstractmethod
     def width(self):
@@ -102,9 +102,19 @@ class WindowsWindow(Window):
 
     @HZ_PROFILE_FUNCTION
     def on_update(self) -> None:
+        self.poll_events()
+        self.swap_buffers()
+
+    def poll_events(self) -> None:
         glfw.poll_events()
+
+    def swap_buffers(self) -> None:
         self.context.swap_buffers()
 
+    @property
+    def graphics_context(self) -> OpenGLContent:
+        return self.context
+
     @property
     def width(self):
         return self.data.width
@@ -0,0 +1,57 @@
+from pyhazel.renderer.buffer_layout import BufferLayout
+from pyhazel.renderer.buffer_element import BufferElement
+from pyhazel.renderer.shader_data_type import ShaderDataType
+import numpy as np
+
+
+def test_float_layout_dtype_matches_offsets_and_stride():
+    layout = BufferLayout(
+        BufferElement(ShaderDataType.FLOAT3, "a_Position"),
+        BufferElement(ShaderDataType.FLOAT4, "a_Color"),
+        BufferElement(ShaderDataType.FLOAT2, "a_TexCoord"),
+        BufferElement(ShaderDataType.FLOAT, "a_TexIndex"),
+    )
+
+    assert layout.stride == 40
+    assert layout.dtype.itemsize == layout.stride
+    for element in layout:
+        assert layout.dtype.fields[element.name][1] == element.offset
+    assert [element.offset for element in layout] == [0, 12, 28, 36]
+    assert layout.dtype["a_Position"].shape == (3,)
+    assert layout.dtype["a_TexIndex"].shape == ()
+
+
+def test_instanced_layout_dtype_views_raw_buffer():
+    layout = BufferLayout(
+        BufferElement(ShaderDataType.MAT4, "a_Transform", divisor=1),
+        BufferElement(ShaderDataType.FLOAT4, "a_Color", divisor=1),
+    )
+    assert layout.stride == 80
+    assert layout.dtype["a_Transform"].shape == (4, 4)
+
+    raw = np.zeros(2 * layout.stride, dtype=np.uint8)
+    records = raw.view(layout.dtype)
+    records["a_Color"][1] = (1, 2, 3, 4)
+
+    # Second instance's color follows its 64 byte transform
+    floats = raw.view(np.float32)
+    start = (layout.stride + 64) // 4
+    assert list(floats[start:start + 4]) == [1, 2, 3, 4]
+
+
+def test_packed_layout_dtype_matches_offsets_and_stride():
+    layout = BufferLayout(
+        BufferElement(ShaderDataType.FLOAT3, "a_Position"),
+        BufferElement(ShaderDataType.UBYTE4, "a_Color", normalized=True),
+        BufferElement(ShaderDataType.HALF2, "a_TexCoord"),
+        BufferElement(ShaderDataType.USHORT, "a_TexIndex"),
+        BufferElement(ShaderDataType.HALF, "a_TilingFactor"),
+    )
+
+    assert layout.stride == 24
+    assert layout.dtype.itemsize == 24
+    assert [element.offset for element in layout] == [0, 12, 16, 20, 22]
+    assert layout.dtype["a_Color"] == np.dtype((np.uint8, (4,)))
+    assert layout.dtype["a_TexCoord"] == np.dtype((np.float16, (2,)))
+    assert layout.dtype["a_TexIndex"] == np.dtype(np.uint16)
+    assert layout.dtype["a_TilingFactor"] == np.dtype(np.float16)
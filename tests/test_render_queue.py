@@ -0,0 +1,74 @@
+from pyhazel.renderer.render_queue import QuadRenderQueue
+from pyhazel.renderer.render_queue import compute_sort_keys
+import numpy as np
+import glm
+
+
+def sort_order(layers, depths, shader_ids, texture_ids):
+    keys = compute_sort_keys(
+        np.array(layers),
+        np.array(depths, dtype=np.float32),
+        np.array(shader_ids),
+        np.array(texture_ids)
+    )
+    return list(np.argsort(keys, kind="stable"))
+
+
+def test_depths_sort_back_to_front_across_signs():
+    depths = [0.5, -2.0, 0.0, -0.25, 3.0, -1e-3]
+    count = len(depths)
+
+    order = sort_order([0] * count, depths, [0] * count, [0] * count)
+
+    assert [depths[index] for index in order] == sorted(depths)
+
+
+def test_layer_takes_precedence_over_depth():
+    order = sort_order([1, 0, 1, 0], [-5.0, 5.0, -6.0, 4.0], [0] * 4, [0] * 4)
+
+    assert order == [3, 1, 2, 0]
+
+
+def test_equal_depths_group_by_shader_then_texture():
+    order = sort_order([0] * 4, [1.0] * 4, [1, 0, 1, 0], [3, 9, 2, 4])
+
+    assert order == [3, 1, 2, 0]
+
+
+def test_queue_sort_is_stable_for_equal_keys():
+    queue = QuadRenderQueue(2)
+    tex_coords = np.zeros((4, 2), dtype=np.float32)
+    for index in range(5):
+        # Grows past the initial capacity
+        queue.submit(glm.mat4(1), glm.vec4(index), tex_coords, None, 1.0)
+
+    commands, textures = queue.sorted_commands()
+
+    assert queue.capacity >= 5
+    assert list(commands["color"][:, 0]) == [0, 1, 2, 3, 4]
+    assert list(textures) == [None] * 5
+
+
+def test_queue_sorts_by_z_translation():
+    queue = QuadRenderQueue(4)
+    tex_coords = np.zeros((4, 2), dtype=np.float32)
+    for z in (0.3, -0.1, 0.2):
+        transform = glm.translate(glm.mat4(1), glm.vec3(0, 0, z))
+        queue.submit(transform, glm.vec4(z), tex_coords, None, 1.0)
+
+    commands, _ = queue.sorted_commands()
+
+    assert np.allclose(commands["color"][:, 0], [-0.1, 0.2, 0.3])
+
+
+def test_texture_ids_tell_textures_apart_by_identity():
+    class Loading:
+        renderer_id = 1  # every loading texture shows the placeholder
+
+    first, second = Loading(), Loading()
+    queue = QuadRenderQueue(4)
+    tex_coords = np.zeros((4, 2), dtype=np.float32)
+    for texture in (first, None, second, first):
+        queue.submit(glm.mat4(1), glm.vec4(1), tex_coords, texture, 1.0)
+
+    assert list(queue.commands["texture_id"][:4]) == [1, 0, 2, 1]
@@ -0,0 +1,90 @@
+from pyhazel.scene.scene import Scene
+from pyhazel.scene.spatial_hash import AABB
+from pyhazel.scene import components
+import glm
+
+
+def region(min_x, min_y, max_x, max_y) -> AABB:
+    return AABB(glm.vec2(min_x, min_y), glm.vec2(max_x, max_y))
+
+
+def create_sprite(scene: Scene, x: float = 0.0):
+    entity = scene.create_entity()
+    entity.add_component(components.SpriteRendererComponent(glm.vec4(1)))
+    entity.get_component(components.TransformComponent).translate = glm.vec3(x, 0, 0)
+    return entity
+
+
+def handles(entities) -> list[int]:
+    return [entity.handle for entity in entities]
+
+
+def test_assigned_transforms_move_the_sprite():
+    scene = Scene()
+    entity = create_sprite(scene)
+    assert handles(scene.query_region(region(-1, -1, 1, 1))) == [entity.handle]
+
+    entity.get_component(components.TransformComponent).translate = glm.vec3(50, 0, 0)
+
+    assert scene.query_region(region(-1, -1, 1, 1)) == []
+    assert handles(scene.query_region(region(49, -1, 51, 1))) == [entity.handle]
+
+
+def test_in_place_edits_move_the_sprite_once_marked_dirty():
+    scene = Scene()
+    entity = create_sprite(scene)
+    transform = entity.get_component(components.TransformComponent)
+    scene.update_spatial_index()
+    version = transform.version
+
+    transform.translate.x += 50
+    transform.mark_dirty()
+
+    assert scene.moved_entities == {entity.handle}
+    assert handles(scene.query_region(region(49, -1, 51, 1))) == [entity.handle]
+    assert transform.version == version + 1
+
+
+def test_only_moved_entities_are_updated():
+    scene = Scene()
+    entities = [create_sprite(scene, x) for x in range(10)]
+    scene.update_spatial_index()
+    assert scene.moved_entities == set()
+
+    entities[3].get_component(components.TransformComponent).scale = glm.vec3(2)
+
+    assert scene.moved_entities == {entities[3].handle}
+
+
+def test_sprite_without_transform_is_skipped():
+    scene = Scene()
+    entity = create_sprite(scene, 10)
+    scene.registry.create_entity(components.SpriteRendererComponent(glm.vec4(1)))
+
+    assert handles(scene.query_point(10, 0)) == [entity.handle]
+
+
+def test_destroyed_and_stripped_entities_leave_the_index():
+    scene = Scene()
+    destroyed = create_sprite(scene)
+    stripped = create_sprite(scene)
+    scene.query_region(region(-1, -1, 1, 1))
+
+    scene.destroy_entity(destroyed)
+    stripped.remove_component(components.SpriteRendererComponent)
+
+    assert scene.query_region(region(-1, -1, 1, 1)) == []
+    assert len(scene.spatial_index) == 0
+
+
+def test_moving_a_static_sprite_marks_the_batch_dirty():
+    scene = Scene()
+    entity = create_sprite(scene)
+    entity.add_component(components.StaticComponent())
+    scene.update_spatial_index()
+    scene.static_batch.dirty = False
+
+    entity.get_component(components.TransformComponent).rotation = glm.vec3(0, 0, 1)
+    scene.update_spatial_index()
+
+    assert scene.static_batch.dirty
@@ -0,0 +1,77 @@
+from pyhazel.scene.spatial_hash import AABB
+from pyhazel.scene.spatial_hash import SpatialHash
+import random
+import glm
+
+
+def box(min_x, min_y, max_x, max_y) -> AABB:
+    return AABB(glm.vec2(min_x, min_y), glm.vec2(max_x, max_y))
+
+
+def test_query_region_finds_overlapping_handles_only():
+    index = SpatialHash(cell_size=4.0)
+    index.insert(1, box(0, 0, 1, 1))
+    index.insert(2, box(-9, -9, -7, -7))
+    index.insert(3, box(2, 2, 10, 3))
+
+    assert index.query_region(box(0.5, 0.5, 2.5, 2.5)) == {1, 3}
+    assert index.query_region(box(-8, -8, -8, -8)) == {2}
+    # Same cell as handle 1, outside its bounds
+    assert index.query_region(box(1.5, 0, 1.9, 1.9)) == set()
+
+
+def test_query_point():
+    index = SpatialHash(cell_size=2.0)
+    index.insert(1, box(-1, -1, 1, 1))
+    index.insert(2, box(0, 0, 3, 3))
+
+    assert index.query_point(0.5, 0.5) == {1, 2}
+    assert index.query_point(-0.5, -0.5) == {1}
+    assert index.query_point(2.5, 2.5) == {2}
+    assert index.query_point(5, 5) == set()
+
+
+def test_move_updates_cells_and_remove_frees_them():
+    index = SpatialHash(cell_size=4.0)
+    index.insert(1, box(0, 0, 1, 1))
+
+    # Within the same cell only the bounds change
+    index.update(1, box(2, 2, 3, 3))
+    assert index.query_point(2.5, 2.5) == {1}
+    assert index.query_point(0.5, 0.5) == set()
+
+    index.update(1, box(20, 20, 21, 21))
+    assert index.query_region(box(0, 0, 4, 4)) == set()
+    assert index.query_region(box(19, 19, 22, 22)) == {1}
+    assert list(index.cells) == [(5, 5)]
+
+    index.remove(1)
+    assert len(index) == 0
+    assert index.cells == {}
+    index.remove(1)  # removing twice is harmless
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(3)
+    index = SpatialHash(cell_size=3.0)
+    bounds = {}
+    for handle in range(300):
+        x, y = rng.uniform(-50, 50), rng.uniform(-50, 50)
+        bounds[handle] = box(x, y, x + rng.uniform(0, 6), y + rng.uniform(0, 6))
+        index.insert(handle, bounds[handle])
+
+    for handle in range(0, 300, 3):
+        x, y = rng.uniform(-50, 50), rng.uniform(-50, 50)
+        bounds[handle] = box(x, y, x + 1, y + 1)
+        index.update(handle, bounds[handle])
+
+    # Small regions walk their cells, huge ones the occupied cells
+    for size in (2, 10, 500):
+        for _ in range(20):
+            x, y = rng.uniform(-60, 60), rng.uniform(-60, 60)
+            region = box(x, y, x + size, y + size)
+            expected = {
+                handle for handle, aabb in bounds.items()
+                if aabb.overlaps(region)
+            }
+            assert index.query_region(region) == expected
@@ -0,0 +1,201 @@
+from pyhazel.renderer.renderer_2d import Renderer2D
+from pyhazel.renderer.renderer_2d import Renderer2DData
+from pyhazel.renderer.static_batch import StaticBatch
+from pyhazel.renderer.render_command import RenderCommand
+from pyhazel.renderer.command_list import CommandList
+import numpy as np
+import threading
+import pytest
+import glm
+
+
+class FakeTexture:
+    def __init__(self, renderer_id: int) -> None:
+        self.renderer_id = renderer_id
+
+    def mark_bound(self):
+        pass
+
+
+class FakeTextureArray:
+    layers = 8
+
+    def __init__(self) -> None:
+        self.copies = []
+
+    def copy_layer_from(self, layer, texture):
+        self.copies.append((layer, texture.renderer_id))
+
+
+@pytest.fixture
+def renderer_data(monkeypatch):
+    data = Renderer2DData(white_texture=FakeTexture(1))
+    data.texture_layer_lookup[1] = 0
+    monkeypatch.setattr(Renderer2D, "data", data)
+    return data
+
+
+def test_edits_mark_the_batch_dirty():
+    batch = StaticBatch(capacity=2)
+    index = batch.add_quad(glm.mat4(1), glm.vec4(1))
+    batch.dirty = False
+
+    batch.set_color(index, glm.vec4(0.5))
+    assert batch.dirty
+    batch.dirty = False
+
+    batch.set_transform(index, glm.translate(glm.mat4(1), glm.vec3(2, 0, 0)))
+    assert batch.dirty
+    assert batch.quads.commands["transform"][index][3][0] == 2
+    assert list(batch.quads.commands["color"][index]) == [0.5] * 4
+
+
+def test_add_quads_records_every_quad():
+    batch = StaticBatch(capacity=2)
+    batch.add_quad(glm.mat4(1))
+
+    indices = batch.add_quads(
+        np.array([[0, 0], [1, 0], [2, 0]], dtype=np.float32),
+        glm.vec2(1),
+        0.0,
+        glm.vec4(1)
+    )
+
+    assert indices == range(1, 4)
+    assert batch.quad_count == 4
+    assert list(batch.quads.commands["transform"][1:, 3, 0]) == [0, 1, 2]
+
+
+def test_quads_sharing_a_texture_share_a_slot(renderer_data):
+    batch = StaticBatch()
+    grass, stone = FakeTexture(10), FakeTexture(11)
+    for texture in (grass, None, stone, grass):
+        batch.add_quad(glm.mat4(1), texture=texture)
+
+    slots = batch.get_texture_slots()
+
+    assert list(slots) == [1, 0, 2, 1]
+    assert batch.texture_slots == [renderer_data.white_texture, grass, stone]
+
+
+def test_too_many_textures_for_the_slots_asserts(renderer_data):
+    renderer_data.max_texture_slots = 2
+    batch = StaticBatch()
+    for renderer_id in (10, 11):
+        batch.add_quad(glm.mat4(1), texture=FakeTexture(renderer_id))
+
+    with pytest.raises(AssertionError):
+        batch.get_texture_slots()
+
+
+def test_texture_layers_are_copied_once_and_reused(renderer_data):
+    renderer_data.texture_array = FakeTextureArray()
+    renderer_data.texture_layer_generation = 3
+    batch = StaticBatch()
+    grass, stone = FakeTexture(10), FakeTexture(11)
+    for texture in (grass, stone, None, grass):
+        batch.add_quad(glm.mat4(1), texture=texture)
+
+    layers = batch.get_texture_slots()
+
+    assert list(layers) == [1, 2, 0, 1]
+    assert renderer_data.texture_array.copies == [(1, 10), (2, 11)]
+    assert batch.layer_generation == 3
+
+    # A rebuild finds the layers already filled
+    batch.get_texture_slots()
+    assert len(renderer_data.texture_array.copies) == 2
+
+
+def test_textures_recorded_while_loading_keep_their_own_slots(renderer_data):
+    batch = StaticBatch()
+    # Both show the white placeholder while loading
+    grass, stone = FakeTexture(1), FakeTexture(1)
+    batch.add_quad(glm.mat4(1), texture=grass)
+    batch.add_quad(glm.mat4(1), texture=stone)
+
+    grass.renderer_id, stone.renderer_id = 20, 21
+
+    assert list(batch.get_texture_slots()) == [1, 2]
+    assert batch.texture_slots == [renderer_data.white_texture, grass, stone]
+
+
+def test_loading_textures_take_separate_batch_slots(renderer_data):
+    renderer_data.texture_slot_lookup[id(renderer_data.white_texture)] = 0
+    grass, stone = FakeTexture(1), FakeTexture(1)
+
+    slots, resolved = Renderer2D.get_texture_slots([grass, None, stone, grass])
+
+    assert resolved == 4
+    assert list(slots) == [1, 0, 2, 1]
+    assert renderer_data.texture_slots[1:3] == [grass, stone]
+
+
+def test_finished_loads_outdate_texture_layers(renderer_data):
+    renderer_data.texture_array = FakeTextureArray()
+    batch = StaticBatch()
+    grass = FakeTexture(1)
+    batch.add_quad(glm.mat4(1), texture=grass)
+
+    # The placeholder is the white texture's layer
+    assert list(batch.get_texture_slots()) == [0]
+    assert not batch.layers_outdated()
+
+    grass.renderer_id = 20
+    assert batch.layers_outdated()
+    assert list(batch.get_texture_slots()) == [1]
+    assert not batch.layers_outdated()
+
+
+class FakeQuadBatch:
+    def __init__(self) -> None:
+        self.colors = None
+        self.submitted = False
+
+    def clear(self):
+        pass
+
+    def compute_geometry_from_transforms(self, transforms):
+        return transforms
+
+    def add_quads(self, geometry, colors, tex_coords, tex_indices, tiling_factors):
+        self.colors = colors
+
+    def submit_data(self):
+        # Nested submits run right away on the render thread
+        RenderCommand.submit(setattr, self, "submitted", True)
+
+
+def test_build_while_recording_creates_buffers_on_the_render_thread(renderer_data, monkeypatch):
+    created_on = []
+
+    def create_quad_batch(batch, capacity):
+        created_on.append(threading.get_ident())
+        batch.batch_capacity = capacity
+        batch.quad_batch = FakeQuadBatch()
+
+    monkeypatch.setattr(StaticBatch, "create_quad_batch", create_quad_batch)
+    command_list = CommandList()
+    monkeypatch.setattr(RenderCommand, "command_list", command_list)
+
+    batch = StaticBatch()
+    index = batch.add_quad(glm.mat4(1), glm.vec4(0.25))
+    batch.build()
+    # Edits after the build do not reach the recorded upload
+    batch.set_color(index, glm.vec4(1))
+
+    assert batch.quad_batch is None
+    assert len(command_list) == 1
+
+    def render_thread():
+        monkeypatch.setattr(RenderCommand, "render_thread_id", threading.get_ident())
+        command_list.execute()
+
+    thread = threading.Thread(target=render_thread)
+    thread.start()
+    thread.join()
+
+    assert created_on == [thread.ident]
+    assert list(batch.quad_batch.colors[0]) == [0.25] * 4
+    assert batch.quad_batch.submitted
+    assert len(command_list) == 1
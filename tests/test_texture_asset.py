@@ -0,0 +1,66 @@
+from pyhazel.renderer.texture_asset import BAKED_TEXTURE_EXTENSION
+from pyhazel.renderer.texture_asset import bake_texture
+from pyhazel.renderer.texture_asset import bake_textures
+from pyhazel.renderer.texture_asset import load_baked_texture
+from pyhazel.renderer.texture import Texture2D
+from PIL import Image
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def source_path(tmp_path):
+    # Top half red, bottom half blue
+    image = Image.new("RGBA", (8, 4), (0, 0, 255, 255))
+    image.paste((255, 0, 0, 255), (0, 0, 8, 2))
+    path = tmp_path / "source.png"
+    image.save(path)
+    return path
+
+
+def test_bake_load_round_trip_matches_decode(source_path, tmp_path):
+    baked_path = tmp_path / f"baked{BAKED_TEXTURE_EXTENSION}"
+    bake_texture(source_path, baked_path)
+
+    baked = load_baked_texture(baked_path)
+    decoded = Texture2D.decode_image(str(source_path))
+
+    assert (baked.width, baked.height, baked.mode) == (8, 4, "RGBA")
+    assert baked.mip_levels == []
+    assert bytes(baked.data) == bytes(decoded.data)
+    # Bottom row first: the first pixel is blue
+    assert tuple(baked.data[:4]) == (0, 0, 255, 255)
+
+
+def test_bake_load_round_trip_includes_mips(source_path, tmp_path):
+    baked_path = tmp_path / f"baked{BAKED_TEXTURE_EXTENSION}"
+    # More levels than the image has are clamped
+    bake_texture(source_path, baked_path, mip_levels=10)
+
+    image = load_baked_texture(baked_path)
+    levels = [image] + image.mip_levels
+
+    assert [(level.width, level.height) for level in levels] == [(8, 4), (4, 2), (2, 1), (1, 1)]
+    for level in levels:
+        assert len(level.data) == level.width * level.height * 4
+
+    # Box filtered: each half keeps its color down to 2 rows
+    half = levels[1].data.reshape(2, 4, 4)
+    assert (half[0] == (0, 0, 255, 255)).all()
+    assert (half[1] == (255, 0, 0, 255)).all()
+    # The last level averages both halves
+    assert np.allclose(levels[3].data[:3], (128, 0, 128), atol=1)
+
+
+def test_decode_image_loads_baked_files(source_path, tmp_path):
+    baked_path, = bake_textures([source_path], tmp_path / "baked", mip_levels=2)
+
+    assert baked_path.name == "source" + BAKED_TEXTURE_EXTENSION
+    image = Texture2D.decode_image(str(baked_path))
+    assert (image.width, image.height) == (8, 4)
+    assert len(image.mip_levels) == 1
+
+
+def test_loading_another_file_asserts(source_path):
+    with pytest.raises(AssertionError):
+        load_baked_texture(source_path)
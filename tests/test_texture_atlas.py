@@ -0,0 +1,69 @@
+from pyhazel.renderer.texture_atlas import SkylinePacker
+from pyhazel.renderer.texture_atlas import TextureAtlasBuilder
+from PIL import Image
+import random
+
+
+def overlaps(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def test_packed_rectangles_stay_inside_and_never_overlap():
+    rng = random.Random(7)
+    packer = SkylinePacker(256, 256)
+
+    placed = []
+    for _ in range(200):
+        width, height = rng.randint(1, 40), rng.randint(1, 40)
+        position = packer.insert(width, height)
+        if position is None:
+            continue
+        x, y = position
+        assert 0 <= x and x + width <= 256
+        assert 0 <= y and y + height <= 256
+        placed.append((x, y, width, height))
+
+    assert len(placed) > 50
+    for index, rect in enumerate(placed):
+        for other in placed[index + 1:]:
+            assert not overlaps(rect, other)
+
+
+def test_equal_tiles_fill_the_whole_area():
+    packer = SkylinePacker(64, 64)
+
+    positions = {packer.insert(16, 16) for _ in range(16)}
+
+    assert positions == {(x, y) for x in range(0, 64, 16) for y in range(0, 64, 16)}
+    assert packer.used_height == 64
+    assert packer.insert(1, 1) is None
+
+
+def test_rectangle_larger_than_the_area_is_rejected():
+    packer = SkylinePacker(32, 32)
+
+    assert packer.insert(33, 1) is None
+    assert packer.insert(1, 33) is None
+    assert packer.insert(32, 32) == (0, 0)
+
+
+def test_builder_copies_images_into_their_regions_bottom_row_first():
+    builder = TextureAtlasBuilder(max_size=64, padding=1)
+    red = Image.new("RGBA", (4, 2), (255, 0, 0, 255))
+    # Top row blue, bottom row green
+    striped = Image.new("RGBA", (3, 2), (0, 0, 255, 255))
+    striped.paste((0, 255, 0, 255), (0, 1, 3, 2))
+    builder.add_image("red", red)
+    builder.add_image("striped", striped)
+
+    pixels, regions = builder.pack()
+
+    region = regions["red"]
+    assert (region.width, region.height) == (4, 2)
+    assert (pixels[region.y:region.y + 2, region.x:region.x + 4] == (255, 0, 0, 255)).all()
+
+    region = regions["striped"]
+    assert tuple(pixels[region.y, region.x]) == (0, 255, 0, 255)
+    assert tuple(pixels[region.y + 1, region.x]) == (0, 0, 255, 255)